@@ -14,4 +14,7 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "canary_core.settings")
 
+# async views avoid blocking a worker thread during requests to the HouseCanary API
+os.environ.setdefault("CANARY_CORE_HC_ASYNC_VIEWS", "true")
+
 application = get_asgi_application()
@@ -0,0 +1,84 @@
+"""Normalize addresses so equivalent spellings share a single key.
+
+Addresses arrive as query string parameters, so the same property can be spelled many
+ways: ``128 Chestnut St.`` and ``128  chestnut st`` identify the same property, as do
+``{"address": ..., "zipcode": ...}`` and ``{"zipcode": ..., "address": ...}``.
+:func:`address_key` maps all of these onto the same fixed-length key, which is stored
+in an indexed column and used for lookups.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Mapping
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[.,#]")
+_WHITESPACE = re.compile(r"\s+")
+_ZIP_PLUS_FOUR = re.compile(r"^(\d{5})-?\d{4}$")
+
+
+def normalize_value(value: Any) -> str:
+    """Normalize a single address component.
+
+    Args:
+        value (Any): the component, e.g. the street address or zipcode
+
+    Returns:
+        str: the component, case-folded with punctuation and redundant whitespace
+            removed; ZIP+4 codes are truncated to 5 digits
+
+    >>> normalize_value("  128 Chestnut   St. ")
+    '128 chestnut st'
+    >>> normalize_value("02108-1234")
+    '02108'
+    """
+    text = _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", str(value))).strip().casefold()
+    return _ZIP_PLUS_FOUR.sub(r"\1", text)
+
+
+def normalize_address(address: Mapping[str, Any]) -> dict[str, str]:
+    """Normalize the keys and values of the address.
+
+    Args:
+        address (Mapping[str, Any]): the address, e.g. a :class:`PropertyAddress`
+
+    Returns:
+        dict[str, str]: the normalized address, sorted by key
+
+    >>> normalize_address({"ZipCode": "02108", "address": "128 Chestnut St."})
+    {'address': '128 chestnut st', 'zipcode': '02108'}
+    """
+    return dict(
+        sorted(
+            (str(k).strip().casefold(), normalize_value(v)) for k, v in address.items()
+        )
+    )
+
+
+def address_key(address: Mapping[str, Any]) -> str:
+    """Hash the normalized address to provide its lookup key.
+
+    Args:
+        address (Mapping[str, Any]): the address, e.g. a :class:`PropertyAddress`
+
+    Returns:
+        str: the 64-character hex digest of the normalized address
+
+    >>> address_key({"address": "128 Chestnut St.", "zipcode": "02108"}) == address_key(
+    ...     {"zipcode": "02108", "address": "128 chestnut st"}
+    ... )
+    True
+    """
+    canonical = json.dumps(normalize_address(address), separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+logger.debug("imported module %s", __name__)
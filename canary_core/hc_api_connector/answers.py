@@ -0,0 +1,223 @@
+"""Cache the answers to septic lookups in two tiers.
+
+Each lookup only needs a property's ``sewage_type`` and ``fetched_at``, plus its
+``modified`` timestamp to build the response's ``ETag``, keyed on its normalized address
+(see :func:`addresses.address_key`). :class:`AnswerCache` keeps the most recently used
+answers in process memory (L1), in front of a Django cache shared by all processes (L2,
+the ``HC_ANSWER_CACHE_ALIAS`` cache).
+
+Saving or deleting a :class:`Property` discards its answer from L2 and from the L1 of
+the process that made the change; other processes hold their L1 entries for at most
+``HC_ANSWER_CACHE_LOCAL_TTL`` seconds, so they see the change by then.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Iterable, NamedTuple, Optional
+
+# django packages
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+logger = logging.getLogger(__name__)
+
+
+class Answer(NamedTuple):
+    """Provide the data needed to answer a septic lookup."""
+
+    sewage_type: Optional[str]
+    fetched_at: Optional[datetime]
+    modified: Optional[datetime]
+
+    @classmethod
+    def of(cls, prop: Any) -> "Answer":
+        """Extract the answer from a property record.
+
+        Args:
+            prop (Any): the :class:`Property` record
+
+        Returns:
+            Answer: the fields of the record needed to answer a septic lookup
+        """
+        return cls(prop.sewage_type, prop.fetched_at, prop.modified)
+
+
+class _LocalEntry(NamedTuple):
+    """Cache an answer in process memory."""
+
+    #: `time.monotonic()` after which the entry must be re-read from L2
+    valid_until: float
+    answer: Answer
+
+
+class AnswerCache:
+    """Cache septic answers in an in-process LRU (L1) and a shared Django cache (L2).
+
+    The cache counts the lookups answered by each tier, and those that missed both;
+    see :meth:`stats`.
+    """
+
+    #: prefix the keys stored in the shared cache
+    prefix = "hc:septic:"
+
+    #: version the entries of the shared cache; increment this whenever the fields of
+    #:   :class:`Answer` change, so entries written by older releases aren't read
+    version = 2
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._counts = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        """Determine if answers are cached.
+
+        Returns:
+            bool: ``True`` unless ``HC_ANSWER_CACHE_TTL`` is zero
+        """
+        return settings.HC_ANSWER_CACHE_TTL > 0
+
+    @property
+    def backend(self) -> BaseCache:
+        """Provide the shared (L2) cache.
+
+        Returns:
+            BaseCache: the cache named by ``HC_ANSWER_CACHE_ALIAS``
+        """
+        return caches[settings.HC_ANSWER_CACHE_ALIAS]
+
+    def get(self, key: str) -> Optional[Answer]:
+        """Retrieve the cached answer for the address key.
+
+        Args:
+            key (str): the address key of the property
+
+        Returns:
+            Optional[Answer]: the cached answer, or ``None`` if it isn't cached
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Answer]:
+        """Retrieve the cached answers for multiple address keys.
+
+        Args:
+            keys (Iterable[str]): the address keys of the properties
+
+        Returns:
+            dict[str, Answer]: the cached answers; keys that aren't cached are omitted
+        """
+        keys = list(keys)
+        if not self.enabled or not keys:
+            return {}
+
+        found: dict[str, Answer] = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._local.get(key)
+                if entry is not None and entry.valid_until > now:
+                    self._local.move_to_end(key)
+                    found[key] = entry.answer
+            self._counts["l1_hits"] += len(found)
+
+        names = {self.prefix + k: k for k in keys if k not in found}
+        remote = self.backend.get_many(list(names), version=self.version)
+        shared = {names[name]: Answer(*value) for name, value in remote.items()}
+        self._remember(shared)
+        found.update(shared)
+
+        with self._lock:
+            self._counts["l2_hits"] += len(shared)
+            self._counts["misses"] += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, answer: Answer) -> None:
+        """Cache the answer for the address key.
+
+        Args:
+            key (str): the address key of the property
+            answer (Answer): the answer read from the DB
+        """
+        self.set_many({key: answer})
+
+    def set_many(self, answers: dict[str, Answer]) -> None:
+        """Cache answers for multiple address keys.
+
+        Args:
+            answers (dict[str, Answer]): the answers, keyed on their address keys
+        """
+        if not self.enabled or not answers:
+            return
+
+        self.backend.set_many(
+            {self.prefix + k: tuple(v) for k, v in answers.items()},
+            timeout=settings.HC_ANSWER_CACHE_TTL,
+            version=self.version,
+        )
+        self._remember(answers)
+
+    def discard(self, *keys: str) -> None:
+        """Discard the cached answers for the address keys, e.g. after an update.
+
+        Args:
+            *keys (str): the address keys of the changed properties
+        """
+        if not keys:
+            return
+
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        if self.enabled:
+            self.backend.delete_many(
+                [self.prefix + k for k in keys], version=self.version
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Summarize the use of the cache by this process.
+
+        Returns:
+            dict[str, Any]: the hits of each tier, the misses, the overall hit rate,
+                and the number of answers held in process memory
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            size = len(self._local)
+
+        lookups = sum(counts.values())
+        hits = counts["l1_hits"] + counts["l2_hits"]
+        return {
+            **counts,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "l1_size": size,
+        }
+
+    def reset(self) -> None:
+        """Forget the answers held in process memory, and reset the counters."""
+        with self._lock:
+            self._local.clear()
+            self._counts = dict.fromkeys(self._counts, 0)
+
+    def _remember(self, answers: dict[str, Answer]) -> None:
+        valid_until = time.monotonic() + settings.HC_ANSWER_CACHE_LOCAL_TTL
+        with self._lock:
+            for key, answer in answers.items():
+                self._local[key] = _LocalEntry(valid_until, answer)
+                self._local.move_to_end(key)
+            while len(self._local) > settings.HC_ANSWER_CACHE_SIZE:
+                self._local.popitem(last=False)
+
+
+#: The process-wide cache of septic answers
+septic_answers = AnswerCache()
+
+logger.debug("imported module %s", __name__)
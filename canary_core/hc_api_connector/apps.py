@@ -14,3 +14,9 @@ class HCAPIConnectorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "canary_core.hc_api_connector"
     verbose_name = _("HouseCanary API Connector")
+
+    def ready(self) -> None:
+        """Connect the app's signal handlers once the app registry is populated."""
+        # pylint: disable=import-outside-toplevel,unused-import
+        # local
+        from canary_core.hc_api_connector import signals  # noqa: F401
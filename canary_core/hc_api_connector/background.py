@@ -0,0 +1,107 @@
+"""Run work in the background without blocking the request that triggered it.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import logging
+import os
+import threading
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# django packages
+from django.conf import settings
+from django.db import connection
+
+# local
+from canary_core.hc_api_connector.ratelimit import rate_limit_wait
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """Run keyed tasks using a bounded pool of worker threads.
+
+    A task is skipped while another task with the same key is queued or running. Each
+    task closes its thread's DB connection when it completes, and exceptions are
+    logged instead of raised. No client waits for the tasks, so they wait up to
+    ``HC_BACKGROUND_RATE_LIMIT_WAIT`` seconds for rate-limited API clients. The pool
+    holds up to ``HC_REFRESH_WORKERS`` threads; it is created on first use, and
+    discarded after a fork.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: dict[str, Future] = {}
+
+    def __len__(self) -> int:
+        """Count the tasks that are queued or running.
+
+        Returns:
+            int: the number of pending tasks
+        """
+        return len(self._pending)
+
+    def submit(self, key: str, fn: Callable[..., Any], *args: Any) -> Optional[Future]:
+        """Schedule ``fn(*args)`` unless a task with the same key is pending.
+
+        Args:
+            key (str): identify the task
+            fn (Callable[..., Any]): the function to call in the background
+            *args (Any): positional arguments passed to ``fn``
+
+        Returns:
+            Optional[Future]: the future of the scheduled task, or ``None`` if the task
+                was skipped
+        """
+        with self._lock:
+            self._check_pid()
+            if key in self._pending:
+                return None
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.HC_REFRESH_WORKERS,
+                    thread_name_prefix="hc-background",
+                )
+
+            future = self._executor.submit(self._run, key, fn, *args)
+            self._pending[key] = future
+            return future
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the pending tasks complete.
+
+        Args:
+            timeout (Optional[float]): the maximum number of seconds to wait
+        """
+        futures.wait(list(self._pending.values()), timeout=timeout)
+
+    def _run(self, key: str, fn: Callable[..., Any], *args: Any) -> Any:
+        try:
+            with rate_limit_wait(settings.HC_BACKGROUND_RATE_LIMIT_WAIT):
+                return fn(*args)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("background task %s failed", key)
+            return None
+        finally:
+            connection.close()
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _check_pid(self) -> None:
+        # worker threads don't survive a fork, so the child needs its own pool
+        pid = os.getpid()
+        if pid != self._pid:
+            self._executor = None
+            self._pending.clear()
+            self._pid = pid
+
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,174 @@
+"""Spread requests across the active API clients, favoring the fastest and healthiest.
+
+The active clients are cached in each process for ``HC_CLIENT_CACHE_TTL`` seconds (or
+until a client is saved or deleted by the process), so selecting a client doesn't
+query the DB. Each selection uses the "power of two choices": two healthy clients are
+sampled at random, and the one with the lower load is chosen. A client's load is its
+moving average latency, scaled up by its requests in flight and down by its
+``weight``. Clients whose circuit is open (see :mod:`circuit`) are out of rotation
+until their circuit admits a trial request.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Hashable, Iterator, Optional, Type
+
+# django packages
+from django.conf import settings
+
+# third party
+from requests.exceptions import RequestException
+
+# local
+from canary_core.hc_api_connector.circuit import CircuitOpenError, circuit_breakers
+from canary_core.hc_api_connector.retries import DeadlineExceeded
+
+if TYPE_CHECKING:
+    # local
+    from canary_core.hc_api_connector.models import (  # noqa: F401  # pragma: no cover
+        BasicAPIClient,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class ClientStats:
+    """Track the latency and requests in flight of an API client in this process."""
+
+    def __init__(self) -> None:
+        #: the exponentially weighted moving average of the latency (in seconds)
+        self.latency = 0.0
+        #: the number of requests currently in flight
+        self.in_flight = 0
+
+    def load(self, weight: int) -> float:
+        """Estimate the cost of sending another request using the client.
+
+        Args:
+            weight (int): the client's share of the traffic, relative to other clients
+
+        Returns:
+            float: the client's load; lower is better
+        """
+        return self.latency * (self.in_flight + 1) / max(weight, 1)
+
+
+class ClientSelector:
+    """Choose the API client used to send each request."""
+
+    def __init__(self, model: Type["BasicAPIClient"]) -> None:
+        self.model = model
+        self._lock = threading.Lock()
+        self._clients: list["BasicAPIClient"] = []
+        self._loaded_at: Optional[float] = None
+        self._stats: dict[Hashable, ClientStats] = {}
+
+    def clients(self) -> list["BasicAPIClient"]:
+        """Provide the cached active clients, reloading them if the cache expired.
+
+        Returns:
+            list[BasicAPIClient]: the active clients, in primary key order
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._loaded_at is None
+                or now - self._loaded_at >= settings.HC_CLIENT_CACHE_TTL
+            ):
+                self._clients = list(
+                    self.model.objects.filter(active=True).order_by("pk")
+                )
+                self._loaded_at = now
+            return self._clients
+
+    def select(self) -> Optional["BasicAPIClient"]:
+        """Choose the client for the next request.
+
+        If every client's circuit is open, a client is chosen anyway, so the caller
+        receives its :class:`CircuitOpenError`.
+
+        Returns:
+            Optional[BasicAPIClient]: the chosen client, or ``None`` if there are no
+                active clients
+        """
+        clients = self.clients()
+        healthy = [c for c in clients if circuit_breakers.get(c).available] or clients
+        if len(healthy) < 2:
+            return healthy[0] if healthy else None
+
+        first, second = random.sample(healthy, 2)  # nosec: not used for security
+        return min(first, second, key=self._load)
+
+    def stats(self, client: "BasicAPIClient") -> ClientStats:
+        """Retrieve the statistics of the client, creating them if necessary.
+
+        Args:
+            client (BasicAPIClient): the client sending requests
+
+        Returns:
+            ClientStats: the client's statistics
+        """
+        with self._lock:
+            return self._stats.setdefault(client.pk, ClientStats())
+
+    @contextmanager
+    def track(self, client: "BasicAPIClient") -> Iterator[None]:
+        """Measure a request sent within the context.
+
+        Failed requests are recorded with a latency of at least
+        ``HC_CIRCUIT_SLOW_CALL`` seconds, so failing clients are avoided even before
+        their circuit opens. Requests that weren't sent (e.g. because the deadline
+        passed) aren't recorded.
+
+        Args:
+            client (BasicAPIClient): the client sending the request
+
+        Yields:
+            None: the request is sent within the context
+        """
+        stats = self.stats(client)
+        with self._lock:
+            stats.in_flight += 1
+        start = time.monotonic()
+        latency: Optional[float] = None
+        try:
+            yield
+            latency = time.monotonic() - start
+        except (CircuitOpenError, DeadlineExceeded):
+            # the request wasn't sent
+            raise
+        except RequestException:
+            latency = max(time.monotonic() - start, settings.HC_CIRCUIT_SLOW_CALL)
+            raise
+        finally:
+            with self._lock:
+                stats.in_flight -= 1
+                if latency is not None:
+                    alpha = settings.HC_CLIENT_LATENCY_ALPHA
+                    stats.latency += alpha * (latency - stats.latency)
+
+    def invalidate(self) -> None:
+        """Reload the active clients on next use, e.g. after a client changes."""
+        with self._lock:
+            self._loaded_at = None
+
+    def reset(self) -> None:
+        """Discard the cached clients and their statistics."""
+        with self._lock:
+            self._clients = []
+            self._loaded_at = None
+            self._stats.clear()
+
+    def _load(self, client: "BasicAPIClient") -> float:
+        return self.stats(client).load(client.weight)
+
+
+logger.debug("imported module %s", __name__)
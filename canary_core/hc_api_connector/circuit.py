@@ -0,0 +1,304 @@
+"""Stop sending requests to an API that is failing or degraded.
+
+Each :class:`BasicAPIClient` has a :class:`CircuitBreaker` in each process. While the
+circuit is closed, the outcomes of the client's recent requests are recorded; errors,
+``5xx``/``429`` responses, and requests slower than ``HC_CIRCUIT_SLOW_CALL`` count as
+failures. Once the failure rate reaches ``HC_CIRCUIT_ERROR_RATE``, the circuit opens
+and requests fail immediately with :class:`CircuitOpenError`. After
+``HC_CIRCUIT_COOLDOWN`` seconds, the circuit is half-open: a single trial request is
+sent, and its outcome either closes the circuit or opens it again.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import enum
+import logging
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, Optional
+
+# django packages
+from django.conf import settings
+
+# third party
+from requests.exceptions import RequestException
+from requests.models import Response
+
+# local
+from canary_core.hc_api_connector.ratelimit import RateLimitExceeded
+from canary_core.hc_api_connector.retries import DeadlineExceeded
+
+if TYPE_CHECKING:
+    # local
+    from canary_core.hc_api_connector.models import (  # noqa: F401  # pragma: no cover
+        BasicAPIClient,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RequestException):
+    """Indicate that requests to the API are suspended."""
+
+    def __init__(self, *args: Any, retry_after: float = 0.0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        #: the number of seconds until the circuit admits a trial request
+        self.retry_after = retry_after
+
+
+class CircuitState(enum.Enum):
+    """Enumerate the states of a :class:`CircuitBreaker`."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Track the health of an API and suspend requests while it is failing."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = CircuitState.CLOSED
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=settings.HC_CIRCUIT_WINDOW)
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def available(self) -> bool:
+        """Determine if the circuit would admit a request now.
+
+        Returns:
+            bool: ``False`` while the circuit is open, or while its trial is in flight
+        """
+        with self._lock:
+            if self.state is CircuitState.OPEN:
+                return self._cooldown_remaining() <= 0
+            return not self._trial_in_flight
+
+    @property
+    def failure_rate(self) -> float:
+        """Provide the fraction of recent requests that failed.
+
+        Returns:
+            float: the failure rate of the requests in the window
+        """
+        outcomes = list(self._outcomes)
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+
+    def check(self) -> None:
+        """Raise if the circuit is open, without admitting a request.
+
+        Use this to fail fast before doing work that precedes the request, e.g.
+        waiting for the rate limit.
+
+        Raises:
+            CircuitOpenError: raised while the circuit is open
+        """
+        with self._lock:
+            if self.state is CircuitState.OPEN:
+                remaining = self._cooldown_remaining()
+                if remaining > 0:
+                    raise self._error(remaining)
+
+    def call(self, fn: Callable[..., Response], *args: Any, **kwargs: Any) -> Response:
+        """Send a request through the circuit, recording its outcome.
+
+        Args:
+            fn (Callable[..., Response]): the function sending the request
+            *args (Any): positional arguments passed to ``fn``
+            **kwargs (Any): keyword arguments passed to ``fn``
+
+        Raises:
+            RequestException: raised by ``fn``; any exceptions raised by ``fn`` are
+                recorded as failures, except :class:`RateLimitExceeded` and
+                :class:`DeadlineExceeded`; other exceptions are raised without
+                recording an outcome
+
+        Returns:
+            Response: the response returned by ``fn``
+        """
+        self._admit()
+        start = time.monotonic()
+        try:
+            resp = fn(*args, **kwargs)
+        except (RateLimitExceeded, DeadlineExceeded):
+            self._release()
+            raise
+        except RequestException:
+            self.record(False)
+            raise
+        except BaseException:
+            # e.g. cancellation; don't leave the half-open circuit's trial in flight
+            self._release()
+            raise
+
+        self.record(self.succeeded(resp, time.monotonic() - start))
+        return resp
+
+    async def acall(
+        self, fn: Callable[..., Awaitable[Response]], *args: Any, **kwargs: Any
+    ) -> Response:
+        """Provide an async variant of :meth:`call`.
+
+        Args:
+            fn (Callable[..., Awaitable[Response]]): the coroutine function sending the
+                request
+            *args (Any): positional arguments passed to ``fn``
+            **kwargs (Any): keyword arguments passed to ``fn``
+
+        Raises:
+            RequestException: raised by ``fn``; any exceptions raised by ``fn`` are
+                recorded as failures, except :class:`RateLimitExceeded` and
+                :class:`DeadlineExceeded`; other exceptions are raised without
+                recording an outcome
+
+        Returns:
+            Response: the response returned by ``fn``
+        """
+        self._admit()
+        start = time.monotonic()
+        try:
+            resp = await fn(*args, **kwargs)
+        except (RateLimitExceeded, DeadlineExceeded):
+            self._release()
+            raise
+        except RequestException:
+            self.record(False)
+            raise
+        except BaseException:
+            # e.g. cancellation; don't leave the half-open circuit's trial in flight
+            self._release()
+            raise
+
+        self.record(self.succeeded(resp, time.monotonic() - start))
+        return resp
+
+    @staticmethod
+    def succeeded(resp: Response, elapsed: float) -> bool:
+        """Determine if the API handled a request successfully.
+
+        Client errors (e.g. ``404``) indicate a healthy API, so they succeed.
+
+        Args:
+            resp (Response): the response to the request
+            elapsed (float): the number of seconds the request took
+
+        Returns:
+            bool: ``False`` for server errors, throttling, and slow responses
+        """
+        return (
+            resp.status_code < 500
+            and resp.status_code != 429
+            and elapsed <= settings.HC_CIRCUIT_SLOW_CALL
+        )
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a request, opening or closing the circuit.
+
+        Args:
+            success (bool): the outcome of the request
+        """
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN:
+                self._trial_in_flight = False
+                if success:
+                    logger.info("closing circuit for %s", self.name)
+                    self.state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            if (
+                self.state is CircuitState.CLOSED
+                and len(self._outcomes) >= settings.HC_CIRCUIT_MIN_CALLS
+                and self.failure_rate >= settings.HC_CIRCUIT_ERROR_RATE
+            ):
+                self._open()
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.state is CircuitState.OPEN:
+                remaining = self._cooldown_remaining()
+                if remaining > 0:
+                    raise self._error(remaining)
+
+                logger.info("half-opening circuit for %s", self.name)
+                self.state = CircuitState.HALF_OPEN
+
+            if self.state is CircuitState.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise self._error(settings.HC_CIRCUIT_COOLDOWN)
+                self._trial_in_flight = True
+
+    def _release(self) -> None:
+        # the request wasn't sent (or didn't finish), so it says nothing about the API
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _open(self) -> None:
+        logger.warning(
+            "opening circuit for %s (failure rate %.0f%%)",
+            self.name,
+            self.failure_rate * 100,
+        )
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def _cooldown_remaining(self) -> float:
+        return self._opened_at + settings.HC_CIRCUIT_COOLDOWN - time.monotonic()
+
+    def _error(self, retry_after: float) -> CircuitOpenError:
+        return CircuitOpenError(
+            f"requests to {self.name} are suspended", retry_after=retry_after
+        )
+
+
+class CircuitBreakers:
+    """Maintain one :class:`CircuitBreaker` per API client in this process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._breakers: dict[Optional[Hashable], CircuitBreaker] = {}
+
+    def get(self, client: "BasicAPIClient") -> CircuitBreaker:
+        """Retrieve the circuit breaker for the client, creating it if necessary.
+
+        Args:
+            client (BasicAPIClient): the client sending requests
+
+        Returns:
+            CircuitBreaker: the client's circuit breaker
+        """
+        with self._lock:
+            breaker = self._breakers.get(client.pk)
+            if breaker is None:
+                breaker = CircuitBreaker(f"API client {client.pk}")
+                self._breakers[client.pk] = breaker
+            return breaker
+
+    def reset(self, pk: Optional[Hashable] = None) -> None:
+        """Discard the state of the circuit breakers.
+
+        Args:
+            pk (Optional[Hashable]): only discard the breaker for this client; if
+                omitted, all breakers are discarded
+        """
+        with self._lock:
+            if pk is None:
+                self._breakers.clear()
+            else:
+                self._breakers.pop(pk, None)
+
+
+circuit_breakers = CircuitBreakers()
+
+logger.debug("imported module %s", __name__)
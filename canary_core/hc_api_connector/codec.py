@@ -0,0 +1,125 @@
+"""Encode and decode JSON using a configurable library.
+
+JSON is handled on the hot path when parsing HouseCanary responses, rendering the REST
+API, and importing or exporting property data. Each of these uses :func:`loads` and
+:func:`dumps`, which delegate to the codec selected by ``HC_JSON_CODEC``:
+
+- ``orjson``: requires the ``orjson`` extra (``poetry install -E orjson``)
+- ``stdlib``: the :mod:`json` module
+- ``auto`` (default): ``orjson`` if it is installed, otherwise ``stdlib``
+
+Both codecs produce compact UTF-8 output, and encode the types handled by DRF's
+:class:`~rest_framework.utils.encoders.JSONEncoder` (e.g. ``Decimal`` and lazy strings)
+the same way.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+import logging
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+# django packages
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.utils.encoders import JSONEncoder
+
+# the optimized codec is optional; it requires the `orjson` extra
+try:
+    # third party
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+
+class Codec(NamedTuple):
+    """Functions to decode and encode JSON using a particular library."""
+
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], bytes]
+
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return _encoder.encode(obj).encode()
+
+
+CODECS: dict[str, Codec] = {"stdlib": Codec("stdlib", json.loads, _stdlib_dumps)}
+
+if orjson is not None:  # pragma: no branch
+    # datetimes are passed through to DRF's encoder, which truncates them to
+    #   milliseconds and encodes UTC as "Z"
+    _options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _orjson_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_encoder.default, option=_options)
+
+    CODECS["orjson"] = Codec("orjson", orjson.loads, _orjson_dumps)
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Look up a codec by name.
+
+    Args:
+        name (Optional[str]): ``orjson``, ``stdlib``, or ``auto``; defaults to
+            ``HC_JSON_CODEC``
+
+    Raises:
+        ImproperlyConfigured: raised if the codec is unknown, or isn't installed
+
+    Returns:
+        Codec: the codec
+    """
+    name = name or settings.HC_JSON_CODEC
+    if name == "auto":
+        name = "orjson" if "orjson" in CODECS else "stdlib"
+
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"HC_JSON_CODEC: {name!r} is not installed"
+            if name == "orjson"
+            else f"HC_JSON_CODEC: unknown codec {name!r}"
+        ) from None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON using the configured codec.
+
+    Args:
+        data (Union[bytes, str]): the JSON document; bytes must be UTF-8
+
+    Raises:
+        ValueError: raised if the document isn't valid JSON
+
+    Returns:
+        Any: the decoded value
+    """
+    return get_codec().loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON using the configured codec.
+
+    Args:
+        obj (Any): the value to encode
+
+    Raises:
+        TypeError: raised if the value can't be encoded
+
+    Returns:
+        bytes: the encoded value
+    """
+    return get_codec().dumps(obj)
+
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,226 @@
+"""Store JSON documents compressed using trained zstd dictionaries.
+
+The ``other_data`` of each :class:`Property` holds a HouseCanary ``result`` payload;
+these payloads share nearly identical keys, so most of their storage is repeated. When
+``HC_OTHER_DATA_COMPRESSION`` is enabled, the payloads are stored in a
+:class:`CompressedJSONField` instead, compressed using a dictionary trained on existing
+payloads (see the ``compress_other_data`` command). Each compressed frame records the ID
+of its dictionary, so payloads compressed using older dictionaries remain readable.
+
+Compressed values are marked using :class:`CompressedData`, which behaves as a plain
+``dict``; the :class:`CompressibleJSONField` that would otherwise store them stores an
+empty object in their place.
+
+Compression requires the ``zstd`` extra (``poetry install -E zstd``).
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import base64
+import functools
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
+
+# django packages
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import BinaryField, JSONField
+
+# local
+from canary_core.hc_api_connector import codec
+
+# compression is optional; it requires the `zstd` extra
+try:
+    # third party
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # pragma: no cover
+
+if TYPE_CHECKING:
+    # local
+    from canary_core.hc_api_connector.models import (  # noqa: F401  # pragma: no cover
+        CompressionDictionary,
+    )
+
+logger = logging.getLogger(__name__)
+
+#: the zstd compression level
+LEVEL = 9
+
+# compressors and decompressors can't be shared between threads
+_local = threading.local()
+
+
+class CompressedData(dict):
+    """Mark a document to be stored compressed by a :class:`CompressedJSONField`."""
+
+
+class CompressibleJSONField(JSONField):
+    """Store an empty object in place of :class:`CompressedData` values."""
+
+    def get_prep_value(self, value: Any) -> Any:
+        """Prepare the value for the DB.
+
+        Args:
+            value (Any): the value of the field
+
+        Returns:
+            Any: the prepared value; ``{}`` if the value is stored compressed
+        """
+        return super().get_prep_value(
+            {} if isinstance(value, CompressedData) else value
+        )
+
+
+class CompressedJSONField(BinaryField):
+    """Store a JSON document as a zstd frame; values are decompressed when loaded."""
+
+    def from_db_value(
+        self, value: Optional[bytes], expression: Any, connection: Any
+    ) -> Optional[CompressedData]:
+        """Decompress a value loaded from the DB.
+
+        Args:
+            value (Optional[bytes]): the compressed value
+            expression (Any): unused
+            connection (Any): unused
+
+        Returns:
+            Optional[CompressedData]: the decompressed document
+        """
+        return None if value is None else decompress(value)
+
+    def to_python(self, value: Any) -> Any:
+        """Decompress serialized values (e.g. from fixtures).
+
+        Args:
+            value (Any): the value to convert
+
+        Returns:
+            Any: the decompressed document
+        """
+        value = super().to_python(value)
+        return decompress(value) if isinstance(value, (bytes, memoryview)) else value
+
+    def get_prep_value(self, value: Any) -> Any:
+        """Compress the value for the DB.
+
+        Args:
+            value (Any): the document, or its compressed bytes
+
+        Returns:
+            Any: the compressed value
+        """
+        if value is not None and not isinstance(value, (bytes, memoryview)):
+            value = compress(value)
+        return super().get_prep_value(value)
+
+    def value_to_string(self, obj: Any) -> str:
+        """Serialize the compressed value as base64 (e.g. for ``dumpdata``).
+
+        Args:
+            obj (Any): the model instance
+
+        Returns:
+            str: the encoded value
+        """
+        value = self.get_prep_value(self.value_from_object(obj))
+        return "" if value is None else base64.b64encode(value).decode("ascii")
+
+
+def _zstd() -> Any:
+    if zstandard is None:
+        raise ImproperlyConfigured("compression requires the `zstandard` package")
+    return zstandard
+
+
+@functools.lru_cache(maxsize=None)
+def _dictionary(dict_id: int) -> Any:
+    model = apps.get_model("hc_api_connector", "CompressionDictionary")
+    content = model.objects.values_list("content", flat=True).get(dict_id=dict_id)
+    return _zstd().ZstdCompressionDict(bytes(content))
+
+
+@functools.lru_cache(maxsize=1)
+def latest_dictionary() -> Optional[int]:
+    """Look up the dictionary that new values are compressed with.
+
+    The result is cached; :func:`train` clears the cache of the current process, and
+    other processes use a new dictionary once they are restarted.
+
+    Returns:
+        Optional[int]: the ID of the latest dictionary, if there is one
+    """
+    model = apps.get_model("hc_api_connector", "CompressionDictionary")
+    return model.objects.order_by("-pk").values_list("dict_id", flat=True).first()
+
+
+def _cached(kind: str, dict_id: int) -> Any:
+    cache = _local.__dict__.setdefault(kind, {})
+    if dict_id not in cache:
+        dict_data = _dictionary(dict_id) if dict_id else None
+        cache[dict_id] = (
+            _zstd().ZstdCompressor(level=LEVEL, dict_data=dict_data)
+            if kind == "compressors"
+            else _zstd().ZstdDecompressor(dict_data=dict_data)
+        )
+    return cache[dict_id]
+
+
+def compress(document: Any) -> bytes:
+    """Compress a JSON document using the latest dictionary.
+
+    Args:
+        document (Any): the document to compress
+
+    Returns:
+        bytes: the zstd frame; documents are compressed without a dictionary if none
+            has been trained
+    """
+    return _cached("compressors", latest_dictionary() or 0).compress(
+        codec.dumps(document)
+    )
+
+
+def decompress(frame: Union[bytes, memoryview]) -> CompressedData:
+    """Decompress a JSON document using the dictionary it was compressed with.
+
+    Args:
+        frame (Union[bytes, memoryview]): the zstd frame
+
+    Returns:
+        CompressedData: the document
+    """
+    frame = bytes(frame)
+    dict_id = _zstd().get_frame_parameters(frame).dict_id
+    return CompressedData(
+        codec.loads(_cached("decompressors", dict_id).decompress(frame))
+    )
+
+
+def train(documents: Iterable[Any], size: int) -> "CompressionDictionary":
+    """Train a new dictionary, which is used to compress new values.
+
+    Args:
+        documents (Iterable[Any]): the sample documents
+        size (int): the maximum size of the dictionary (bytes)
+
+    Returns:
+        CompressionDictionary: the record of the new dictionary
+    """
+    samples = [codec.dumps(document) for document in documents]
+    dictionary = _zstd().train_dictionary(size, samples)
+
+    model = apps.get_model("hc_api_connector", "CompressionDictionary")
+    record = model.objects.create(
+        dict_id=dictionary.dict_id(), content=dictionary.as_bytes()
+    )
+    latest_dictionary.cache_clear()
+    return record
+
+
+logger.debug("imported module %s", __name__)
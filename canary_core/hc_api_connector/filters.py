@@ -0,0 +1,146 @@
+"""Define the filters accepted by the API's list views.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+import logging
+import re
+from typing import Any
+
+# django packages
+from django.contrib.auth import get_user_model
+from django.db.models import Model, QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+# third party
+from django_filters.rest_framework import FilterSet, ModelMultipleChoiceFilter
+
+# local
+from canary_core.hc_api_connector.models import Property
+
+logger = logging.getLogger(__name__)
+
+#: the keys that can be queried using :class:`ContainmentFilterBackend`
+KEY_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+class PropertyFilterSet(FilterSet):
+    """Filter properties by their attributes and owners.
+
+    The columns promoted from ``other_data`` (see :attr:`Property.PROMOTED_FIELDS`)
+    can be filtered by value, and numeric columns by range, e.g.
+    ``?year_built__gte=1950&year_built__lt=1970``.
+
+    Filtering on ``owners`` (e.g. ``?owners=1&owners=2``) uses a semi-join on the
+    owners table instead of joining it, so each property is listed once without
+    ``SELECT DISTINCT``.
+    """
+
+    owners = ModelMultipleChoiceFilter(
+        queryset=get_user_model().objects.all(), method="filter_owners"
+    )
+
+    class Meta:
+        """Set the model and fields to filter on."""
+
+        model = Property
+        fields = {
+            "assessment_date": ["exact"],
+            "sewage_type": ["exact"],
+            "year_built": ["exact", "gt", "gte", "lt", "lte"],
+            "building_area_sq_ft": ["exact", "gt", "gte", "lt", "lte"],
+            "property_type": ["exact", "in"],
+            "water": ["exact", "in"],
+            "total_assessed_value": ["exact", "gt", "gte", "lt", "lte"],
+        }
+
+    def filter_owners(
+        self, queryset: "QuerySet[Property]", name: str, value: list[Any]
+    ) -> "QuerySet[Property]":
+        """Select the properties owned by any of the given users.
+
+        Args:
+            queryset (QuerySet[Property]): the properties to filter
+            name (str): the name of the filtered field
+            value (list[Any]): the selected users
+
+        Returns:
+            QuerySet[Property]: the properties owned by any of the users
+        """
+        if not value:
+            return queryset
+
+        owned = Property.owners.through.objects.filter(user__in=value)
+        return queryset.filter(pk__in=owned.values("property_id"))
+
+
+class ContainmentFilterBackend(BaseFilterBackend):
+    """Filter JSON fields by the values they contain.
+
+    Each query parameter names a field listed in the view's ``containment_fields``,
+    followed by the keys of a nested value, e.g.
+    ``?other_data__property__pool=true&other_data__property__zoning=RH1``. The
+    parameters of each field are combined into a single containment (``@>``) lookup,
+    which can use a GIN index.
+
+    Values are parsed as JSON, so ``true``, ``1957``, and ``null`` match booleans,
+    numbers, and nulls; to match a string that looks like one of these, quote it (e.g.
+    ``"1957"``). Values that aren't valid JSON match strings.
+
+    Records whose data is stored compressed (see ``HC_OTHER_DATA_COMPRESSION``) aren't
+    matched.
+    """
+
+    #: limit the depth of the queried keys
+    max_depth = 8
+
+    def filter_queryset(
+        self, request: Request, queryset: "QuerySet[Model]", view: Any
+    ) -> "QuerySet[Model]":
+        """Filter the queryset using the containment parameters of the request.
+
+        Args:
+            request (Request): the incoming request
+            queryset (QuerySet[Model]): the records to filter
+            view (Any): the view being filtered
+
+        Returns:
+            QuerySet[Model]: the records containing the requested values
+        """
+        contained: dict[str, dict[str, Any]] = {}
+        for field in getattr(view, "containment_fields", []):
+            for param, value in request.query_params.items():
+                if param.startswith(f"{field}__"):
+                    keys = param.split("__")[1:]
+                    self._insert(contained.setdefault(field, {}), keys, value, param)
+
+        return queryset.filter(
+            **{f"{field}__contains": value for field, value in contained.items()}
+        )
+
+    def _insert(
+        self, document: dict[str, Any], keys: list[str], value: str, param: str
+    ) -> None:
+        if len(keys) > self.max_depth or not all(map(KEY_PATTERN.match, keys)):
+            raise ValidationError({param: "Invalid key."})
+
+        for key in keys[:-1]:
+            document = document.setdefault(key, {})
+            if not isinstance(document, dict):
+                raise ValidationError({param: "Conflicts with another parameter."})
+        if keys[-1] in document:
+            raise ValidationError({param: "Conflicts with another parameter."})
+
+        try:
+            document[keys[-1]] = json.loads(value)
+        except ValueError:
+            document[keys[-1]] = value
+
+
+logger.debug("imported module %s", __name__)
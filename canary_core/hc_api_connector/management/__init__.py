@@ -0,0 +1 @@
+"""Provide management commands for the HouseCanary API adapter."""
@@ -0,0 +1,5 @@
+"""Define the `django-admin` commands provided by the app.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
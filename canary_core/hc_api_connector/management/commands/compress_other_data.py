@@ -0,0 +1,190 @@
+"""Compress (or decompress) the stored ``other_data`` of existing properties.
+
+With ``--train``, a new zstd dictionary is first trained on a sample of the most
+recently created records; it is used to compress values from then on (see
+``HC_OTHER_DATA_COMPRESSION``). The records that aren't yet compressed are then
+compressed in batches, and the bytes stored per record are reported before and after.
+Pass ``--decompress`` to restore the records to uncompressed ``jsonb``.
+
+Example::
+
+    python manage.py compress_other_data --train --samples 5000
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import logging
+from typing import Any
+
+# django packages
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import ExpressionWrapper, F, Func, IntegerField, Sum
+from django.db.models.functions import Coalesce
+
+# local
+from canary_core.hc_api_connector import compression
+from canary_core.hc_api_connector.models import Property
+
+logger = logging.getLogger(__name__)
+
+
+def stored_size() -> ExpressionWrapper:
+    """Measure the bytes stored for a record's ``other_data`` (after any TOAST).
+
+    Returns:
+        ExpressionWrapper: the size, including the size of any compressed value
+    """
+    jsonb = Func(F("other_data"), function="pg_column_size")
+    compressed = Func(F("other_data_zstd"), function="pg_column_size")
+    return ExpressionWrapper(
+        jsonb + Coalesce(compressed, 0), output_field=IntegerField()
+    )
+
+
+class Command(BaseCommand):
+    """Migrate the stored data of existing properties to or from compressed storage."""
+
+    help = __doc__.split("\n\n", maxsplit=1)[0]
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Define the command line arguments.
+
+        Args:
+            parser (CommandParser): add the arguments to this parser
+        """
+        parser.add_argument(
+            "--train",
+            action="store_true",
+            help="train a new dictionary before compressing the records",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=1000,
+            help="the number of records to train the dictionary on "
+            "(default: %(default)s)",
+        )
+        parser.add_argument(
+            "--dict-size",
+            type=int,
+            default=16 * 1024,
+            help="the maximum size of the dictionary, in bytes (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--decompress",
+            action="store_true",
+            help="restore the compressed records to uncompressed storage",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="the number of records written at a time (default: %(default)s)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Migrate the records.
+
+        Args:
+            *args (Any): unused
+            **options (Any): the parsed command line arguments
+
+        Raises:
+            CommandError: raised for invalid arguments
+        """
+        if min(options["samples"], options["dict_size"], options["batch_size"]) < 1:
+            raise CommandError(
+                "--samples, --dict-size, and --batch-size must be positive"
+            )
+        if options["train"] and options["decompress"]:
+            raise CommandError("--train can't be combined with --decompress")
+
+        if options["train"]:
+            self.train(options["samples"], options["dict_size"])
+
+        compress = not options["decompress"]
+        queryset = Property.objects.filter(other_data_zstd__isnull=compress)
+        if compress:
+            queryset = queryset.exclude(other_data={})
+
+        count = before = after = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk)
+                .only("other_data", "other_data_zstd")
+                .annotate(stored=stored_size())
+                .order_by("pk")[: options["batch_size"]]
+            )
+            if not batch:
+                break
+
+            # the data itself is unchanged, so `modified` (and `ETag` headers) are kept
+            Property.objects.bulk_update(
+                [prop.compress(compress) for prop in batch],
+                ["other_data", "other_data_zstd"],
+            )
+
+            last_pk = batch[-1].pk
+            count += len(batch)
+            before += sum(prop.stored for prop in batch)
+            after += Property.objects.filter(pk__in=[p.pk for p in batch]).aggregate(
+                stored=Sum(stored_size())
+            )["stored"]
+            self.stdout.write(
+                f"{'compressed' if compress else 'decompressed'} {count} records"
+            )
+
+        self.stdout.write(self.style.SUCCESS(self.summary(count, before, after)))
+
+    def train(self, samples: int, size: int) -> None:
+        """Train a new dictionary on the most recently created records.
+
+        Args:
+            samples (int): the number of records to train the dictionary on
+            size (int): the maximum size of the dictionary (bytes)
+
+        Raises:
+            CommandError: raised if there are no records to train the dictionary on
+        """
+        sample = Property.objects.only("other_data", "other_data_zstd")
+        documents = [
+            prop.other_data
+            for prop in sample.order_by("-pk")[:samples]
+            if prop.other_data
+        ]
+        if not documents:
+            raise CommandError("no records to train a dictionary on")
+
+        dictionary = compression.train(documents, size)
+        self.stdout.write(
+            f"trained dictionary {dictionary.dict_id} "
+            f"({len(dictionary.content)} bytes) on {len(documents)} records"
+        )
+
+    @staticmethod
+    def summary(count: int, before: int, after: int) -> str:
+        """Report the bytes stored per record, before and after the migration.
+
+        Args:
+            count (int): the number of migrated records
+            before (int): the total bytes stored for the records before the migration
+            after (int): the total bytes stored for the records after the migration
+
+        Returns:
+            str: the report
+        """
+        if not count:
+            return "done: no records to migrate"
+
+        return (
+            f"done: migrated {count} records; {before / count:.0f} -> "
+            f"{after / count:.0f} bytes per record "
+            f"({(before - after) / count:.0f} bytes saved per record)"
+        )
+
+
+logger.debug("imported module %s", __name__)
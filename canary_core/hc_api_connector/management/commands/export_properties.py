@@ -0,0 +1,311 @@
+"""Export :class:`Property` records as NDJSON or CSV.
+
+Records are read from a server-side cursor in chunks, and written as they are read, so
+memory use doesn't depend on the number of records. Select the columns using
+``--columns``, and attributes of ``other_data`` using ``--other-data`` (e.g.
+``property.pool``); only the selected values are read from the DB.
+
+With ``--workers N``, the records are partitioned by zipcode: each worker thread reads
+its own partition using its own DB connection, and writes it to a separate file in the
+``--output`` directory (``part-0.ndjson``, ``part-1.ndjson``, ...).
+
+Example::
+
+    python manage.py export_properties --format csv --workers 4 --output exports
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import csv
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterator, Optional
+
+# django packages
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.db.models import Func, IntegerField
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
+from django.db.models.functions import Abs, Coalesce, Mod
+
+# local
+from canary_core.hc_api_connector import codec
+from canary_core.hc_api_connector.filters import KEY_PATTERN
+from canary_core.hc_api_connector.models import Property
+from canary_core.hc_api_connector.renderers import dumps
+
+if TYPE_CHECKING:
+    # django packages
+    from django.db.models import QuerySet  # noqa: F401  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+#: the columns that can be exported; compressed data is exported as `other_data`
+COLUMNS = [
+    field.name
+    for field in Property._meta.concrete_fields
+    if field.name != "other_data_zstd"
+]
+
+#: the columns exported by default
+DEFAULT_COLUMNS = [name for name in COLUMNS if name != "other_data"]
+
+
+class Command(BaseCommand):
+    """Export property data using server-side cursors."""
+
+    help = __doc__.split("\n\n", maxsplit=1)[0]
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Define the command line arguments.
+
+        Args:
+            parser (CommandParser): add the arguments to this parser
+        """
+        parser.add_argument(
+            "--format",
+            choices=["ndjson", "csv"],
+            default="ndjson",
+            help="the format of the export (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--columns",
+            default=",".join(DEFAULT_COLUMNS),
+            help="comma-separated columns to export (default: all columns except "
+            "other_data)",
+        )
+        parser.add_argument(
+            "--other-data",
+            action="append",
+            default=[],
+            metavar="KEY.PATH",
+            help="export this attribute of other_data, e.g. 'property.pool'; may be "
+            "repeated",
+        )
+        parser.add_argument(
+            "--zipcode",
+            action="append",
+            default=[],
+            help="only export records in this zipcode; may be repeated",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="the number of zipcode partitions exported in parallel "
+            "(default: %(default)s)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.HC_EXPORT_CHUNK_SIZE,
+            help="the number of records read at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="the file to write, or '-' for stdout; with --workers, the directory "
+            "to write each partition to",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Export the selected records.
+
+        Args:
+            *args (Any): unused
+            **options (Any): the parsed command line arguments
+
+        Raises:
+            CommandError: raised for invalid arguments
+        """
+        if options["workers"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--workers and --chunk-size must be positive")
+        if options["workers"] > 1 and options["output"] == "-":
+            raise CommandError("--workers requires an --output directory")
+
+        columns = [name.strip() for name in options["columns"].split(",")]
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise CommandError(f"unknown columns: {', '.join(sorted(unknown))}")
+
+        paths = [path.split(".") for path in options["other_data"]]
+        if not all(keys and all(map(KEY_PATTERN.match, keys)) for keys in paths):
+            raise CommandError("--other-data keys may only contain word characters")
+
+        self.columns = columns
+        # `values()` can't alias annotations with dots, so name them by position
+        self.extracted = {f"other_data_{n}": keys for n, keys in enumerate(paths)}
+        self.header = columns + options["other_data"]
+        # read the compressed data of the records that store it (if it's exported)
+        self.compressed = (
+            ["other_data_zstd"] if "other_data" in columns or paths else []
+        )
+
+        if options["workers"] == 1:
+            count = self.export(options, None)
+        else:
+            Path(options["output"]).mkdir(parents=True, exist_ok=True)
+            with ThreadPoolExecutor(
+                max_workers=options["workers"], thread_name_prefix="export-properties"
+            ) as pool:
+                count = sum(
+                    pool.map(
+                        lambda n: self.export(options, n), range(options["workers"])
+                    )
+                )
+
+        self.stderr.write(self.style.SUCCESS(f"done: exported {count} records"))
+
+    def get_queryset(
+        self, options: dict[str, Any], partition: Optional[int]
+    ) -> "QuerySet[Property]":
+        """Select the values to export, in primary key order.
+
+        Args:
+            options (dict[str, Any]): the parsed command line arguments
+            partition (Optional[int]): only select the records in this zipcode
+                partition, if given
+
+        Returns:
+            QuerySet[Property]: the values of each record
+        """
+        queryset = Property.objects.order_by("pk")
+        if options["zipcode"]:
+            queryset = queryset.filter(identifier__zipcode__in=options["zipcode"])
+        if partition is not None:
+            # records without a zipcode hash to NULL; keep them in the first partition
+            zipcode_hash = Coalesce(
+                Func(
+                    KeyTextTransform("zipcode", "identifier"),
+                    function="hashtext",
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+            queryset = queryset.alias(
+                partition=Abs(Mod(zipcode_hash, options["workers"]))
+            ).filter(partition=partition)
+
+        for alias, keys in self.extracted.items():
+            expression: Any = "other_data"
+            for key in keys:
+                expression = KeyTransform(key, expression)
+            queryset = queryset.annotate(**{alias: expression})
+
+        return queryset.values_list(*self.columns, *self.extracted, *self.compressed)
+
+    def export(self, options: dict[str, Any], partition: Optional[int]) -> int:
+        """Export the records, or a partition of them.
+
+        Args:
+            options (dict[str, Any]): the parsed command line arguments
+            partition (Optional[int]): the number of the partition to export, or
+                ``None`` to export all of the records
+
+        Returns:
+            int: the number of exported records
+        """
+        path = options["output"]
+        if partition is not None:
+            path = str(Path(path) / f"part-{partition}.{options['format']}")
+
+        rows = map(
+            self.decompress,
+            self.get_queryset(options, partition).iterator(
+                chunk_size=options["chunk_size"]
+            ),
+        )
+        try:
+            if path == "-":
+                return self.write(rows, options, self.stdout)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                return self.write(rows, options, f)
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connection.close()
+
+    def write(
+        self, rows: Iterator[tuple[Any, ...]], options: dict[str, Any], output: IO[str]
+    ) -> int:
+        """Write the rows as they are read.
+
+        Args:
+            rows (Iterator[tuple[Any, ...]]): the values of each record
+            options (dict[str, Any]): the parsed command line arguments
+            output (IO[str]): write the rows to this file
+
+        Returns:
+            int: the number of rows written
+        """
+        count = 0
+        if options["format"] == "csv":
+            writer = csv.writer(output)
+            writer.writerow(self.header)
+            for count, row in enumerate(rows, start=1):
+                writer.writerow(csv_value(value) for value in row)
+                self.report(count, options)
+        else:
+            for count, row in enumerate(rows, start=1):
+                output.write(dumps(dict(zip(self.header, row))).decode())
+                self.report(count, options)
+
+        return count
+
+    def decompress(self, row: tuple[Any, ...]) -> tuple[Any, ...]:
+        """Export the compressed data of records that store it.
+
+        Args:
+            row (tuple[Any, ...]): the values of the record, followed by its
+                compressed data (if it is exported)
+
+        Returns:
+            tuple[Any, ...]: the exported values of the record
+        """
+        if not self.compressed:
+            return row
+
+        *values, data = row
+        if data is not None:
+            for n, name in enumerate(self.columns):
+                if name == "other_data":
+                    values[n] = data
+            for n, keys in enumerate(self.extracted.values(), start=len(self.columns)):
+                value: Any = data
+                for key in keys:
+                    value = value.get(key) if isinstance(value, dict) else None
+                values[n] = value
+        return tuple(values)
+
+    def report(self, count: int, options: dict[str, Any]) -> None:
+        """Report the progress of a worker after each chunk of records.
+
+        Args:
+            count (int): the number of records exported by the worker
+            options (dict[str, Any]): the parsed command line arguments
+        """
+        if count % options["chunk_size"] == 0:
+            name = threading.current_thread().name
+            self.stderr.write(f"{name}: exported {count} records")
+
+
+def csv_value(value: Any) -> Any:
+    """Encode a value for a CSV file; nested values are encoded as JSON.
+
+    Args:
+        value (Any): the value read from the DB
+
+    Returns:
+        Any: the value to write
+    """
+    if isinstance(value, (dict, list, bool)):
+        return codec.dumps(value).decode()
+    return value
+
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,306 @@
+"""Import :class:`Property` records from a dump of HouseCanary API responses.
+
+The dump is NDJSON (optionally gzipped): each line is an object with the property's
+``identifier``, the API ``response`` body, and optionally the time it was
+``fetched_at`` (ISO 8601; defaults to the time of the import), e.g.::
+
+    {"identifier": {"address": "128 Chestnut St", "zipcode": "02108"},
+     "response": {"property/details": {"result": {...}}}}
+
+Lines are parsed in batches using :meth:`Property.update`. Each batch is written to a
+temporary staging table using ``COPY``, then merged into the property table using a
+single ``INSERT ... ON CONFLICT``. Existing records are only replaced by newer data.
+Memory use is bounded by the batch size, regardless of the size of the dump.
+
+Example::
+
+    python manage.py import_properties responses.ndjson.gz --client 1
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import gzip
+import io
+import itertools
+import logging
+import sys
+from typing import IO, Any, Iterable, Iterator, Optional
+
+# django packages
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import Field, JSONField
+from django.utils.dateparse import parse_datetime
+
+# local
+from canary_core.hc_api_connector import addresses, codec
+from canary_core.hc_api_connector.answers import septic_answers
+from canary_core.hc_api_connector.compression import CompressedData
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    client_selector,
+)
+
+logger = logging.getLogger(__name__)
+
+#: the temporary table that each batch is copied to
+STAGING_TABLE = "hc_property_import"
+
+#: the columns written by the import
+COLUMNS: list[Field] = [
+    field for field in Property._meta.concrete_fields if not field.primary_key
+]
+
+
+class Command(BaseCommand):
+    """Import property data from a dump of HouseCanary API responses."""
+
+    help = __doc__.split("\n\n", maxsplit=1)[0]
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Define the command line arguments.
+
+        Args:
+            parser (CommandParser): add the arguments to this parser
+        """
+        parser.add_argument(
+            "path",
+            help="the NDJSON dump to import ('.gz' files are decompressed); pass '-' "
+            "to read from stdin",
+        )
+        parser.add_argument(
+            "--client",
+            type=int,
+            default=None,
+            metavar="PK",
+            help="the API client that provided the responses; defaults to an active "
+            "client",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="the number of lines written at a time (default: %(default)s)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Import the dump.
+
+        Args:
+            *args (Any): unused
+            **options (Any): the parsed command line arguments
+
+        Raises:
+            CommandError: raised for invalid arguments
+        """
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        client = self.get_client(options["client"])
+        state = {"read": 0, "written": 0, "invalid": 0}
+
+        with self.open_dump(options["path"]) as lines:
+            self.create_staging_table()
+            try:
+                records = self.parse(lines, client, state)
+                while True:
+                    batch = list(itertools.islice(records, options["batch_size"]))
+                    if not batch:
+                        break
+
+                    state["written"] += self.write(batch)
+                    self.stdout.write(
+                        f"read {state['read']} lines: wrote {state['written']} records "
+                        f"({state['invalid']} invalid)"
+                    )
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"done: wrote {state['written']} records from {state['read']} lines "
+                f"({state['invalid']} invalid)"
+            )
+        )
+
+    @staticmethod
+    def get_client(pk: Optional[int]) -> BasicAPIClient:
+        """Look up the API client that provided the responses.
+
+        Args:
+            pk (Optional[int]): the primary key of the client, if given
+
+        Raises:
+            CommandError: raised if the client doesn't exist
+
+        Returns:
+            BasicAPIClient: the client
+        """
+        client = (
+            client_selector.select()
+            if pk is None
+            else BasicAPIClient.objects.filter(pk=pk).first()
+        )
+        if client is None:
+            raise CommandError(
+                "no active API clients" if pk is None else "no such API client"
+            )
+        return client
+
+    @staticmethod
+    def open_dump(path: str) -> IO[str]:
+        """Open the dump for reading.
+
+        Args:
+            path (str): the path of the dump, or ``-`` for stdin
+
+        Returns:
+            IO[str]: the lines of the dump
+        """
+        if path == "-":
+            return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt", encoding="utf-8")
+        return open(path, "r", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    @staticmethod
+    def parse(
+        lines: Iterable[str], client: BasicAPIClient, state: dict[str, int]
+    ) -> Iterator[Property]:
+        """Extract the records from the lines of the dump, as they are read.
+
+        Lines that aren't valid, or whose responses carry no data, are logged and
+        counted as invalid.
+
+        Args:
+            lines (Iterable[str]): the lines of the dump
+            client (BasicAPIClient): the API client that provided the responses
+            state (dict[str, int]): count the lines that are read, and those that
+                are invalid
+
+        Yields:
+            Property: the (unsaved) record of each valid line
+        """
+        for number, line in enumerate(lines, start=1):
+            state["read"] += 1
+            prop: Optional[Property]
+            try:
+                data = codec.loads(line)
+                prop = Property(apiclient=client, identifier=data["identifier"])
+                prop.address_key = addresses.address_key(prop.identifier)
+                prop.update(data["response"])
+                if data.get("fetched_at"):
+                    prop.fetched_at = parse_datetime(data["fetched_at"])
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                logger.warning("skipping invalid line %d: %r", number, e)
+                prop = None
+
+            if prop is None or not prop.other_data or prop.fetched_at is None:
+                state["invalid"] += 1
+                continue
+            yield prop
+
+    @staticmethod
+    def create_staging_table() -> None:
+        """Create the (empty) temporary table that batches are copied to."""
+        columns = ", ".join(field.column for field in COLUMNS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} AS "
+                f"SELECT {columns} FROM {Property._meta.db_table} WITH NO DATA"
+            )
+
+    @staticmethod
+    def write(batch: list[Property]) -> int:
+        """Copy the batch to the staging table, then merge it into the property table.
+
+        If a batch contains an address more than once, its latest data is kept.
+
+        Args:
+            batch (list[Property]): the records to write
+
+        Returns:
+            int: the number of records that were inserted or updated
+        """
+        buffer = io.StringIO()
+        for prop in batch:
+            values = (
+                prep_value(field, getattr(prop, field.attname)) for field in COLUMNS
+            )
+            buffer.write("\t".join(map(copy_value, values)) + "\n")
+        buffer.seek(0)
+
+        table = Property._meta.db_table
+        columns = ", ".join(field.column for field in COLUMNS)
+        updates = ", ".join(
+            f"{field.column} = EXCLUDED.{field.column}"
+            for field in COLUMNS
+            if field.name != "address_key"
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN", buffer)
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT DISTINCT ON (address_key) {columns} FROM {STAGING_TABLE} "
+                "ORDER BY address_key, fetched_at DESC "
+                f"ON CONFLICT (address_key) DO UPDATE SET {updates} "
+                f"WHERE {table}.fetched_at IS NULL "
+                f"OR {table}.fetched_at < EXCLUDED.fetched_at"
+            )
+            written = cursor.rowcount
+            cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+
+            # bulk writes don't send signals, so discard the cached answers here
+            keys = [prop.address_key for prop in batch]
+            transaction.on_commit(lambda: septic_answers.discard(*keys))
+
+        return written
+
+
+def prep_value(field: Field, value: Any) -> Any:
+    """Prepare a value for the DB; JSON is encoded using the configured codec.
+
+    Args:
+        field (Field): the field of the value
+        value (Any): the value of the field
+
+    Returns:
+        Any: the prepared value
+    """
+    if isinstance(field, JSONField):
+        if isinstance(value, CompressedData):
+            value = {}  # the data is stored compressed, by `other_data_zstd`
+        return None if value is None else codec.dumps(value).decode()
+    return field.get_prep_value(value)
+
+
+def copy_value(value: Any) -> str:
+    """Encode a value in the text format of ``COPY``.
+
+    Args:
+        value (Any): the value, as prepared for the DB
+
+    Returns:
+        str: the encoded value
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, (dict, list)):
+        value = codec.dumps(value).decode()
+    elif isinstance(value, (bytes, memoryview)):
+        value = "\\x" + bytes(value).hex()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+logger.debug("imported module %s", __name__)
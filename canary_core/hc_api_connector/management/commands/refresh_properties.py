@@ -0,0 +1,336 @@
+"""Refresh :class:`Property` records with data from their API clients.
+
+Records are processed in primary key order, in batches: each batch is fetched from the
+API by a pool of worker threads, then saved using a single ``bulk_update()``. After
+each batch is saved, the last primary key is written to the checkpoint file (if one is
+given), so an interrupted run can pick up where it stopped using ``--resume``.
+Requests to rate-limited API clients wait up to ``--rate-limit-wait`` seconds for a
+token, instead of the short wait used by the API's views.
+
+Example::
+
+    python manage.py refresh_properties --zipcode 02108 --checkpoint refresh.json
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import contextvars
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+# django packages
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+# third party
+from requests.exceptions import RequestException
+
+# local
+from canary_core.hc_api_connector.answers import septic_answers
+from canary_core.hc_api_connector.circuit import CircuitOpenError
+from canary_core.hc_api_connector.models import (
+    Property,
+    client_selector,
+    rate_limiter,
+)
+from canary_core.hc_api_connector.ratelimit import rate_limit_wait
+
+if TYPE_CHECKING:
+    # django packages
+    from django.db.models import QuerySet  # noqa: F401  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+#: the fields written by :meth:`Property.fetch_and_update`
+UPDATE_FIELDS = [
+    "apiclient",
+    "assessment_date",
+    "sewage_type",
+    "other_data",
+    "other_data_zstd",
+    *Property.PROMOTED_FIELDS,
+    "fetched_at",
+    "modified",
+]
+
+
+class Command(BaseCommand):
+    """Refresh property data from the HouseCanary API in parallel."""
+
+    help = __doc__.split("\n\n", maxsplit=1)[0]
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Define the command line arguments.
+
+        Args:
+            parser (CommandParser): add the arguments to this parser
+        """
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=None,
+            metavar="SECONDS",
+            help="only refresh records fetched this many seconds ago, or never; "
+            "defaults to HC_PROPERTY_MAX_AGE (use 0 to refresh all records)",
+        )
+        parser.add_argument(
+            "--zipcode",
+            action="append",
+            default=[],
+            help="only refresh records in this zipcode; may be repeated",
+        )
+        parser.add_argument(
+            "--client",
+            action="append",
+            type=int,
+            default=[],
+            metavar="PK",
+            help="only refresh records provided by this API client; may be repeated",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.HC_API_POOL_SIZE,
+            help="the number of concurrent API requests (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--rate-limit-wait",
+            type=float,
+            default=settings.HC_BACKGROUND_RATE_LIMIT_WAIT,
+            metavar="SECONDS",
+            help="the maximum time each request waits for a rate-limited API client "
+            "(default: %(default)s)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="the number of records saved at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            default=None,
+            help="record progress in this file after each batch is saved",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="skip the records processed by the run recorded in --checkpoint",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Refresh the selected records.
+
+        Args:
+            *args (Any): unused
+            **options (Any): the parsed command line arguments
+
+        Raises:
+            CommandError: raised for invalid arguments, or if the run is interrupted
+        """
+        checkpoint: Optional[Path] = options["checkpoint"]
+        if options["resume"] and checkpoint is None:
+            raise CommandError("--resume requires --checkpoint")
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--workers and --batch-size must be positive")
+
+        state = {"last_pk": 0, "refreshed": 0, "failed": 0}
+        if options["resume"] and checkpoint.exists():  # type: ignore
+            state.update(json.loads(checkpoint.read_text()))  # type: ignore
+            self.stdout.write(f"resuming after primary key {state['last_pk']}")
+
+        queryset = self.get_queryset(options)
+        pool = ThreadPoolExecutor(
+            max_workers=options["workers"], thread_name_prefix="refresh-properties"
+        )
+        try:
+            while True:
+                batch = list(
+                    queryset.filter(pk__gt=state["last_pk"])[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+
+                for prop in batch:
+                    if prop.apiclient is None or not prop.apiclient.active:
+                        prop.apiclient = client_selector.select()
+                refreshed = self.refresh_batch(pool, batch, options["rate_limit_wait"])
+                Property.objects.bulk_update(refreshed, UPDATE_FIELDS)
+                septic_answers.discard(*(p.address_key for p in refreshed))
+
+                state["last_pk"] = batch[-1].pk
+                state["refreshed"] += len(refreshed)
+                state["failed"] += len(batch) - len(refreshed)
+                if checkpoint is not None:
+                    self.save_checkpoint(checkpoint, state)
+                self.stdout.write(
+                    f"refreshed {state['refreshed']} records ({state['failed']} failed)"
+                )
+
+            # once the workers exit, close the connections they used for rate limits
+            pool.shutdown()
+            rate_limiter.prune()
+        except KeyboardInterrupt as e:
+            hint = (
+                f"; resume using --resume --checkpoint {checkpoint}"
+                if checkpoint
+                else ""
+            )
+            raise CommandError(
+                f"interrupted after primary key {state['last_pk']}{hint}"
+            ) from e
+        finally:
+            pool.shutdown(wait=False)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"done: refreshed {state['refreshed']} records "
+                f"({state['failed']} failed)"
+            )
+        )
+
+    @staticmethod
+    def get_queryset(options: dict[str, Any]) -> "QuerySet[Property]":
+        """Select the records to refresh, in primary key order.
+
+        Args:
+            options (dict[str, Any]): the parsed command line arguments
+
+        Returns:
+            QuerySet[Property]: the selected records
+        """
+        queryset = Property.objects.select_related("apiclient").order_by("pk")
+
+        older_than = options["older_than"]
+        if older_than is None:
+            older_than = settings.HC_PROPERTY_MAX_AGE
+        if older_than:
+            cutoff = timezone.now() - timedelta(seconds=older_than)
+            queryset = queryset.filter(
+                Q(fetched_at__isnull=True) | Q(fetched_at__lt=cutoff)
+            )
+
+        if options["zipcode"]:
+            queryset = queryset.filter(identifier__zipcode__in=options["zipcode"])
+        if options["client"]:
+            queryset = queryset.filter(apiclient__in=options["client"])
+
+        return queryset
+
+    def refresh_batch(
+        self, pool: ThreadPoolExecutor, batch: list[Property], wait: float
+    ) -> list[Property]:
+        """Refresh each record of the batch using the worker threads.
+
+        Records rejected by an open circuit weren't sent, so they are retried once the
+        circuit admits requests again; every record is tried before the batch is saved.
+
+        Args:
+            pool (ThreadPoolExecutor): the worker threads
+            batch (list[Property]): the records to refresh
+            wait (float): the maximum number of seconds each request waits for a
+                rate-limited API client
+
+        Returns:
+            list[Property]: the records that were refreshed
+        """
+        refreshed: list[Property] = []
+        pending = batch
+        while pending:
+            # the workers inherit the rate limit wait from this thread's context
+            with rate_limit_wait(wait):
+                tasks = [
+                    (
+                        prop,
+                        pool.submit(contextvars.copy_context().run, self.refresh, prop),
+                    )
+                    for prop in pending
+                ]
+
+            pending, retry_after = [], 0.0
+            for prop, task in tasks:
+                try:
+                    result = task.result()
+                except CircuitOpenError as e:
+                    pending.append(prop)
+                    retry_after = max(retry_after, e.retry_after)
+                    continue
+                if result is not None:
+                    refreshed.append(result)
+
+            if pending:
+                self.stdout.write(
+                    f"circuit open; retrying {len(pending)} records in "
+                    f"{retry_after:.1f} seconds"
+                )
+                time.sleep(retry_after)
+
+        return refreshed
+
+    @staticmethod
+    def refresh(prop: Property) -> Optional[Property]:
+        """Fetch and apply the latest data for the record, without saving it.
+
+        This runs in a worker thread. Taking a rate limit token uses the worker's
+        dedicated rate limiter connection, which is closed once the pool finishes;
+        any other connection the update opens (e.g. to look up the compression
+        dictionary) is closed when the record is done.
+
+        Args:
+            prop (Property): the record to refresh
+
+        Raises:
+            CircuitOpenError: raised if the request wasn't sent because the API
+                client's circuit is open
+
+        Returns:
+            Optional[Property]: the updated record, or ``None`` if the request (or
+                applying its response) failed
+        """
+        if prop.apiclient is None:
+            logger.error("can't refresh %s: no API client records", prop)
+            return None
+
+        try:
+            return prop.fetch_and_update(save=False)
+        except CircuitOpenError:
+            raise
+        except RequestException as e:
+            logger.warning("failed to refresh %s: %s", prop, e)
+            return None
+        except Exception:  # pylint: disable=broad-except
+            # e.g. a malformed response; one record shouldn't stop the run
+            logger.exception("failed to refresh %s", prop)
+            return None
+        finally:
+            connection.close()
+
+    @staticmethod
+    def save_checkpoint(path: Path, state: dict[str, int]) -> None:
+        """Write the progress of the run to the checkpoint file.
+
+        The file is replaced atomically, so it is never left partially written.
+
+        Args:
+            path (Path): the checkpoint file
+            state (dict[str, int]): the progress of the run
+        """
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,69 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:07."""
+
+# django packages
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add the UnknownAddress model for caching negative results."""
+
+    dependencies = [
+        ("hc_api_connector", "0002_auto_20211114_0151"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UnknownAddress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        editable=False,
+                        help_text="the hashed address",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "identifier",
+                    models.JSONField(
+                        default=dict,
+                        help_text="the address that was not found by the HouseCanary API",
+                    ),
+                ),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(
+                        help_text="the status code of the response from the HouseCanary API"
+                    ),
+                ),
+                (
+                    "content",
+                    models.BinaryField(
+                        help_text="the body of the response from the HouseCanary API"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        help_text="the cached response is ignored after this time",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Unknown Address",
+                "verbose_name_plural": "Unknown Addresses",
+            },
+        ),
+    ]
@@ -0,0 +1,134 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:16."""
+
+# stdlib
+import hashlib
+import itertools
+import json
+import re
+from typing import Any, Mapping
+
+# django packages
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+#: the address normalization as of this migration (see `addresses.address_key`)
+PUNCTUATION = re.compile(r"[.,#]")
+WHITESPACE = re.compile(r"\s+")
+ZIP_PLUS_FOUR = re.compile(r"^(\d{5})-?\d{4}$")
+
+BATCH_SIZE = 1000
+
+
+def normalize_value(value: Any) -> str:
+    """Normalize a single address component, as of this migration."""
+    text = WHITESPACE.sub(" ", PUNCTUATION.sub(" ", str(value))).strip().casefold()
+    return ZIP_PLUS_FOUR.sub(r"\1", text)
+
+
+def address_key(address: Mapping[str, Any]) -> str:
+    """Hash the normalized address, as of this migration."""
+    normalized = dict(
+        sorted(
+            (str(k).strip().casefold(), normalize_value(v)) for k, v in address.items()
+        )
+    )
+    canonical = json.dumps(normalized, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def backfill_address_keys(apps, schema_editor):  # type: ignore
+    """Populate ``Property.address_key`` and merge records for equivalent addresses.
+
+    Of each set of duplicates, the record with a known sewage type (or the oldest
+    record) is kept; the owners of the other records are added to it.
+    """
+    Property = apps.get_model("hc_api_connector", "Property")
+
+    records = Property.objects.only("pk", "identifier").order_by("pk").iterator()
+    while True:
+        batch = list(itertools.islice(records, BATCH_SIZE))
+        if not batch:
+            break
+
+        for prop in batch:
+            prop.address_key = address_key(prop.identifier)
+        Property.objects.bulk_update(batch, ["address_key"])
+
+    duplicated = (
+        Property.objects.values("address_key")
+        .annotate(count=Count("pk"), kept_pk=Min("pk"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for group in duplicated.iterator():
+        kept = Property.objects.get(pk=group["kept_pk"])
+        others = Property.objects.filter(address_key=group["address_key"]).exclude(
+            pk=kept.pk
+        )
+
+        if kept.sewage_type == "UN":
+            known = others.exclude(sewage_type="UN").order_by("pk").first()
+            if known is not None:
+                for field in ("assessment_date", "sewage_type", "other_data"):
+                    setattr(kept, field, getattr(known, field))
+                kept.save(
+                    update_fields=["assessment_date", "sewage_type", "other_data"]
+                )
+
+        for other in others:
+            kept.owners.add(*other.owners.all())
+        others.delete()
+
+
+def rekey_unknown_addresses(apps, schema_editor):  # type: ignore
+    """Rehash the keys of cached negative results using the normalized address."""
+    UnknownAddress = apps.get_model("hc_api_connector", "UnknownAddress")
+
+    seen = set()
+    entries = UnknownAddress.objects.only("pk", "identifier").order_by("-expires_at")
+    for entry in entries.iterator(chunk_size=BATCH_SIZE):
+        key = address_key(entry.identifier)
+        if key in seen:
+            entry.delete()
+            continue
+
+        seen.add(key)
+        UnknownAddress.objects.filter(pk=entry.pk).update(key=key)
+
+
+class Migration(migrations.Migration):
+    """Key properties on their normalized address.
+
+    - add ``Property.address_key``, backfill it, and merge equivalent records
+    - drop the unique index on ``Property.identifier``; it is replaced by the index
+      created in the following migration
+    - rehash the negative cache keys
+    """
+
+    dependencies = [
+        ("hc_api_connector", "0003_unknownaddress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="address_key",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="the hash of the normalized identifier; set when the record is saved",
+                max_length=64,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="property",
+            name="identifier",
+            field=models.JSONField(
+                default=dict,
+                help_text="store address information as JSON for use with the HouseCanary API",
+            ),
+        ),
+        migrations.RunPython(backfill_address_keys, migrations.RunPython.noop),
+        migrations.RunPython(rekey_unknown_addresses, migrations.RunPython.noop),
+    ]
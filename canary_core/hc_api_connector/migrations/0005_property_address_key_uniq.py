@@ -0,0 +1,28 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:16."""
+
+# django packages
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add a covering unique index on ``Property.address_key``.
+
+    The index includes ``sewage_type``, so ``has_septic`` lookups can be answered by an
+    index-only scan. This runs separately from the backfill in ``0004`` because Postgres
+    can't build the index while the backfill's deferred trigger events are pending.
+    """
+
+    dependencies = [
+        ("hc_api_connector", "0004_property_address_key"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="property",
+            constraint=models.UniqueConstraint(
+                fields=("address_key",),
+                include=("sewage_type",),
+                name="hc_property_address_key_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:18."""
+
+# django packages
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Track when property data was fetched, and cover it with the address key index."""
+
+    dependencies = [
+        ("hc_api_connector", "0005_property_address_key_uniq"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="property",
+            name="hc_property_address_key_uniq",
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="fetched_at",
+            field=models.DateTimeField(
+                editable=False,
+                help_text="the time at which the data was last retrieved from the API",
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="property",
+            constraint=models.UniqueConstraint(
+                fields=("address_key",),
+                include=("sewage_type", "fetched_at"),
+                name="hc_property_address_key_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:22."""
+
+# django packages
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add rate limits to API clients, with their state shared in token buckets."""
+
+    dependencies = [
+        ("hc_api_connector", "0006_property_fetched_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TokenBucket",
+            fields=[
+                (
+                    "client_id",
+                    models.BigIntegerField(
+                        help_text="the primary key of the API client",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "tokens",
+                    models.FloatField(
+                        help_text="the number of tokens in the bucket at `updated_at`"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        help_text="the time at which the tokens were counted (DB server clock)"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="basicapiclient",
+            name="rate_limit",
+            field=models.FloatField(
+                blank=True,
+                help_text="the maximum number of requests per second, shared by all processes; leave this empty to disable rate limiting",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(0.001)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="basicapiclient",
+            name="rate_limit_burst",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="the number of requests that can be sent at once after idling",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:29."""
+
+# django packages
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Bound the time allowed for each request sent by API clients."""
+
+    dependencies = [
+        ("hc_api_connector", "0007_rate_limit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="basicapiclient",
+            name="connect_timeout",
+            field=models.FloatField(
+                default=3.05,
+                help_text="the number of seconds allowed to connect to the API server",
+                validators=[django.core.validators.MinValueValidator(0.001)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="basicapiclient",
+            name="read_timeout",
+            field=models.FloatField(
+                default=10.0,
+                help_text="the number of seconds allowed between bytes of the response",
+                validators=[django.core.validators.MinValueValidator(0.001)],
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:32."""
+
+# django packages
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Allow requests to be spread across API clients."""
+
+    dependencies = [
+        ("hc_api_connector", "0008_client_timeouts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="basicapiclient",
+            name="active",
+            field=models.BooleanField(
+                default=True,
+                help_text="send requests using this client (see `ClientSelector`)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="basicapiclient",
+            name="weight",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                help_text="the client's share of the traffic, relative to other clients",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+"""Generated by Django 3.2.25 on 2026-10-17 20:05."""
+
+# django packages
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def version_existing(apps, schema_editor):  # type: ignore
+    """Use the time each record's data was fetched as its initial version."""
+    Property = apps.get_model("hc_api_connector", "Property")
+    Property.objects.filter(fetched_at__isnull=False).update(modified=F("fetched_at"))
+
+
+class Migration(migrations.Migration):
+    """Version property records, and cover the version with the address key index."""
+
+    dependencies = [
+        ("hc_api_connector", "0009_client_rotation"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="property",
+            name="hc_property_address_key_uniq",
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="modified",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                help_text=(
+                    "the time at which the record last changed; this versions the "
+                    "record's representations (e.g. in `ETag` headers)"
+                ),
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(version_existing, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="property",
+            constraint=models.UniqueConstraint(
+                fields=("address_key",),
+                include=("sewage_type", "fetched_at", "modified"),
+                name="hc_property_address_key_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:42."""
+
+# django packages
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Index the ordering used for keyset pagination of properties."""
+
+    dependencies = [
+        ("hc_api_connector", "0010_property_modified"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["modified", "id"], name="hc_property_modified_idx"
+            ),
+        ),
+    ]
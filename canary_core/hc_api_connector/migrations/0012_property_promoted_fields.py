@@ -0,0 +1,93 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:49."""
+
+# stdlib
+import itertools
+
+# django packages
+from django.core.exceptions import ValidationError
+from django.db import migrations, models
+
+#: the keys of the promoted values within `other_data`, as of this migration
+PROMOTED_FIELDS = {
+    "year_built": ("property", "year_built"),
+    "building_area_sq_ft": ("property", "building_area_sq_ft"),
+    "property_type": ("property", "property_type"),
+    "water": ("property", "water"),
+    "total_assessed_value": ("assessment", "total_assessed_value"),
+}
+
+BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):  # type: ignore
+    """Copy the promoted values from the `other_data` of existing records."""
+    Property = apps.get_model("hc_api_connector", "Property")
+    records = Property.objects.only("pk", "other_data").order_by("pk").iterator()
+    while True:
+        batch = list(itertools.islice(records, BATCH_SIZE))
+        if not batch:
+            return
+
+        for prop in batch:
+            for name, path in PROMOTED_FIELDS.items():
+                value = prop.other_data
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                try:
+                    value = Property._meta.get_field(name).clean(value, prop)
+                except ValidationError:
+                    value = None
+                setattr(prop, name, value)
+        Property.objects.bulk_update(batch, list(PROMOTED_FIELDS))
+
+
+class Migration(migrations.Migration):
+    """Promote attributes from `other_data` to typed, indexed columns."""
+
+    dependencies = [
+        ("hc_api_connector", "0011_property_modified_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="building_area_sq_ft",
+            field=models.PositiveIntegerField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="property_type",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="total_assessed_value",
+            field=models.DecimalField(
+                blank=True,
+                db_index=True,
+                decimal_places=2,
+                editable=False,
+                max_digits=14,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="water",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=32, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="year_built",
+            field=models.PositiveSmallIntegerField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
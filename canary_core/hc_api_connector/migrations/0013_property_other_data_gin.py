@@ -0,0 +1,24 @@
+"""Generated by Django 3.2.25 on 2026-10-17 19:51."""
+
+# django packages
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Index `other_data` for containment queries."""
+
+    dependencies = [
+        ("hc_api_connector", "0012_property_promoted_fields"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["other_data"],
+                name="hc_property_other_data_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+"""Generated by Django 3.2.25 on 2026-10-17 20:05."""
+
+# django packages
+from django.db import migrations, models
+
+# local
+import canary_core.hc_api_connector.compression
+
+
+class Migration(migrations.Migration):
+    """Store `other_data` compressed, using trained zstd dictionaries."""
+
+    dependencies = [
+        ("hc_api_connector", "0013_property_other_data_gin"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompressionDictionary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dict_id",
+                    models.PositiveBigIntegerField(
+                        editable=False,
+                        help_text="the ID of the dictionary, which is recorded in compressed values",
+                        unique=True,
+                    ),
+                ),
+                ("content", models.BinaryField(help_text="the trained dictionary")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Compression Dictionary",
+                "verbose_name_plural": "Compression Dictionaries",
+            },
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="other_data_zstd",
+            field=canary_core.hc_api_connector.compression.CompressedJSONField(
+                blank=True,
+                help_text="`other_data`, compressed using a trained dictionary (see `HC_OTHER_DATA_COMPRESSION`); `other_data` is empty while this is set",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="property",
+            name="other_data",
+            field=canary_core.hc_api_connector.compression.CompressibleJSONField(
+                default=dict, verbose_name="Other Data"
+            ),
+        ),
+    ]
@@ -8,23 +8,77 @@ from __future__ import annotations
 # stdlib
 import base64
 import datetime as dt
+import functools
+import itertools
 import logging
-from typing import TYPE_CHECKING, Any, Type
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable, Type
 
 # django packages
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
 from django.core import validators
-from django.db.models import CharField, ForeignKey, ManyToManyField, Model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    BigIntegerField,
+    BinaryField,
+    BooleanField,
+    CharField,
+    DateTimeField,
+    DecimalField,
+    FloatField,
+    ForeignKey,
+    Index,
+    ManyToManyField,
+    Model,
+    PositiveBigIntegerField,
+    PositiveIntegerField,
+    PositiveSmallIntegerField,
+    UniqueConstraint,
+)
 from django.db.models.deletion import SET_NULL
 from django.db.models.enums import TextChoices
 from django.db.models.fields import DateField, URLField
 from django.db.models.fields.json import JSONField
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # third party
-import requests
+from asgiref.sync import sync_to_async
 from requests.auth import HTTPBasicAuth
+from requests.exceptions import HTTPError
 from requests.models import Response
+from requests.sessions import Session
+
+# local
+from canary_core.hc_api_connector import addresses, codec, retries
+from canary_core.hc_api_connector.answers import septic_answers
+from canary_core.hc_api_connector.background import BackgroundTasks
+from canary_core.hc_api_connector.balancer import ClientSelector
+from canary_core.hc_api_connector.circuit import circuit_breakers
+from canary_core.hc_api_connector.compression import (
+    CompressedData,
+    CompressedJSONField,
+    CompressibleJSONField,
+)
+from canary_core.hc_api_connector.negative_cache import (
+    NegativeCache,
+    UnknownAddressError,
+)
+from canary_core.hc_api_connector.ratelimit import RateLimiter, rate_limit_wait
+from canary_core.hc_api_connector.sessions import (
+    async_session_pool,
+    session_pool,
+    to_httpx_timeout,
+    to_requests_exception,
+    to_requests_response,
+)
+from canary_core.hc_api_connector.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    advisory_lock,
+)
 
 # TypedDict lives in the `typing` module starting with Python3.8; Python3.7 needs to
 #   import it from typing_extensions instead
@@ -106,6 +160,42 @@ class BasicAPIClient(Model):
         help_text=_("the URL providing the property data"),
     )
 
+    rate_limit: "FloatField" = FloatField(
+        null=True,
+        blank=True,
+        validators=[validators.MinValueValidator(0.001)],
+        help_text=_(
+            "the maximum number of requests per second, shared by all processes; "
+            "leave this empty to disable rate limiting"
+        ),
+    )
+    rate_limit_burst: "PositiveIntegerField" = PositiveIntegerField(
+        default=1,
+        validators=[validators.MinValueValidator(1)],
+        help_text=_("the number of requests that can be sent at once after idling"),
+    )
+
+    active: "BooleanField" = BooleanField(
+        default=True,
+        help_text=_("send requests using this client (see `ClientSelector`)"),
+    )
+    weight: "PositiveSmallIntegerField" = PositiveSmallIntegerField(
+        default=1,
+        validators=[validators.MinValueValidator(1)],
+        help_text=_("the client's share of the traffic, relative to other clients"),
+    )
+
+    connect_timeout: "FloatField" = FloatField(
+        default=3.05,
+        validators=[validators.MinValueValidator(0.001)],
+        help_text=_("the number of seconds allowed to connect to the API server"),
+    )
+    read_timeout: "FloatField" = FloatField(
+        default=10.0,
+        validators=[validators.MinValueValidator(0.001)],
+        help_text=_("the number of seconds allowed between bytes of the response"),
+    )
+
     def __str__(self) -> str:
         """Control the string representation of these records.
 
@@ -129,17 +219,122 @@ class BasicAPIClient(Model):
     def get(self, **params: Any) -> Response:
         """Send a GET request to retrieve property data from this API client.
 
+        Requests are sent through a pooled keep-alive session, so consecutive calls
+        reuse the connection to the API server. If the client has a ``rate_limit``, a
+        token is taken from its shared bucket first (see :func:`rate_limit_wait`).
+        Requests pass through the client's :class:`CircuitBreaker`, so they fail fast
+        while the API is unhealthy.
+
+        Each attempt is bound by the client's ``connect_timeout`` and
+        ``read_timeout``, and by the current :func:`deadline`; failed attempts are
+        retried within the process' :class:`RetryBudget` (see :func:`retries.send`).
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
         Args:
             **params (Any): query string parameters to include with the GET request
 
+        Raises:
+            RateLimitExceeded: raised if the rate limit doesn't allow the request
+            CircuitOpenError: raised while the client's circuit is open
+            DeadlineExceeded: raised if the deadline passes before a response
+
         Returns:
             Response: the response object from the GET request.
         """
-        return requests.get(
-            url=self.url,
-            params=params,
-            auth=self.AuthClass(self.credential_id, self.credential_secret),
-        )
+        return retries.send(functools.partial(self._send, "get", params=params))
+
+    def post(self, addresses: Iterable[PropertyAddress]) -> Response:
+        """Send a POST request to retrieve data for multiple properties at once.
+
+        This uses the HouseCanary API's multi-component form: the request body is a
+        JSON list of addresses, and the response is a list containing the result for
+        each address, in the same order. The request only reads data, so it is retried
+        like :meth:`get`.
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
+        Args:
+            addresses (Iterable[PropertyAddress]): identify the properties to retrieve;
+                the HouseCanary API accepts up to 100 addresses per request
+
+        Raises:
+            RateLimitExceeded: raised if the rate limit doesn't allow the request
+            CircuitOpenError: raised while the client's circuit is open
+            DeadlineExceeded: raised if the deadline passes before a response
+
+        Returns:
+            Response: the response object from the POST request.
+        """
+        attempt = functools.partial(self._send, "post", json=list(addresses))
+        return retries.send(attempt, idempotent=True)
+
+    async def aget(self, **params: Any) -> Response:
+        """Send a GET request without blocking the event loop.
+
+        With the optional ``httpx`` dependency installed, the request is awaited
+        natively using a pooled async client. Otherwise (or if a child class overrides
+        :attr:`AuthClass`), :meth:`get` is run in a worker thread.
+
+        Ignore DAR401 b.c. `darglint` is unaware of the converted exception type.
+
+        noqa: DAR401
+        Args:
+            **params (Any): query string parameters to include with the GET request
+
+        Raises:
+            RequestException: raised for connection errors and timeouts, if the rate
+                limit doesn't allow the request, or while the client's circuit is open
+
+        Returns:
+            Response: the response object from the GET request.
+        """
+        if not async_session_pool.available() or self.AuthClass is not HTTPBasicAuth:
+            return await sync_to_async(self.get, thread_sensitive=False)(**params)
+
+        return await retries.asend(functools.partial(self._asend, params))
+
+    def _send(self, method: str, **kwargs: Any) -> Response:
+        # send a single attempt of the request
+        breaker = circuit_breakers.get(self)
+        breaker.check()
+        rate_limiter.acquire(self)
+        with client_selector.track(self):
+            return breaker.call(self._request, method, **kwargs)
+
+    def _request(self, method: str, **kwargs: Any) -> Response:
+        timeout = retries.timeouts(self.connect_timeout, self.read_timeout)
+        return self.session.request(method, url=self.url, timeout=timeout, **kwargs)
+
+    async def _asend(self, params: dict[str, Any]) -> Response:
+        breaker = circuit_breakers.get(self)
+        breaker.check()
+        await rate_limiter.aacquire(self)
+        with client_selector.track(self):
+            return await breaker.acall(self._aget, params)
+
+    async def _aget(self, params: dict[str, Any]) -> Response:
+        timeout = retries.timeouts(self.connect_timeout, self.read_timeout)
+        try:
+            resp = await async_session_pool.get(self).get(
+                url=self.url, params=params, timeout=to_httpx_timeout(*timeout)
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            raise to_requests_exception(e) from e
+        return to_requests_response(resp)
+
+    @property
+    def session(self) -> Session:
+        """Provide the pooled HTTP session for this client.
+
+        Returns:
+            Session: a session authenticated with this client's credentials
+        """
+        return session_pool.get(self)
 
     @property
     def url(self) -> str:
@@ -173,9 +368,28 @@ class Property(Model):
     """
 
     class Meta:
-        """Specify the plural name."""
+        """Specify the plural name and constraints."""
 
         verbose_name_plural = _("Properties")
+        constraints = [
+            # cover the fields of an `Answer` so `has_septic` can be answered by an
+            #   index-only scan
+            UniqueConstraint(
+                fields=["address_key"],
+                include=["sewage_type", "fetched_at", "modified"],
+                name="hc_property_address_key_uniq",
+            )
+        ]
+        indexes = [
+            # keyset pagination orders by `modified`, breaking ties on the primary key
+            Index(fields=["modified", "id"], name="hc_property_modified_idx"),
+            # serve containment (`@>`) queries of the attributes in `other_data`
+            GinIndex(
+                fields=["other_data"],
+                opclasses=["jsonb_path_ops"],
+                name="hc_property_other_data_gin",
+            ),
+        ]
 
     class SewageType(TextChoices):
         """Enumerate the sewage type choices retrieved from HouseCanary."""
@@ -187,6 +401,17 @@ class Property(Model):
         SEPTIC = "SE", _("Septic")
         YES = "YS", _("Yes")
 
+    #: map the columns promoted from ``other_data`` to the keys of their values, so
+    #:   they can be filtered using indexes; to promote another attribute, add a
+    #:   nullable, indexed field, list it here, and backfill it in its migration
+    PROMOTED_FIELDS: ClassVar[dict[str, tuple[str, ...]]] = {
+        "year_built": ("property", "year_built"),
+        "building_area_sq_ft": ("property", "building_area_sq_ft"),
+        "property_type": ("property", "property_type"),
+        "water": ("property", "water"),
+        "total_assessed_value": ("assessment", "total_assessed_value"),
+    }
+
     apiclient: "ForeignKey[Property, BasicAPIClient]" = ForeignKey(
         to=BasicAPIClient,
         on_delete=SET_NULL,
@@ -206,18 +431,67 @@ class Property(Model):
     # TODO: migrate to using AddressField from `django-address` some day
     identifier = JSONField(
         default=dict,
-        unique=True,
         help_text=_(
             "store address information as JSON for use with the HouseCanary API"
         ),
     )
+    address_key: "CharField" = CharField(
+        max_length=64,
+        editable=False,
+        help_text=_(
+            "the hash of the normalized identifier; set when the record is saved"
+        ),
+    )
     assessment_date: "DateField" = DateField(
         null=True, help_text=_("the date at which the property was assessed")
     )
     sewage_type: "CharField" = CharField(
         max_length=2, choices=SewageType.choices, default=SewageType.UNKNOWN
     )
-    other_data = JSONField(default=dict, verbose_name=_("Other Data"))
+    other_data = CompressibleJSONField(default=dict, verbose_name=_("Other Data"))
+    other_data_zstd = CompressedJSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_(
+            "`other_data`, compressed using a trained dictionary (see "
+            "`HC_OTHER_DATA_COMPRESSION`); `other_data` is empty while this is set"
+        ),
+    )
+
+    # these columns are copied from `other_data` (see `PROMOTED_FIELDS`)
+    year_built: "PositiveSmallIntegerField" = PositiveSmallIntegerField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+    building_area_sq_ft: "PositiveIntegerField" = PositiveIntegerField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+    property_type: "CharField" = CharField(
+        max_length=64, null=True, blank=True, editable=False, db_index=True
+    )
+    water: "CharField" = CharField(
+        max_length=32, null=True, blank=True, editable=False, db_index=True
+    )
+    total_assessed_value: "DecimalField" = DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    fetched_at: "DateTimeField" = DateTimeField(
+        null=True,
+        editable=False,
+        help_text=_("the time at which the data was last retrieved from the API"),
+    )
+    modified: "DateTimeField" = DateTimeField(
+        auto_now=True,
+        help_text=_(
+            "the time at which the record last changed; this versions the record's "
+            "representations (e.g. in `ETag` headers)"
+        ),
+    )
 
     def __str__(self) -> str:
         """Define the record's string representation.
@@ -227,6 +501,28 @@ class Property(Model):
         """
         return " | ".join(f"{k.title()} {v}" for k, v in dict(self.identifier).items())
 
+    @classmethod
+    def from_db(cls, db: str, field_names: list[str], values: list[Any]) -> "Property":
+        """Decompress ``other_data`` when the record is loaded, if it is compressed.
+
+        Args:
+            db (str): the alias of the DB the record was loaded from
+            field_names (list[str]): the names of the loaded fields
+            values (list[Any]): the values of the fields
+
+        Returns:
+            Property: the loaded record
+        """
+        instance = super().from_db(db, field_names, values)
+        if (
+            "other_data" in field_names
+            and "other_data_zstd" in field_names
+            and instance.other_data_zstd is not None
+            and not instance.other_data
+        ):
+            instance.other_data = instance.other_data_zstd
+        return instance
+
     @classmethod
     def from_client(
         cls,
@@ -255,6 +551,227 @@ class Property(Model):
         prop = cls(apiclient=api_client, identifier=address, **kwargs)
         return prop.fetch_and_update(save=save)
 
+    @classmethod
+    async def afrom_client(
+        cls,
+        api_client: BasicAPIClient,
+        address: PropertyAddress,
+        save: bool = False,
+        **kwargs: Any,
+    ) -> "Property":
+        """Provide an async variant of :meth:`from_client`.
+
+        Args:
+            api_client (BasicAPIClient): use this client to retrieve the data for this
+                property
+            address (PropertyAddress): this is directly stored in the ``identifier``
+                field
+            save (bool): save the record to the DB; defaults to ``False``
+            **kwargs (Any): additional keyword arguments are passed directly to the
+                :class:`Property` initializer
+
+        Returns:
+            Property: the new :class:`Property` record; will only be saved if the
+                ``save`` argument is truth-y
+        """
+        prop = cls(apiclient=api_client, identifier=address, **kwargs)
+        return await prop.afetch_and_update(save=save)
+
+    @classmethod
+    def bulk_from_client(
+        cls,
+        api_client: BasicAPIClient,
+        identifiers: Iterable[PropertyAddress],
+        batch_size: "Optional[int]" = None,
+    ) -> list["Property"]:
+        """Retrieve and save the properties at the given addresses in bulk.
+
+        Addresses are sent to the API in batches using :meth:`BasicAPIClient.post`,
+        waiting up to ``HC_BACKGROUND_RATE_LIMIT_WAIT`` seconds for the rate limit.
+        Records that already exist for an address are updated using a single
+        ``bulk_update()``, and the others are created using a single ``bulk_create()``;
+        records created concurrently by another process are left as is. Addresses the
+        API does not recognize are logged and skipped.
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
+        Args:
+            api_client (BasicAPIClient): use this client to retrieve the property data
+            identifiers (Iterable[PropertyAddress]): the addresses of the properties;
+                duplicates are only requested once
+            batch_size (Optional[int]): the number of addresses to include in each API
+                request; defaults to ``HC_API_BATCH_SIZE``
+
+        Raises:
+            HTTPError: raised for unsuccessful API requests
+
+        Returns:
+            list[Property]: the saved records, in the order of ``identifiers``
+        """
+        batch_size = batch_size or settings.HC_API_BATCH_SIZE
+        pending: dict[str, PropertyAddress] = {}
+        for address in identifiers:
+            pending.setdefault(addresses.address_key(address), address)
+
+        items = list(pending.items())
+        props: dict[str, Property] = {}
+        for start in range(0, len(items), batch_size):
+            batch = dict(itertools.islice(items, start, start + batch_size))
+            with rate_limit_wait(settings.HC_BACKGROUND_RATE_LIMIT_WAIT):
+                resp = api_client.post(batch.values())
+            resp.raise_for_status()
+
+            for (key, address), api_data in zip(
+                batch.items(), codec.loads(resp.content)
+            ):
+                if cls._has_result(api_client, address, api_data):
+                    prop = cls(
+                        apiclient=api_client, identifier=address, address_key=key
+                    )
+                    props[key] = prop.update(api_data)
+
+        existing = cls.objects.filter(address_key__in=list(props))
+        for key, pk in existing.values_list("address_key", "pk"):
+            props[key].pk = pk
+            props[key]._state.adding = False  # pylint: disable=protected-access
+
+        new = [prop for prop in props.values() if prop.pk is None]
+        with transaction.atomic():
+            cls.objects.bulk_update(
+                [prop for prop in props.values() if prop.pk is not None],
+                [
+                    "apiclient",
+                    "assessment_date",
+                    "sewage_type",
+                    "other_data",
+                    "other_data_zstd",
+                    *cls.PROMOTED_FIELDS,
+                    "fetched_at",
+                    "modified",
+                ],
+                batch_size=batch_size,
+            )
+            # conflicts are only possible with records created concurrently
+            cls.objects.bulk_create(new, ignore_conflicts=True)
+
+        # bulk operations don't send signals, so discard the cached answers here
+        septic_answers.discard(*props)
+
+        created = cls.objects.filter(address_key__in=[prop.address_key for prop in new])
+        for key, pk in created.values_list("address_key", "pk"):
+            props[key].pk = pk
+            props[key]._state.adding = False  # pylint: disable=protected-access
+
+        return list(props.values())
+
+    @staticmethod
+    def _has_result(
+        api_client: BasicAPIClient, address: PropertyAddress, api_data: dict[str, Any]
+    ) -> bool:
+        component = api_data.get(str(api_client.path).strip("/")) or {}
+        if component.get("api_code", 0) != 0 or not component.get("result"):
+            logger.warning(
+                "no result for address %s: %s",
+                address,
+                component.get("api_code_description"),
+            )
+            return False
+        return True
+
+    @classmethod
+    def get_or_fetch(
+        cls, api_client: BasicAPIClient, address: PropertyAddress
+    ) -> "Property":
+        """Get the property record, or create it using data from the API client.
+
+        Concurrent calls for the same address are coalesced: within this process, only
+        one thread queries the API while the others wait for its result. Across
+        processes, a Postgres advisory lock keyed on the address serializes the
+        lookup, so callers that waited on the lock read the record created by the
+        leader instead of repeating the API request.
+
+        Addresses the API does not recognize are recorded in the negative cache (see
+        :class:`UnknownAddress`); until the entry expires, the cached response is
+        raised instead of repeating the request.
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
+
+        Args:
+            api_client (BasicAPIClient): use this client to retrieve the data for a new
+                property
+            address (PropertyAddress): the address of the property
+
+        Raises:
+            HTTPError: raised for unsuccessful API requests, including
+                :class:`UnknownAddressError` for cached negative results
+
+        Returns:
+            Property: the saved :class:`Property` record
+        """
+        key = addresses.address_key(address)
+        return property_flights.do(
+            key, lambda: cls._get_or_fetch_locked(api_client, address, key)
+        )
+
+    @classmethod
+    def _get_or_fetch_locked(
+        cls, api_client: BasicAPIClient, address: PropertyAddress, key: str
+    ) -> "Property":
+        try:
+            with advisory_lock(key):
+                try:
+                    return cls.objects.get(address_key=key)
+                except cls.DoesNotExist:
+                    negative_cache.check(address, authoritative=True)
+                    return cls.from_client(api_client, address, save=True)
+        except HTTPError as e:
+            cls._cache_not_found(address, e)
+            raise
+
+    @staticmethod
+    def _cache_not_found(address: PropertyAddress, e: HTTPError) -> None:
+        if not isinstance(e, UnknownAddressError) and e.response.status_code == 404:
+            negative_cache.add(address, e.response)
+
+    @classmethod
+    async def aget_or_fetch(
+        cls, api_client: BasicAPIClient, address: PropertyAddress
+    ) -> "Property":
+        """Provide an async variant of :meth:`get_or_fetch`.
+
+        Concurrent calls for the same address are coalesced within the event loop.
+        Holding an advisory lock would pin a DB connection for the duration of the API
+        request, so across processes a lost race on the ``address_key`` constraint is
+        resolved by reading the winner's record instead.
+
+        Args:
+            api_client (BasicAPIClient): use this client to retrieve the data for a new
+                property
+            address (PropertyAddress): the address of the property
+
+        Returns:
+            Property: the saved :class:`Property` record
+        """
+        key = addresses.address_key(address)
+
+        async def fetch() -> "Property":
+            await sync_to_async(negative_cache.check)(address, authoritative=True)
+            try:
+                return await cls.afrom_client(api_client, address, save=True)
+            except HTTPError as e:
+                await sync_to_async(cls._cache_not_found)(address, e)
+                raise
+            except IntegrityError:
+                logger.info("property created concurrently: %s", address)
+                return await sync_to_async(cls.objects.get)(address_key=key)
+
+        return await async_property_flights.do(key, fetch)
+
     def fetch(self) -> Response:
         """Update this record with data retrieved from its API client.
 
@@ -285,13 +802,51 @@ class Property(Model):
             Property: return ``self`` after applying changes
         """
         resp = self.fetch()
-        self.update(resp.json())
+        self.update(codec.loads(resp.content))
 
         if save:
             self.save()
 
         return self
 
+    async def afetch(self) -> Response:
+        """Provide an async variant of :meth:`fetch`.
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
+        Raises:
+            HttpError: raised by the API client for unsuccessful API requests
+
+        Returns:
+            Response: the :class:`Response` object from the HouseCanary API request
+        """
+        # pylint: disable=no-member     # it really does have the `aget()` method
+        resp = await self.apiclient.aget(**dict(self.identifier))
+        resp.raise_for_status()
+        return resp
+
+    async def afetch_and_update(self, save: bool = False) -> "Property":
+        """Provide an async variant of :meth:`fetch_and_update`.
+
+        The request is awaited; saving the record runs in Django's thread-sensitive
+        executor.
+
+        Args:
+            save (bool): if set, save the record after updating it; defaults to False
+
+        Returns:
+            Property: return ``self`` after applying changes
+        """
+        resp = await self.afetch()
+        self.update(codec.loads(resp.content))
+
+        if save:
+            await sync_to_async(self.save)()
+
+        return self
+
     def update(self, api_data: dict[str, Any]) -> "Property":
         """Update this object with the provided HouseCanary API data.
 
@@ -337,8 +892,265 @@ class Property(Model):
 
         if result:
             self.other_data = result
+            self.compress(settings.HC_OTHER_DATA_COMPRESSION)
+            self.promote()
 
+        # `bulk_update()` doesn't set `auto_now` fields, so set `modified` here
+        self.fetched_at = self.modified = timezone.now()
         return self
 
+    def compress(self, enable: bool = True) -> "Property":
+        """Store ``other_data`` compressed, or uncompressed (see :mod:`.compression`).
+
+        # NOTE: properties are updated, but the record is not saved
+
+        Args:
+            enable (bool): store the data compressed; defaults to ``True``
+
+        Returns:
+            Property: returns ``self`` for convenience
+        """
+        if enable:
+            self.other_data = self.other_data_zstd = CompressedData(self.other_data)
+        else:
+            self.other_data, self.other_data_zstd = dict(self.other_data), None
+        return self
+
+    def promote(self) -> "Property":
+        """Copy the values of :attr:`PROMOTED_FIELDS` from ``other_data``.
+
+        Values that are missing, or that aren't valid for their column, are cleared.
+
+        # NOTE: properties are updated, but the record is not saved
+
+        Returns:
+            Property: returns ``self`` for convenience
+        """
+        for name, path in self.PROMOTED_FIELDS.items():
+            value: Any = self.other_data
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+
+            try:
+                value = self._meta.get_field(name).clean(value, self)
+            except ValidationError:
+                logger.warning("invalid value for %s: %r", name, value)
+                value = None
+            setattr(self, name, value)
+
+        return self
+
+    @staticmethod
+    def is_stale(fetched_at: "Optional[dt.datetime]") -> bool:
+        """Determine if data retrieved at the given time should be refreshed.
+
+        Args:
+            fetched_at (Optional[dt.datetime]): the time the data was retrieved; records
+                fetched before this was tracked are considered stale
+
+        Returns:
+            bool: ``True`` if the data is older than ``HC_PROPERTY_MAX_AGE``; always
+                ``False`` if ``HC_PROPERTY_MAX_AGE`` is zero
+        """
+        max_age = settings.HC_PROPERTY_MAX_AGE
+        if not max_age:
+            return False
+        return fetched_at is None or timezone.now() - fetched_at > dt.timedelta(
+            seconds=max_age
+        )
+
+    @staticmethod
+    def is_expired(fetched_at: "Optional[dt.datetime]") -> bool:
+        """Determine if data retrieved at the given time is too old to serve.
+
+        Stale data is served for ``HC_PROPERTY_STALE_GRACE`` seconds past its max age
+        while it is refreshed in the background.
+
+        Args:
+            fetched_at (Optional[dt.datetime]): the time the data was retrieved; records
+                fetched before this was tracked are refreshed in the background
+                instead of expiring
+
+        Returns:
+            bool: ``True`` if the data must be refreshed before it is served
+        """
+        max_age = settings.HC_PROPERTY_MAX_AGE
+        if not max_age or fetched_at is None:
+            return False
+        return timezone.now() - fetched_at > dt.timedelta(
+            seconds=max_age + settings.HC_PROPERTY_STALE_GRACE
+        )
+
+    @classmethod
+    def refresh(cls, key: str) -> "Property":
+        """Update the record with the given address key if its data is stale.
+
+        The record is re-read while holding the advisory lock for its address, so
+        concurrent refreshes (in this process or others) send one API request; the
+        callers that waited on the lock find the data fresh. Records without an active
+        API client are refreshed using the client chosen by :class:`ClientSelector`.
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
+        Args:
+            key (str): the address key of the record
+
+        Raises:
+            HTTPError: raised for unsuccessful API requests
+
+        Returns:
+            Property: the refreshed record
+        """
+        with advisory_lock(key):
+            prop = cls.objects.select_related("apiclient").get(address_key=key)
+            if not cls.is_stale(prop.fetched_at):
+                return prop
+
+            if prop.apiclient is None or not prop.apiclient.active:
+                prop.apiclient = client_selector.select()
+            if prop.apiclient is None:
+                logger.error("can't refresh %s: no API client records", prop)
+                return prop
+
+            logger.info("refreshing stale property %s", prop)
+            return prop.fetch_and_update(save=True)
+
+    @classmethod
+    def refresh_in_background(cls, key: str) -> None:
+        """Schedule :meth:`refresh` for the record without waiting for it.
+
+        Args:
+            key (str): the address key of the record
+        """
+        property_refreshes.submit(key, cls.refresh, key)
+
+
+class UnknownAddress(Model):
+    """Cache a "no such property" response from the HouseCanary API.
+
+    Records are managed by :data:`negative_cache`; deleting them (e.g. from the admin
+    site or the ``unknownaddresses`` API) purges the cached result.
+    """
+
+    class Meta:
+        """Set the verbose/plural names."""
+
+        verbose_name = _("Unknown Address")
+        verbose_name_plural = _("Unknown Addresses")
+
+    key: "CharField" = CharField(
+        max_length=64,
+        unique=True,
+        editable=False,
+        help_text=_("the hashed address"),
+    )
+    identifier = JSONField(
+        default=dict,
+        help_text=_("the address that was not found by the HouseCanary API"),
+    )
+    status_code: "PositiveSmallIntegerField" = PositiveSmallIntegerField(
+        help_text=_("the status code of the response from the HouseCanary API")
+    )
+    content: "BinaryField" = BinaryField(
+        help_text=_("the body of the response from the HouseCanary API")
+    )
+    created_at: "DateTimeField" = DateTimeField(auto_now_add=True)
+    expires_at: "DateTimeField" = DateTimeField(
+        db_index=True, help_text=_("the cached response is ignored after this time")
+    )
+
+    def __str__(self) -> str:
+        """Define the record's string representation.
+
+        Returns:
+            str: the string representation of the record
+        """
+        return " | ".join(f"{k.title()} {v}" for k, v in dict(self.identifier).items())
+
+    @classmethod
+    def key_for(cls, address: PropertyAddress) -> str:
+        """Hash the normalized address to provide the key of its cache entry.
+
+        Args:
+            address (PropertyAddress): the address of the property
+
+        Returns:
+            str: the key
+        """
+        return addresses.address_key(address)
+
+
+#: Cache the addresses that the HouseCanary API does not recognize
+negative_cache = NegativeCache(UnknownAddress)
+
+
+class TokenBucket(Model):
+    """Store the shared rate limit state of a :class:`BasicAPIClient`.
+
+    Rows are written by the :class:`RateLimiter` using a dedicated DB connection, so
+    ``client_id`` is deliberately not a foreign key: the client may have been created
+    by a transaction that the dedicated connection can't see yet.
+    """
+
+    client_id: "BigIntegerField" = BigIntegerField(
+        primary_key=True, help_text=_("the primary key of the API client")
+    )
+    tokens: "FloatField" = FloatField(
+        help_text=_("the number of tokens in the bucket at `updated_at`")
+    )
+    updated_at: "DateTimeField" = DateTimeField(
+        help_text=_("the time at which the tokens were counted (DB server clock)")
+    )
+
+    def __str__(self) -> str:
+        """Define the record's string representation.
+
+        Returns:
+            str: the string representation of the record
+        """
+        return f"API client {self.client_id} | {self.tokens:.2f} tokens"
+
+
+class CompressionDictionary(Model):
+    """Store a zstd dictionary trained on the data of :class:`Property` records.
+
+    New values are compressed using the latest dictionary; older dictionaries are kept
+    to decompress the values compressed using them (see :mod:`.compression`).
+    """
+
+    class Meta:
+        """Set the verbose/plural names."""
+
+        verbose_name = _("Compression Dictionary")
+        verbose_name_plural = _("Compression Dictionaries")
+
+    dict_id: "PositiveBigIntegerField" = PositiveBigIntegerField(
+        unique=True,
+        editable=False,
+        help_text=_("the ID of the dictionary, which is recorded in compressed values"),
+    )
+    content: "BinaryField" = BinaryField(help_text=_("the trained dictionary"))
+    created_at: "DateTimeField" = DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        """Define the record's string representation.
+
+        Returns:
+            str: the string representation of the record
+        """
+        return f"dictionary {self.dict_id} | {len(self.content)} bytes"
+
+
+rate_limiter = RateLimiter(TokenBucket)
+
+#: Choose the API client for each request sent by this process
+client_selector = ClientSelector(BasicAPIClient)
+
+#: Coalesce concurrent lookups of new properties within this process
+property_flights = SingleFlight()
+property_refreshes = BackgroundTasks()
+async_property_flights = AsyncSingleFlight()
 
 logger.debug("imported module %s", __name__)
@@ -0,0 +1,282 @@
+"""Remember addresses that the HouseCanary API does not recognize.
+
+Every request to the HouseCanary API is billed, including those for addresses it does
+not know. :class:`NegativeCache` records these "no such property" responses in the DB
+for a configurable TTL and replays them instead of repeating the request.
+
+An in-memory :class:`BloomFilter` sits in front of the DB table: addresses that are
+definitely not cached (the vast majority) are passed through without a query, and
+entries recently seen by this process are rejected without touching the DB.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import TYPE_CHECKING, NamedTuple, NoReturn, Optional, Type
+
+# django packages
+from django.conf import settings
+from django.utils import timezone
+
+# third party
+from requests.exceptions import HTTPError
+from requests.models import Response
+
+if TYPE_CHECKING:
+    # local
+    from canary_core.hc_api_connector.models import (  # noqa: F401  # pragma: no cover
+        PropertyAddress,
+        UnknownAddress,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownAddressError(HTTPError):
+    """Replay a cached "no such property" response from the HouseCanary API."""
+
+
+class BloomFilter:
+    """Provide a compact, probabilistic set membership test.
+
+    Membership tests may return false positives (at the configured ``error_rate``) but
+    never false negatives.
+
+    >>> bloom = BloomFilter(capacity=100)
+    >>> bloom.add("128 chestnut st")
+    >>> "128 chestnut st" in bloom
+    True
+    >>> "7500 melrose ave" in bloom
+    False
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        # derive all positions from two hashes (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        """Add the key to the filter.
+
+        Args:
+            key (str): the key to add
+        """
+        for pos in self._positions(key):
+            self._bits[pos // 8] |= 1 << (pos % 8)
+
+    def __contains__(self, key: object) -> bool:
+        """Test if the key might be in the filter.
+
+        Args:
+            key (object): the key to test
+
+        Returns:
+            bool: ``False`` if the key is definitely absent
+        """
+        return isinstance(key, str) and all(
+            self._bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(key)
+        )
+
+
+class _LocalEntry(NamedTuple):
+    """Cache a negative result in process memory."""
+
+    #: `time.monotonic()` after which the entry must be re-read from the DB
+    valid_until: float
+    status_code: int
+    content: bytes
+
+
+class NegativeCache:
+    """Cache "no such property" responses from the HouseCanary API.
+
+    Entries are stored using the :class:`UnknownAddress` model. Each process keeps a
+    Bloom filter of the cached keys, which is rebuilt from the DB every
+    ``HC_NEGATIVE_CACHE_SYNC_INTERVAL`` seconds, along with the entries it has recently
+    read or written (at most ``HC_NEGATIVE_CACHE_SIZE``, least recently used first).
+    Entries purged by another process may therefore be served from memory until the
+    sync interval elapses.
+    """
+
+    def __init__(self, model: Type["UnknownAddress"]) -> None:
+        self.model = model
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_expires = 0.0
+        self._local_lock = threading.Lock()
+        self._local: OrderedDict[str, _LocalEntry] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Determine if negative caching is enabled.
+
+        Returns:
+            bool: ``True`` unless ``HC_NEGATIVE_CACHE_TTL`` is zero
+        """
+        return settings.HC_NEGATIVE_CACHE_TTL > 0
+
+    def check(self, address: "PropertyAddress", authoritative: bool = False) -> None:
+        """Raise the cached response if the address is known to be unknown.
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
+        Args:
+            address (PropertyAddress): the address to check
+            authoritative (bool): skip the Bloom filter and in-memory entries, and read
+                the entry from the DB; use this before sending a request to the API,
+                since the Bloom filter may not know about entries recently created by
+                other processes
+
+        Raises:
+            UnknownAddressError: raised if the address has a cached negative result
+        """
+        if not self.enabled:
+            return
+
+        key = self.model.key_for(address)
+        if not authoritative:
+            if key not in self._filter():
+                return
+
+            entry = self._recall(key)
+            if entry is not None:
+                self._raise(entry)
+
+        record = (
+            self.model.objects.filter(key=key, expires_at__gt=timezone.now())
+            .only("status_code", "content")
+            .first()
+        )
+        if record is None:
+            self.discard(key)
+            return
+
+        entry = self._remember(key, record.status_code, bytes(record.content))
+        self._raise(entry)
+
+    def add(self, address: "PropertyAddress", response: Response) -> None:
+        """Cache the response to a request for an unknown address.
+
+        Args:
+            address (PropertyAddress): the address that was not found
+            response (Response): the response from the HouseCanary API
+        """
+        if not self.enabled:
+            return
+
+        key = self.model.key_for(address)
+        self.model.objects.update_or_create(
+            key=key,
+            defaults=dict(
+                identifier=address,
+                status_code=response.status_code,
+                content=response.content,
+                expires_at=timezone.now()
+                + timedelta(seconds=settings.HC_NEGATIVE_CACHE_TTL),
+            ),
+        )
+        logger.info("cached negative result for address %s", address)
+        self._remember(key, response.status_code, response.content)
+        self._filter().add(key)
+
+    def discard(self, key: str) -> None:
+        """Forget the in-memory entry for the key.
+
+        The Bloom filter cannot remove keys; a stale positive only results in a DB
+        query.
+
+        Args:
+            key (str): the key of the purged entry
+        """
+        with self._local_lock:
+            self._local.pop(key, None)
+
+    def reset(self) -> None:
+        """Forget all in-memory entries and rebuild the Bloom filter on next use."""
+        with self._lock, self._local_lock:
+            self._local.clear()
+            self._bloom = None
+
+    def _filter(self) -> BloomFilter:
+        bloom = self._bloom
+        if bloom is not None and self._bloom_expires > time.monotonic():
+            return bloom
+
+        with self._lock:
+            # another thread may have rebuilt the filter while this one was waiting
+            bloom = self._bloom
+            if bloom is not None and self._bloom_expires > time.monotonic():
+                return bloom
+
+            keys = self.model.objects.filter(expires_at__gt=timezone.now()).values_list(
+                "key", flat=True
+            )
+
+            # size the filter using a count, then stream the keys in a single pass
+            bloom = BloomFilter(max(settings.HC_NEGATIVE_CACHE_CAPACITY, keys.count()))
+            for key in keys.iterator():
+                bloom.add(key)
+
+            self._bloom = bloom
+            self._bloom_expires = (
+                time.monotonic() + settings.HC_NEGATIVE_CACHE_SYNC_INTERVAL
+            )
+            return bloom
+
+    def _remember(self, key: str, status_code: int, content: bytes) -> _LocalEntry:
+        entry = _LocalEntry(
+            time.monotonic() + settings.HC_NEGATIVE_CACHE_SYNC_INTERVAL,
+            status_code,
+            content,
+        )
+        with self._local_lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > settings.HC_NEGATIVE_CACHE_SIZE:
+                self._local.popitem(last=False)
+        return entry
+
+    def _recall(self, key: str) -> Optional[_LocalEntry]:
+        with self._local_lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+
+            if entry.valid_until <= time.monotonic():
+                del self._local[key]
+                return None
+
+            self._local.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def _raise(entry: _LocalEntry) -> NoReturn:
+        response = Response()
+        response.status_code = entry.status_code
+        response._content = entry.content  # pylint: disable=protected-access
+        response.headers["Content-Type"] = "application/json"
+        raise UnknownAddressError(
+            f"{entry.status_code} cached negative result", response=response
+        )
+
+
+logger.debug("imported module %s", __name__)
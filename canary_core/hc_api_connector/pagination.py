@@ -0,0 +1,209 @@
+"""Paginate the API's list views using keyset (cursor) pagination.
+
+Offset pagination scans (and discards) every record before the requested page, and
+counts all of the matching records on every request. :class:`KeysetPagination`
+instead filters on the last position of the previous page, so each page costs the same
+as the first one when the ordering is indexed.
+
+The position encodes every ordering field, and ties are broken on the primary key, so
+positions are unique and pages never need an offset. Views should only expose
+``ordering_fields`` that are not nullable, and index them together with the primary key
+(e.g. ``Index(fields=["modified", "id"])``) to serve the row comparison.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+import logging
+from typing import Any, Optional, Sequence
+
+# django packages
+from django.core.exceptions import ValidationError
+from django.db.models import F, Field, Func, Model, Q, QuerySet, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+
+class KeysetPagination(CursorPagination):
+    """Paginate records using an opaque cursor, without counting them.
+
+    The page size defaults to ``REST_FRAMEWORK["PAGE_SIZE"]``; clients can request up
+    to :attr:`max_page_size` records using ``?limit=``. Pass ``?ordering=`` to order
+    by any of the view's ``ordering_fields``.
+    """
+
+    ordering = "pk"
+    page_size_query_param = "limit"
+    max_page_size = 1000
+
+    def paginate_queryset(
+        self, queryset: "QuerySet[Model]", request: Request, view: Any = None
+    ) -> Optional[list[Model]]:
+        """Select the records following (or, for reverse cursors, preceding) the cursor.
+
+        Args:
+            queryset (QuerySet[Model]): the records to paginate
+            request (Request): the incoming request
+            view (Any): the view being paginated
+
+        Returns:
+            Optional[list[Model]]: the page of records, or ``None`` if pagination is
+                disabled
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+
+        ordering = (
+            [_invert(name) for name in self.ordering] if reverse else self.ordering
+        )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = self.filter_after(queryset, ordering, position)
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = len(results) > self.page_size
+        else:
+            self.has_next = len(results) > self.page_size
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self) -> Optional[str]:
+        """Link to the records following the page.
+
+        Returns:
+            Optional[str]: the URL of the next page, if there is one
+        """
+        if not self.has_next:
+            return None
+
+        # an empty page follows a reverse cursor past the first record; start over
+        position = self.encode_position(self.page[-1]) if self.page else None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self) -> Optional[str]:
+        """Link to the records preceding the page.
+
+        Returns:
+            Optional[str]: the URL of the previous page, if there is one
+        """
+        if not self.has_previous:
+            return None
+
+        # an empty page follows the last record; go back to the last page
+        position = self.encode_position(self.page[0]) if self.page else None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def get_ordering(
+        self, request: Request, queryset: "QuerySet[Model]", view: Any
+    ) -> tuple[str, ...]:
+        """Order by the requested fields, breaking ties on the primary key.
+
+        Args:
+            request (Request): the incoming request
+            queryset (QuerySet[Model]): the records to paginate
+            view (Any): the view being paginated
+
+        Returns:
+            tuple[str, ...]: the fields to order by
+        """
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        pk_names = {"pk", queryset.model._meta.pk.name}
+        if not pk_names & {field.lstrip("-") for field in ordering}:
+            ordering += ("-pk" if ordering[0].startswith("-") else "pk",)
+        return ordering
+
+    def encode_position(self, instance: Model) -> str:
+        """Encode the values of the ordering fields of a record.
+
+        Args:
+            instance (Model): the record
+
+        Returns:
+            str: the position of the record
+        """
+        return json.dumps(
+            [str(getattr(instance, name.lstrip("-"))) for name in self.ordering]
+        )
+
+    def filter_after(
+        self, queryset: "QuerySet[Model]", ordering: Sequence[str], position: str
+    ) -> "QuerySet[Model]":
+        """Select the records that follow the position in the given ordering.
+
+        Args:
+            queryset (QuerySet[Model]): the ordered records
+            ordering (Sequence[str]): the fields the records are ordered by
+            position (str): the encoded position of the last record of the previous page
+
+        Raises:
+            NotFound: raised if the position is invalid
+
+        Returns:
+            QuerySet[Model]: the records following the position
+        """
+        names = [name.lstrip("-") for name in ordering]
+        lookups = ["lt" if name.startswith("-") else "gt" for name in ordering]
+        fields = [_field(queryset.model, name) for name in names]
+        try:
+            raw = json.loads(position)
+            values = [
+                Value(field.to_python(value), output_field=field)
+                for field, value in zip(fields, raw)
+            ]
+        except (TypeError, ValueError, ValidationError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+        if not isinstance(raw, list) or len(values) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(set(lookups)) == 1:
+            # a row comparison, e.g. `(modified, id) > (%s, %s)`, uses a composite index
+            row = Func(
+                *(F(name) for name in names), function="ROW", output_field=Field()
+            )
+            return queryset.alias(_position=row).filter(
+                **{
+                    f"_position__{lookups[0]}": Func(
+                        *values, function="ROW", output_field=Field()
+                    )
+                }
+            )
+
+        # mixed directions can't be compared as a row
+        after = Q()
+        for i, (name, lookup, value) in enumerate(zip(names, lookups, values)):
+            ties = dict(zip(names[:i], values[:i]))
+            after |= Q(**ties, **{f"{name}__{lookup}": value})
+        return queryset.filter(after)
+
+
+def _field(model: type[Model], name: str) -> Field:
+    return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+
+def _invert(name: str) -> str:
+    return name[1:] if name.startswith("-") else f"-{name}"
+
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,64 @@
+"""Parse JSON request bodies using the codec selected by ``HC_JSON_CODEC``.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import codecs
+import logging
+from typing import IO, Any, Optional
+
+# django packages
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+# local
+from canary_core.hc_api_connector import codec
+from canary_core.hc_api_connector.renderers import CodecJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class CodecJSONParser(JSONParser):
+    """Parse JSON using the configured codec.
+
+    The ``stdlib`` codec, and bodies that aren't encoded as UTF-8, are parsed by DRF's
+    :class:`JSONParser`.
+    """
+
+    renderer_class = CodecJSONRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: Optional[str] = None,
+        parser_context: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        """Parse the request body.
+
+        Args:
+            stream (IO[bytes]): the request body
+            media_type (Optional[str]): the media type of the body
+            parser_context (Optional[dict[str, Any]]): the context of the view
+
+        Raises:
+            ParseError: raised if the body isn't valid JSON
+
+        Returns:
+            Any: the parsed data
+        """
+        selected = codec.get_codec()
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if selected.name == "stdlib" or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return selected.loads(stream.read())
+        except ValueError as e:
+            raise ParseError(f"JSON parse error - {e}") from e
+
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,288 @@
+"""Limit the rate of requests sent by each API client, across processes and nodes.
+
+The HouseCanary API enforces a quota of requests per second for each credential. Each
+:class:`BasicAPIClient` with a ``rate_limit`` shares a token bucket stored in the DB
+(see :class:`TokenBucket`), so the quota holds no matter how many workers send
+requests using the client.
+
+A token is taken using a single conditional upsert, which refills the bucket based on
+the DB server's clock. The statement runs on a dedicated autocommit connection, so the
+bucket's row lock is released immediately instead of being held until the caller's
+transaction (e.g. :func:`advisory_lock`) commits.
+
+Callers choose between waiting for a token and failing fast using
+:func:`rate_limit_wait`::
+
+    with rate_limit_wait(0):
+        client.get(**address)  # raises RateLimitExceeded if no token is available
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Type
+
+# django packages
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# third party
+from asgiref.sync import sync_to_async
+from requests.exceptions import RequestException
+
+# local
+from canary_core.hc_api_connector.retries import remaining
+
+if TYPE_CHECKING:
+    # django packages
+    from django.db.backends.base.base import (  # noqa: F401  # pragma: no cover
+        BaseDatabaseWrapper,
+    )
+
+    # local
+    from canary_core.hc_api_connector.models import (  # noqa: F401  # pragma: no cover
+        BasicAPIClient,
+        TokenBucket,
+    )
+
+logger = logging.getLogger(__name__)
+
+_wait: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "rate_limit_wait", default=None
+)
+
+
+class RateLimitExceeded(RequestException):
+    """Indicate that no token became available within the allowed wait."""
+
+    def __init__(self, *args: Any, retry_after: float = 0.0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        #: the number of seconds until a token is expected to be available
+        self.retry_after = retry_after
+
+
+@contextmanager
+def rate_limit_wait(seconds: float) -> Iterator[None]:
+    """Set the maximum time to wait for a token within the context.
+
+    Args:
+        seconds (float): the maximum number of seconds to wait; use ``0`` to fail fast
+
+    Yields:
+        None: requests sent within the context use this limit
+    """
+    token = _wait.set(seconds)
+    try:
+        yield
+    finally:
+        _wait.reset(token)
+
+
+class RateLimiter:
+    """Take tokens from the shared bucket of each rate-limited API client.
+
+    Each thread uses its own dedicated DB connection for the buckets; connections
+    inherited from a parent process are discarded after a fork. Worker threads call
+    :meth:`release` when they finish, and the connections of threads that exited
+    without doing so are closed by :meth:`prune`.
+    """
+
+    def __init__(self, model: Type["TokenBucket"]) -> None:
+        self.model = model
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict[threading.Thread, "BaseDatabaseWrapper"] = {}
+        self._pid = os.getpid()
+
+    @staticmethod
+    def max_wait() -> float:
+        """Provide the maximum time to wait for a token in the current context.
+
+        Returns:
+            float: the value set by :func:`rate_limit_wait`, or ``HC_RATE_LIMIT_WAIT``;
+                either way, the wait doesn't extend past the current :func:`deadline`
+        """
+        wait = _wait.get()
+        wait = settings.HC_RATE_LIMIT_WAIT if wait is None else wait
+        left = remaining()
+        return wait if left is None else max(min(wait, left), 0.0)
+
+    def acquire(self, client: "BasicAPIClient") -> None:
+        """Take a token for the client, waiting for one if necessary.
+
+        Clients without a ``rate_limit`` are not limited.
+
+        Args:
+            client (BasicAPIClient): the client sending the request
+
+        Raises:
+            RateLimitExceeded: raised if no token is available within the wait allowed
+                by :meth:`max_wait`
+        """
+        if not client.rate_limit or client.pk is None:
+            return
+
+        deadline = time.monotonic() + self.max_wait()
+        while True:
+            delay = self.try_acquire(client)
+            if delay <= 0:
+                return
+
+            if time.monotonic() + delay > deadline:
+                raise RateLimitExceeded(
+                    f"rate limit exceeded for API client {client.pk}",
+                    retry_after=delay,
+                )
+            time.sleep(delay)
+
+    async def aacquire(self, client: "BasicAPIClient") -> None:
+        """Provide an async variant of :meth:`acquire`.
+
+        Ignore DAR402 b.c. `darglint` is unaware of exceptions raised by called
+        methods.
+
+        noqa: DAR402
+        Args:
+            client (BasicAPIClient): the client sending the request
+
+        Raises:
+            RateLimitExceeded: raised if no token is available within the wait allowed
+                by :meth:`max_wait`
+        """
+        if not client.rate_limit or client.pk is None:
+            return
+
+        deadline = time.monotonic() + self.max_wait()
+        try_acquire = sync_to_async(self.try_acquire, thread_sensitive=False)
+        while True:
+            delay = await try_acquire(client)
+            if delay <= 0:
+                return
+
+            if time.monotonic() + delay > deadline:
+                raise RateLimitExceeded(
+                    f"rate limit exceeded for API client {client.pk}",
+                    retry_after=delay,
+                )
+            await asyncio.sleep(delay)
+
+    def try_acquire(self, client: "BasicAPIClient") -> float:
+        """Take a token for the client if one is available, without waiting.
+
+        Args:
+            client (BasicAPIClient): the client sending the request
+
+        Returns:
+            float: ``0`` if a token was taken; otherwise, the number of seconds until
+                the next token is available
+        """
+        table = self.model._meta.db_table  # pylint: disable=protected-access
+        refill = (
+            "LEAST(%(burst)s, b.tokens + %(rate)s * "
+            "EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at)::float8)"
+        )
+        params = {
+            "pk": client.pk,
+            "rate": float(client.rate_limit),
+            "burst": float(max(client.rate_limit_burst, 1)),
+        }
+
+        with self._connection().cursor() as cursor:
+            # the row is only updated (and returned) if a token is available
+            cursor.execute(
+                f"INSERT INTO {table} AS b (client_id, tokens, updated_at) "
+                "VALUES (%(pk)s, %(burst)s - 1, clock_timestamp()) "
+                "ON CONFLICT (client_id) DO UPDATE "
+                f"SET tokens = {refill} - 1, updated_at = clock_timestamp() "
+                f"WHERE {refill} >= 1 "
+                "RETURNING b.tokens",
+                params,
+            )
+            if cursor.fetchone() is not None:
+                return 0.0
+
+            cursor.execute(
+                f"SELECT (1 - {refill}) / %(rate)s FROM {table} AS b "
+                "WHERE b.client_id = %(pk)s",
+                params,
+            )
+            row = cursor.fetchone()
+
+        logger.debug("API client %s is rate limited", client.pk)
+        return max(float(row[0]), 0.001) if row else 0.0
+
+    def reset(self, pk: int) -> None:
+        """Discard the client's bucket, e.g. after the client is deleted.
+
+        Args:
+            pk (int): the primary key of the client
+        """
+        table = self.model._meta.db_table  # pylint: disable=protected-access
+        with self._connection().cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE client_id = %s", [pk])
+
+    def close(self) -> None:
+        """Close the dedicated DB connections of all threads.
+
+        Each connection is reopened by its thread on next use.
+        """
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+
+    def release(self) -> None:
+        """Close the dedicated DB connection of the calling thread.
+
+        Call this when a worker thread finishes, like ``connection.close()``; the
+        connection is reopened if the thread uses the rate limiter again.
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            return
+
+        del self._local.connection
+        with self._lock:
+            if self._connections.get(threading.current_thread()) is conn:
+                del self._connections[threading.current_thread()]
+        if self._local.pid == os.getpid():
+            conn.close()
+
+    def prune(self) -> None:
+        """Close the dedicated DB connections of threads that have exited."""
+        with self._lock:
+            self._prune()
+
+    def _prune(self) -> None:
+        for thread in [t for t in self._connections if not t.is_alive()]:
+            self._connections.pop(thread).close()
+
+    def _connection(self) -> "BaseDatabaseWrapper":
+        conn = getattr(self._local, "connection", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = connections.create_connection(DEFAULT_DB_ALIAS)
+            # only this thread uses the connection, but `close()` may be called by any
+            conn.inc_thread_sharing()
+            self._local.connection = conn
+            self._local.pid = os.getpid()
+            with self._lock:
+                if self._local.pid != self._pid:
+                    # connections inherited from the parent belong to the parent
+                    self._connections.clear()
+                    self._pid = self._local.pid
+                self._prune()
+                self._connections[threading.current_thread()] = conn
+
+        conn.close_if_unusable_or_obsolete()
+        return conn
+
+
+logger.debug("imported module %s", __name__)
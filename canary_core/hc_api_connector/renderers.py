@@ -0,0 +1,192 @@
+"""Render API responses as JSON, or newline-delimited JSON (NDJSON).
+
+:class:`CodecJSONRenderer` renders JSON using the codec selected by ``HC_JSON_CODEC``
+(see :mod:`canary_core.hc_api_connector.codec`).
+
+List views can stream their records using :func:`stream_ndjson`, which serializes the
+queryset in chunks read from a server-side cursor (by a worker thread under ASGI).
+:class:`NDJSONRenderer` enables the ``?format=ndjson`` query parameter, and renders the
+responses that aren't streamed (e.g. errors) in the same format.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import asyncio
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional, Type, Union
+
+# django packages
+from django.conf import settings
+from django.db import connection
+from django.db.models import Model, Prefetch, QuerySet, prefetch_related_objects
+from django.http.response import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.serializers import BaseSerializer
+
+# local
+from canary_core.hc_api_connector import codec
+
+logger = logging.getLogger(__name__)
+
+
+class CodecJSONRenderer(JSONRenderer):
+    """Render JSON using the configured codec.
+
+    Indented responses (e.g. for the browsable API) and the ``stdlib`` codec are
+    rendered by DRF's :class:`JSONRenderer`, so its settings (e.g. ``COMPACT_JSON``)
+    still apply to them.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[dict[str, Any]] = None,
+    ) -> bytes:
+        """Render the data as compact JSON.
+
+        Args:
+            data (Any): the data to render
+            accepted_media_type (Optional[str]): the media type accepted by the client
+            renderer_context (Optional[dict[str, Any]]): the context of the view
+
+        Returns:
+            bytes: the rendered data
+        """
+        if data is None:
+            return b""
+
+        selected = codec.get_codec()
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if selected.name == "stdlib" or indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = selected.dumps(data)
+        # escape U+2028 and U+2029 like `JSONRenderer` does, for JavaScript consumers
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Render each item of a list as a line of JSON."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[dict[str, Any]] = None,
+    ) -> bytes:
+        """Render the data; lists are rendered one item per line.
+
+        Args:
+            data (Any): the data to render
+            accepted_media_type (Optional[str]): the media type accepted by the client
+            renderer_context (Optional[dict[str, Any]]): the context of the view
+
+        Returns:
+            bytes: the rendered data
+        """
+        if data is None:
+            return b""
+
+        items = data if isinstance(data, list) else [data]
+        return b"".join(dumps(item) for item in items)
+
+
+def dumps(item: Any) -> bytes:
+    """Encode an item as a line of JSON.
+
+    Args:
+        item (Any): the item to encode
+
+    Returns:
+        bytes: the encoded item, including its trailing newline
+    """
+    return codec.dumps(item) + b"\n"
+
+
+def stream_ndjson(
+    queryset: "QuerySet[Model]",
+    serializer_class: Type[BaseSerializer],
+    prefetch: tuple[Union[str, Prefetch], ...] = (),
+    chunk_size: Optional[int] = None,
+    **serializer_kwargs: Any,
+) -> StreamingHttpResponse:
+    """Stream the records of the queryset as they are serialized.
+
+    Records are read from a server-side cursor in chunks of ``HC_EXPORT_CHUNK_SIZE``,
+    so memory use doesn't grow with the number of records.
+
+    Args:
+        queryset (QuerySet[Model]): the records to stream; unordered querysets are
+            streamed in primary key order
+        serializer_class (Type[BaseSerializer]): serialize the records
+        prefetch (tuple[Union[str, Prefetch], ...]): relations to prefetch for each
+            chunk; ``prefetch_related()`` is ignored by server-side cursors
+        chunk_size (Optional[int]): override ``HC_EXPORT_CHUNK_SIZE``
+        **serializer_kwargs (Any): passed to the serializer, e.g. ``context``
+
+    Returns:
+        StreamingHttpResponse: the response, with one record per line
+    """
+    chunk_size = chunk_size or settings.HC_EXPORT_CHUNK_SIZE
+    if not queryset.ordered:
+        queryset = queryset.order_by("pk")
+
+    def lines() -> Iterator[bytes]:
+        records = queryset.iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                return
+            prefetch_related_objects(chunk, *prefetch)
+            serializer = serializer_class(chunk, many=True, **serializer_kwargs)
+            yield b"".join(dumps(item) for item in serializer.data)
+
+    def stream() -> Iterator[bytes]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            yield from lines()
+        else:
+            yield from _in_worker_thread(lines())
+
+    return StreamingHttpResponse(stream(), content_type=NDJSONRenderer.media_type)
+
+
+def _in_worker_thread(items: Iterator[bytes]) -> Iterator[bytes]:
+    # Django 3.2's ASGI handler iterates streaming responses in the event loop, where
+    # the DB can't be used; each chunk is read by a dedicated thread instead, which
+    # holds the server-side cursor (the event loop waits for each chunk)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-ndjson")
+    done = object()
+    try:
+        while True:
+            item = executor.submit(next, items, done).result()
+            if item is done:
+                return
+            yield item  # type: ignore
+    finally:
+        executor.submit(_close, items).result()
+        executor.shutdown()
+
+
+def _close(items: Iterator[bytes]) -> None:
+    try:
+        items.close()  # type: ignore
+    finally:
+        connection.close()
+
+
+logger.debug("imported module %s", __name__)
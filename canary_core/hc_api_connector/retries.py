@@ -0,0 +1,282 @@
+"""Bound the time spent on API requests, and retry them without amplifying outages.
+
+A deadline for the work done on behalf of an incoming request is set using
+:func:`deadline` (or :func:`request_deadline` for views). Within it, the connect and
+read timeouts of each attempt (see :func:`timeouts`), the wait for a rate limit token,
+and the backoff between attempts are limited to the time remaining.
+
+Idempotent requests that fail with a connection error, a timeout, or a ``502``,
+``503``, or ``504`` response are retried up to ``HC_RETRY_ATTEMPTS`` times, using
+exponential backoff with full jitter. Each retry is withdrawn from the process'
+:class:`RetryBudget`, which only earns ``HC_RETRY_BUDGET_RATIO`` retries per request;
+while the API is down, retries are limited to that fraction of the traffic instead of
+multiplying it.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import asyncio
+import contextvars
+import functools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+# django packages
+from django.conf import settings
+
+# third party
+from requests.exceptions import ConnectionError, Timeout
+from requests.models import Response
+
+logger = logging.getLogger(__name__)
+
+#: errors raised by attempts that may succeed if they are retried
+RETRY_ERRORS = (ConnectionError, Timeout)
+
+#: response status codes of attempts that may succeed if they are retried
+RETRY_STATUSES = frozenset([502, 503, 504])
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+class DeadlineExceeded(Timeout):
+    """Indicate that the deadline passed before the API responded."""
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Limit the time spent on requests sent within the context.
+
+    Nested deadlines can only shorten the deadline that is already set.
+
+    Args:
+        seconds (float): the number of seconds, from now, until the deadline
+
+    Yields:
+        None: requests sent within the context are bound by the deadline
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def request_deadline(view: Callable[..., Any]) -> Callable[..., Any]:
+    """Bound the requests sent by the view using ``HC_REQUEST_DEADLINE``.
+
+    Args:
+        view (Callable[..., Any]): the view function (sync or async) to decorate
+
+    Returns:
+        Callable[..., Any]: the decorated view
+    """
+    if asyncio.iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with deadline(settings.HC_REQUEST_DEADLINE):
+                return await view(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with deadline(settings.HC_REQUEST_DEADLINE):
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+def remaining() -> Optional[float]:
+    """Provide the time remaining until the current deadline.
+
+    Returns:
+        Optional[float]: the number of seconds remaining, or ``None`` if no deadline is
+            set
+    """
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def timeouts(connect: float, read: float) -> tuple[float, float]:
+    """Limit an attempt's connect and read timeouts to the time remaining.
+
+    Args:
+        connect (float): the number of seconds allowed to establish a connection
+        read (float): the number of seconds allowed between bytes of the response
+
+    Raises:
+        DeadlineExceeded: raised if the deadline has already passed
+
+    Returns:
+        tuple[float, float]: the connect and read timeouts for the attempt
+    """
+    left = remaining()
+    if left is None:
+        return connect, read
+    if left <= 0:
+        raise DeadlineExceeded("the deadline passed before the request was sent")
+    return min(connect, left), min(read, left)
+
+
+def backoff(attempt: int) -> float:
+    """Choose the delay before the next attempt, using full jitter.
+
+    Args:
+        attempt (int): the number of attempts made so far
+
+    Returns:
+        float: a random number of seconds, up to the exponential backoff
+    """
+    cap = min(settings.HC_RETRY_BACKOFF_MAX, settings.HC_RETRY_BACKOFF * 2**attempt)
+    return random.uniform(0, cap)  # nosec: jitter isn't used for security
+
+
+class RetryBudget:
+    """Limit the retries sent by this process to a fraction of its requests.
+
+    Each request deposits ``HC_RETRY_BUDGET_RATIO`` tokens, and each retry withdraws
+    one; the balance starts at (and is capped by) ``HC_RETRY_BUDGET_CAP`` tokens.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tokens: Optional[float] = None
+
+    @property
+    def tokens(self) -> float:
+        """Provide the number of retries currently allowed.
+
+        Returns:
+            float: the balance of the budget
+        """
+        return settings.HC_RETRY_BUDGET_CAP if self._tokens is None else self._tokens
+
+    def deposit(self) -> None:
+        """Earn retries for a request."""
+        with self._lock:
+            self._tokens = min(
+                settings.HC_RETRY_BUDGET_CAP,
+                self.tokens + settings.HC_RETRY_BUDGET_RATIO,
+            )
+
+    def withdraw(self) -> bool:
+        """Spend a token for a retry, if the budget allows it.
+
+        Returns:
+            bool: ``True`` if the retry may be sent
+        """
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self._tokens = self.tokens - 1
+            return True
+
+    def reset(self) -> None:
+        """Restore the initial balance."""
+        with self._lock:
+            self._tokens = None
+
+
+def send(attempt: Callable[[], Response], idempotent: bool = True) -> Response:
+    """Send a request, retrying failed attempts if the request is idempotent.
+
+    Args:
+        attempt (Callable[[], Response]): send a single attempt of the request
+        idempotent (bool): whether the request can safely be sent more than once
+
+    Raises:
+        RequestException: raised by the last attempt, if it failed with an error
+
+    Returns:
+        Response: the response to the last attempt
+    """
+    retry_budget.deposit()
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            resp = attempt()
+        except RETRY_ERRORS as e:
+            delay = _retry_delay(attempts, idempotent, e)
+            if delay is None:
+                raise
+        else:
+            delay = _retry_delay(attempts, idempotent, resp)
+            if delay is None:
+                return resp
+        time.sleep(delay)
+
+
+async def asend(
+    attempt: Callable[[], Awaitable[Response]], idempotent: bool = True
+) -> Response:
+    """Provide an async variant of :func:`send`.
+
+    Args:
+        attempt (Callable[[], Awaitable[Response]]): send a single attempt of the
+            request
+        idempotent (bool): whether the request can safely be sent more than once
+
+    Raises:
+        RequestException: raised by the last attempt, if it failed with an error
+
+    Returns:
+        Response: the response to the last attempt
+    """
+    retry_budget.deposit()
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            resp = await attempt()
+        except RETRY_ERRORS as e:
+            delay = _retry_delay(attempts, idempotent, e)
+            if delay is None:
+                raise
+        else:
+            delay = _retry_delay(attempts, idempotent, resp)
+            if delay is None:
+                return resp
+        await asyncio.sleep(delay)
+
+
+def _retry_delay(attempts: int, idempotent: bool, outcome: Any) -> Optional[float]:
+    # determine how long to wait before retrying; `None` means don't retry
+    if isinstance(outcome, Response) and outcome.status_code not in RETRY_STATUSES:
+        return None
+    if not idempotent or isinstance(outcome, DeadlineExceeded):
+        return None
+    if attempts >= settings.HC_RETRY_ATTEMPTS:
+        return None
+
+    delay = backoff(attempts)
+    left = remaining()
+    if left is not None and delay >= left:
+        return None
+    if not retry_budget.withdraw():
+        logger.warning("retry budget exhausted; not retrying (%s)", outcome)
+        return None
+
+    logger.info(
+        "retrying request in %.3fs (attempt %d failed: %s)", delay, attempts, outcome
+    )
+    return delay
+
+
+#: The process-wide budget shared by all retried requests
+retry_budget = RetryBudget()
+
+logger.debug("imported module %s", __name__)
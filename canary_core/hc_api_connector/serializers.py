@@ -3,18 +3,76 @@
 .. moduleauthor:: Bryant Finney
    :github: https://bryant-finney.github.io/about
 """
+from __future__ import annotations
+
 # stdlib
 import logging
+from typing import Any, Iterable
 
 # django packages
-from rest_framework.serializers import ModelSerializer
+from django.conf import settings
+from django.http.request import QueryDict
+from rest_framework.serializers import (
+    CharField,
+    DictField,
+    ListField,
+    ModelSerializer,
+    Serializer,
+    ValidationError,
+)
 
 # local
-from canary_core.hc_api_connector.models import BasicAPIClient, Property
+from canary_core.hc_api_connector.models import BasicAPIClient, Property, UnknownAddress
 
 logger = logging.getLogger(__name__)
 
 
+def sparse_fields(query_params: QueryDict, available: Iterable[str]) -> set[str]:
+    """Select fields using the ``fields`` and ``omit`` query parameters.
+
+    Both parameters accept comma-separated field names, e.g. ``?fields=id,sewage_type``
+    or ``?omit=other_data``; unknown names are ignored.
+
+    Args:
+        query_params (QueryDict): the query parameters of the request
+        available (Iterable[str]): the names of all of the fields
+
+    Returns:
+        set[str]: the names of the selected fields
+    """
+
+    def names(param: str) -> set[str]:
+        return {name.strip() for name in query_params[param].split(",")}
+
+    selected = set(available)
+    if "fields" in query_params:
+        selected &= names("fields")
+    if "omit" in query_params:
+        selected -= names("omit")
+    return selected
+
+
+class SparseFieldsMixin:  # pylint: disable=too-few-public-methods
+    """Only serialize the fields selected by the request (see :func:`sparse_fields`).
+
+    The request is read from the serializer's context; without one, all of the fields
+    are serialized.
+    """
+
+    fields: dict[str, Any]
+    context: dict[str, Any]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore
+        request = self.context.get("request")
+        if request is None:
+            return
+
+        selected = sparse_fields(request.query_params, self.fields)
+        for name in set(self.fields) - selected:
+            self.fields.pop(name)
+
+
 class BasicAPIClientSerializer(ModelSerializer):
     """Define a serializer for the :class:`BasicAPIClient` model."""
 
@@ -25,15 +83,59 @@ class BasicAPIClientSerializer(ModelSerializer):
         fields = "__all__"
 
 
-class PropertySerializer(ModelSerializer):
-    """Define a serializer for the :class:`Property` model."""
+class PropertySerializer(SparseFieldsMixin, ModelSerializer):
+    """Define a serializer for the :class:`Property` model.
+
+    Requests can select the serialized fields using ``?fields=`` and ``?omit=``.
+    """
 
     class Meta:
         """Set the model and fields to serialize."""
 
         model = Property
-        fields = "__all__"
-        filterset_fields = ["assessment_date", "sewage_type", "owners"]
+        exclude = ["other_data_zstd"]
+
+
+class UnknownAddressSerializer(ModelSerializer):
+    """Define a serializer for the :class:`UnknownAddress` model."""
+
+    class Meta:
+        """Set the model and fields to serialize."""
+
+        model = UnknownAddress
+        exclude = ["content"]
+
+
+class SepticBatchSerializer(Serializer):  # pylint: disable=abstract-method
+    """Validate the request body of a batch septic lookup.
+
+    Each address is a mapping of the same parameters accepted by the primary endpoint's
+    query string, e.g. ``{"address": "7500 Melrose Ave", "zipcode": "90046"}``.
+    """
+
+    addresses = ListField(
+        child=DictField(child=CharField(), allow_empty=False),
+        min_length=1,
+    )
+
+    def validate_addresses(self, value: list[dict[str, str]]) -> list[dict[str, str]]:
+        """Limit the number of addresses to ``HC_BATCH_MAX_SIZE``.
+
+        Args:
+            value (list[dict[str, str]]): the addresses to look up
+
+        Raises:
+            ValidationError: raised if the batch contains too many addresses
+
+        Returns:
+            list[dict[str, str]]: the validated addresses
+        """
+        if len(value) > settings.HC_BATCH_MAX_SIZE:
+            raise ValidationError(
+                f"Ensure this field has no more than {settings.HC_BATCH_MAX_SIZE} "
+                "elements."
+            )
+        return value
 
 
 logger.debug("imported module %s", __name__)
@@ -0,0 +1,371 @@
+"""Pool keep-alive HTTP sessions for API clients.
+
+Each :class:`BasicAPIClient` record is mapped to a single :class:`requests.Session`
+per process, so repeated requests reuse established TCP + TLS connections instead of
+performing a new handshake for every call.
+
+When ``httpx`` is installed (``poetry install -E async``), an equivalent pool of
+``httpx.AsyncClient`` objects serves the async request path; each event loop receives
+its own clients.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Hashable, NamedTuple, Optional
+
+# django packages
+from django.conf import settings
+
+# third party
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# the async request path is optional; it requires the `async` extra
+try:
+    # third party
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # pragma: no cover
+
+if TYPE_CHECKING:
+    # local
+    from canary_core.hc_api_connector.models import (  # noqa: F401  # pragma: no cover
+        BasicAPIClient,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledSession(NamedTuple):
+    """Associate a session with the client settings used to create it."""
+
+    fingerprint: Hashable
+    session: requests.Session
+
+
+class _PooledAsyncClient(NamedTuple):
+    """Associate an async client with its settings and event loop."""
+
+    fingerprint: Hashable
+    loop: asyncio.AbstractEventLoop
+    client: "httpx.AsyncClient"
+
+
+class SessionPool:
+    """Maintain one reusable :class:`requests.Session` per API client and process.
+
+    Sessions are keyed on the client's primary key. Each session remembers a
+    fingerprint of the client's host + credentials; when the record changes, the stale
+    session is closed and replaced on next use. The pool is discarded after a fork so
+    worker processes never share sockets with their parent.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._sessions: dict[Hashable, _PooledSession] = {}
+
+    def __len__(self) -> int:
+        """Count the sessions currently held by the pool.
+
+        Returns:
+            int: the number of pooled sessions
+        """
+        return len(self._sessions)
+
+    @staticmethod
+    def fingerprint(client: "BasicAPIClient") -> Hashable:
+        """Identify the client settings that a pooled session depends on.
+
+        Args:
+            client (BasicAPIClient): the client record
+
+        Returns:
+            Hashable: a value that changes whenever the host or credentials change
+        """
+        return (
+            str(client.host),
+            str(client.credential_id),
+            str(client.credential_secret),
+            client.AuthClass,
+        )
+
+    @staticmethod
+    def create_session(client: "BasicAPIClient") -> requests.Session:
+        """Build a new session configured for the given client.
+
+        Args:
+            client (BasicAPIClient): authenticate the session using this client's
+                credentials
+
+        Returns:
+            requests.Session: the new session
+        """
+        session = requests.Session()
+        session.auth = client.AuthClass(client.credential_id, client.credential_secret)
+        session.headers["Connection"] = (
+            "keep-alive" if settings.HC_API_KEEP_ALIVE else "close"
+        )
+
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.HC_API_POOL_SIZE,
+            pool_block=settings.HC_API_POOL_BLOCK,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get(self, client: "BasicAPIClient") -> requests.Session:
+        """Retrieve the pooled session for the client, creating it if necessary.
+
+        Unsaved clients don't have a stable key, so they receive a new session each
+        time.
+
+        Args:
+            client (BasicAPIClient): the client sending requests
+
+        Returns:
+            requests.Session: a session bound to the client's current credentials
+        """
+        if client.pk is None:
+            return self.create_session(client)
+
+        fingerprint = self.fingerprint(client)
+        with self._lock:
+            self._check_pid()
+            pooled = self._sessions.get(client.pk)
+            if pooled is not None and pooled.fingerprint == fingerprint:
+                return pooled.session
+
+            if pooled is not None:
+                logger.info("API client %s changed; replacing its session", client.pk)
+                pooled.session.close()
+
+            session = self.create_session(client)
+            self._sessions[client.pk] = _PooledSession(fingerprint, session)
+            return session
+
+    def invalidate(self, pk: Optional[Hashable] = None) -> None:
+        """Close and discard pooled sessions.
+
+        Args:
+            pk (Optional[Hashable]): only discard the session for this client; if
+                omitted, all sessions are discarded
+        """
+        with self._lock:
+            keys = list(self._sessions) if pk is None else [pk]
+            for key in keys:
+                pooled = self._sessions.pop(key, None)
+                if pooled is not None:
+                    pooled.session.close()
+
+    def _check_pid(self) -> None:
+        # sockets inherited from a parent process must not be reused after a fork
+        pid = os.getpid()
+        if pid != self._pid:
+            self._sessions.clear()
+            self._pid = pid
+
+
+class AsyncSessionPool:
+    """Maintain one reusable ``httpx.AsyncClient`` per API client and event loop.
+
+    This mirrors :class:`SessionPool` for the async request path. Clients are bound to
+    the event loop that created them, so a client is replaced (and closed) if it is
+    requested from a different loop.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[Hashable, _PooledAsyncClient] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        """Count the async clients currently held by the pool.
+
+        Returns:
+            int: the number of pooled clients
+        """
+        return len(self._clients)
+
+    @staticmethod
+    def available() -> bool:
+        """Determine if the optional ``httpx`` dependency is installed.
+
+        Returns:
+            bool: ``True`` if async clients can be created
+        """
+        return httpx is not None
+
+    @staticmethod
+    def create_client(client: "BasicAPIClient") -> "httpx.AsyncClient":
+        """Build a new async HTTP client configured for the given API client.
+
+        Args:
+            client (BasicAPIClient): authenticate requests using this client's
+                credentials
+
+        Returns:
+            httpx.AsyncClient: the new async client
+        """
+        pool_size = settings.HC_API_POOL_SIZE
+        return httpx.AsyncClient(
+            auth=(str(client.credential_id), str(client.credential_secret)),
+            # match the behavior of `requests`
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size
+                if settings.HC_API_KEEP_ALIVE
+                else 0,
+            ),
+        )
+
+    def get(self, client: "BasicAPIClient") -> "httpx.AsyncClient":
+        """Retrieve the pooled async client for the API client, creating it if needed.
+
+        This must be called from inside a running event loop. Unsaved clients are
+        pooled by identity until they are garbage collected. Replaced async clients are
+        closed on their own event loop.
+
+        Args:
+            client (BasicAPIClient): the API client sending requests
+
+        Returns:
+            httpx.AsyncClient: an async client bound to the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        key = self.key(client)
+        fingerprint = SessionPool.fingerprint(client)
+        pooled = self._clients.get(key)
+        if (
+            pooled is not None
+            and pooled.fingerprint == fingerprint
+            and pooled.loop is loop
+        ):
+            return pooled.client
+
+        if pooled is not None:
+            logger.info("API client %s changed; replacing its async client", key)
+            self._close(pooled)
+        elif client.pk is None:
+            weakref.finalize(client, self.invalidate, key)
+
+        async_client = self.create_client(client)
+        self._clients[key] = _PooledAsyncClient(fingerprint, loop, async_client)
+        return async_client
+
+    @staticmethod
+    def key(client: "BasicAPIClient") -> Hashable:
+        """Identify the pooled async client of the API client.
+
+        Args:
+            client (BasicAPIClient): the API client sending requests
+
+        Returns:
+            Hashable: the client's primary key, or its identity if it is unsaved
+        """
+        return ("unsaved", id(client)) if client.pk is None else client.pk
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Close and discard pooled async clients.
+
+        Args:
+            key (Optional[Hashable]): only discard the client with this :meth:`key`;
+                if omitted, all clients are discarded
+        """
+        keys = list(self._clients) if key is None else [key]
+        for k in keys:
+            pooled = self._clients.pop(k, None)
+            if pooled is not None:
+                self._close(pooled)
+
+    def _close(self, pooled: _PooledAsyncClient) -> None:
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+
+        if pooled.loop is current:
+            task = pooled.loop.create_task(pooled.client.aclose())
+            # hold a reference until the task is done, so it isn't garbage collected
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif pooled.loop.is_running():
+            asyncio.run_coroutine_threadsafe(pooled.client.aclose(), pooled.loop)
+        else:
+            # a stopped loop can't close its transports; they close their sockets when
+            # the async client is garbage collected
+            logger.debug(
+                "discarding async client of stopped event loop %s", pooled.loop
+            )
+
+
+def to_requests_response(resp: "httpx.Response") -> requests.Response:
+    """Convert an ``httpx`` response to a :class:`requests.Response`.
+
+    This allows the sync and async request paths to share their error handling, e.g.
+    :meth:`requests.Response.raise_for_status`.
+
+    Args:
+        resp (httpx.Response): the response received by the async client
+
+    Returns:
+        requests.Response: the equivalent ``requests`` response
+    """
+    converted = requests.Response()
+    converted.status_code = resp.status_code
+    converted.reason = resp.reason_phrase
+    converted.url = str(resp.url)
+    converted.encoding = resp.encoding
+    converted.headers = CaseInsensitiveDict(resp.headers)
+    converted._content = resp.content  # pylint: disable=protected-access
+    converted.elapsed = resp.elapsed
+    return converted
+
+
+def to_requests_exception(exc: Exception) -> Any:
+    """Convert an ``httpx`` transport exception to its ``requests`` equivalent.
+
+    Args:
+        exc (Exception): the exception raised by the async client
+
+    Returns:
+        Any: the equivalent ``requests`` exception, or ``exc`` if no equivalent exists
+    """
+    if isinstance(exc, httpx.TimeoutException):
+        return requests.exceptions.Timeout(str(exc))
+    if isinstance(exc, httpx.TransportError):
+        return requests.exceptions.ConnectionError(str(exc))
+    return exc
+
+
+def to_httpx_timeout(connect: float, read: float) -> "httpx.Timeout":
+    """Convert ``requests``-style connect and read timeouts for the async client.
+
+    Args:
+        connect (float): the number of seconds allowed to establish a connection
+        read (float): the number of seconds allowed between bytes of the response
+
+    Returns:
+        httpx.Timeout: the equivalent timeout configuration
+    """
+    return httpx.Timeout(read, connect=connect)
+
+
+#: The process-wide session pool used by :class:`BasicAPIClient`
+session_pool = SessionPool()
+
+#: The process-wide async client pool used by :class:`BasicAPIClient`
+async_session_pool = AsyncSessionPool()
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,143 @@
+"""Connect signal handlers for the app's models.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import logging
+from typing import Any
+
+# django packages
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+# local
+from canary_core.hc_api_connector import addresses
+from canary_core.hc_api_connector.answers import septic_answers
+from canary_core.hc_api_connector.circuit import circuit_breakers
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    UnknownAddress,
+    client_selector,
+    negative_cache,
+    rate_limiter,
+)
+from canary_core.hc_api_connector.sessions import async_session_pool, session_pool
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_delete, sender=BasicAPIClient)
+def close_client_session(
+    sender: type[BasicAPIClient], instance: BasicAPIClient, **kwargs: Any
+) -> None:
+    """Discard the sessions, rate limit, and circuit state of a deleted API client.
+
+    Args:
+        sender (type[BasicAPIClient]): the model class sending the signal
+        instance (BasicAPIClient): the deleted record
+        **kwargs (Any): additional signal arguments are ignored
+    """
+    session_pool.invalidate(instance.pk)
+    async_session_pool.invalidate(instance.pk)
+    rate_limiter.reset(instance.pk)
+    circuit_breakers.reset(instance.pk)
+
+
+@receiver(post_save, sender=BasicAPIClient)
+@receiver(post_delete, sender=BasicAPIClient)
+def reload_clients(
+    sender: type[BasicAPIClient], instance: BasicAPIClient, **kwargs: Any
+) -> None:
+    """Reload this process' cached API clients after one is saved or deleted.
+
+    Other processes reload them once their cache expires (``HC_CLIENT_CACHE_TTL``).
+
+    Args:
+        sender (type[BasicAPIClient]): the model class sending the signal
+        instance (BasicAPIClient): the saved or deleted record
+        **kwargs (Any): additional signal arguments are ignored
+    """
+    client_selector.invalidate()
+
+
+@receiver(pre_save, sender=Property)
+def set_address_key(sender: type[Property], instance: Property, **kwargs: Any) -> None:
+    """Derive the property's ``address_key`` from its ``identifier``.
+
+    This runs for raw saves too, e.g. when loading fixtures.
+
+    Args:
+        sender (type[Property]): the model class sending the signal
+        instance (Property): the record being saved
+        **kwargs (Any): additional signal arguments are ignored
+    """
+    instance.address_key = addresses.address_key(instance.identifier)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def discard_answer(sender: type[Property], instance: Property, **kwargs: Any) -> None:
+    """Discard the cached septic answer for a saved or deleted property.
+
+    The answer is discarded again once the transaction commits, in case a concurrent
+    lookup cached the previous answer in the meantime.
+
+    Args:
+        sender (type[Property]): the model class sending the signal
+        instance (Property): the saved or deleted record
+        **kwargs (Any): additional signal arguments are ignored
+    """
+    septic_answers.discard(instance.address_key)
+    transaction.on_commit(lambda: septic_answers.discard(instance.address_key))
+
+
+@receiver(m2m_changed, sender=Property.owners.through)
+def touch_owned_properties(
+    sender: type[Any], instance: Any, action: str, reverse: bool, **kwargs: Any
+) -> None:
+    """Update the ``modified`` time of properties whose owners changed.
+
+    Owners are part of the properties' representations, so this changes their
+    ``ETag`` headers.
+
+    Args:
+        sender (type[Any]): the intermediate model of the relationship
+        instance (Any): the property (or, if ``reverse``, the user) that changed
+        action (str): the type of change
+        reverse (bool): whether the change was made from the user's side
+        **kwargs (Any): additional signal arguments; ``pk_set`` identifies the
+            properties added to or removed from a user
+    """
+    if action == "pre_clear" and reverse:
+        # the user's properties can't be identified once they are cleared
+        changed: Any = instance.properties.values("pk")
+    elif action in ("post_add", "post_remove", "post_clear"):
+        changed = kwargs.get("pk_set") if reverse else [instance.pk]
+    else:
+        return
+
+    if changed is not None:
+        Property.objects.filter(pk__in=changed).update(modified=timezone.now())
+
+
+@receiver(post_delete, sender=UnknownAddress)
+def discard_negative_result(
+    sender: type[UnknownAddress], instance: UnknownAddress, **kwargs: Any
+) -> None:
+    """Purge a deleted entry from this process' negative cache.
+
+    Args:
+        sender (type[UnknownAddress]): the model class sending the signal
+        instance (UnknownAddress): the deleted record
+        **kwargs (Any): additional signal arguments are ignored
+    """
+    negative_cache.discard(instance.key)
+
+
+logger.debug("imported module %s", __name__)
@@ -0,0 +1,171 @@
+"""Coalesce concurrent work that shares a key.
+
+Duplicate calls are coalesced at two levels:
+
+- within a process, :class:`SingleFlight` (threads) and :class:`AsyncSingleFlight`
+  (coroutines) run the work once per key and hand its result to every waiter
+- across processes and nodes, :func:`advisory_lock` serializes the work on a Postgres
+  transaction-level advisory lock, so later callers can read the leader's result from
+  the DB instead of repeating the work
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import asyncio
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+# django packages
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def lock_id(key: str) -> int:
+    """Map the key onto the signed 64-bit integer space used by advisory locks.
+
+    Args:
+        key (str): the key identifying the work
+
+    Returns:
+        int: a stable lock ID for the key
+
+    >>> lock_id("128 chestnut st") == lock_id("128 chestnut st")
+    True
+    >>> -(2**63) <= lock_id("128 chestnut st") < 2**63
+    True
+    """
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@contextmanager
+def advisory_lock(key: str) -> Iterator[None]:
+    """Hold a Postgres advisory lock for the key until the enclosed block completes.
+
+    The lock is scoped to a transaction, which is opened here; it is released when the
+    transaction commits or rolls back.
+
+    Args:
+        key (str): the key identifying the work
+
+    Yields:
+        None: the lock is held while the context is active
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_id(key)])
+        yield
+
+
+class SingleFlight:
+    """Ensure only one call per key is in flight within the process.
+
+    Callers arriving while a call for the same key is running wait for it and receive
+    its result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+
+    def __len__(self) -> int:
+        """Count the calls currently in flight.
+
+        Returns:
+            int: the number of in-flight calls
+        """
+        return len(self._calls)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Call ``fn`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key (str): calls sharing this key are coalesced
+            fn (Callable[[], T]): perform the work
+
+        Returns:
+            T: the result of the leader's call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            logger.debug("waiting for in-flight call: %s", key)
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """Ensure only one coroutine per key is in flight within an event loop."""
+
+    def __init__(self) -> None:
+        self._calls: dict[tuple[int, str], asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        """Count the calls currently in flight.
+
+        Returns:
+            int: the number of in-flight calls
+        """
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key (str): calls sharing this key are coalesced
+            fn (Callable[[], Awaitable[T]]): perform the work
+
+        Returns:
+            T: the result of the leader's call
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        future = self._calls.get(call_key)
+        if future is not None:
+            logger.debug("waiting for in-flight call: %s", key)
+            return await asyncio.shield(future)
+
+        future = self._calls[call_key] = loop.create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+            # mark the exception as retrieved in case there were no waiters
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[call_key]
+
+
+logger.debug("imported module %s", __name__)
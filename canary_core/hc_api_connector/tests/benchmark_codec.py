@@ -0,0 +1,82 @@
+"""Compare the installed JSON codecs using the sample ``property/details`` payload.
+
+Each codec decodes the payload (as :meth:`Property.fetch_and_update` does with API
+responses), and encodes the decoded data (as the REST API does with property records).
+Run the benchmark using::
+
+    python -m canary_core.hc_api_connector.tests.benchmark_codec --number 20000
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import argparse
+import functools
+import logging
+import timeit
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+# local
+from canary_core.hc_api_connector.codec import CODECS
+
+logger = logging.getLogger(__name__)
+
+#: the sample response of the mock API
+PAYLOAD = next(Path(__file__).parent.glob("*.json")).read_bytes()
+
+
+def benchmark(number: int, repeat: int) -> dict[str, tuple[float, float]]:
+    """Time each codec, keeping the best of each repetition.
+
+    Args:
+        number (int): the number of calls timed in each repetition
+        repeat (int): the number of repetitions
+
+    Returns:
+        dict[str, tuple[float, float]]: the seconds per call to ``loads`` and
+            ``dumps``, by codec
+    """
+
+    def best(fn: Callable[[], object]) -> float:
+        return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+    results = {}
+    for name, codec in CODECS.items():
+        data = codec.loads(PAYLOAD)
+        assert codec.loads(codec.dumps(data)) == data
+        results[name] = (
+            best(functools.partial(codec.loads, PAYLOAD)),
+            best(functools.partial(codec.dumps, data)),
+        )
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmark, and print the results as a table.
+
+    Args:
+        argv (Optional[Sequence[str]]): command line arguments; defaults to
+            ``sys.argv[1:]``
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--number", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.number, args.repeat)
+    baseline = results["stdlib"]
+
+    print(f"payload: {len(PAYLOAD)} bytes")
+    print(f"{'codec':<8} {'loads (µs)':>12} {'dumps (µs)':>12} {'speedup':>16}")
+    for name, (loads, dumps) in results.items():
+        speedup = f"{baseline[0] / loads:.1f}x / {baseline[1] / dumps:.1f}x"
+        print(f"{name:<8} {loads * 1e6:>12.2f} {dumps * 1e6:>12.2f} {speedup:>16}")
+
+
+logger.debug("imported module %s", __name__)
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
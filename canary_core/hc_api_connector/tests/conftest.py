@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Any, Iterator
 
 # django packages
+from django.contrib.auth.models import User
 from django.http.request import QueryDict
 from django.utils.http import urlencode, urlunquote_plus
 
@@ -23,7 +24,17 @@ from pytest_django.fixtures import SettingsWrapper
 from pytest_django.live_server_helper import LiveServer
 
 # local
-from canary_core.hc_api_connector.models import BasicAPIClient, PropertyAddress
+from canary_core.hc_api_connector.answers import septic_answers
+from canary_core.hc_api_connector.circuit import circuit_breakers
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+    client_selector,
+    negative_cache,
+    rate_limiter,
+)
+from canary_core.hc_api_connector.retries import retry_budget
 from canary_core.hc_api_connector.tests.mock_api import encode_to_basename
 
 # pylint: disable=unused-argument,redefined-outer-name
@@ -36,6 +47,91 @@ logger = logging.getLogger(__name__)
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def reset_negative_cache() -> Iterator[None]:
+    """Discard the process' negative cache state after each test.
+
+    Yields:
+        None: the test runs while the fixture is active
+    """
+    try:
+        yield
+    finally:
+        negative_cache.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_septic_answers() -> Iterator[None]:
+    """Discard the cached septic answers (in both tiers) after each test.
+
+    Yields:
+        None: the test runs while the fixture is active
+    """
+    try:
+        yield
+    finally:
+        septic_answers.reset()
+        septic_answers.backend.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers() -> Iterator[None]:
+    """Discard the state of the process' circuit breakers after each test.
+
+    Yields:
+        None: the test runs while the fixture is active
+    """
+    try:
+        yield
+    finally:
+        circuit_breakers.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_client_selector() -> Iterator[None]:
+    """Discard the process' cached API clients before and after each test.
+
+    The clients created by a test are rolled back without sending signals, so the
+    cache must not outlive the test.
+
+    Yields:
+        None: the test runs while the fixture is active
+    """
+    client_selector.reset()
+    try:
+        yield
+    finally:
+        client_selector.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_retry_budget() -> Iterator[None]:
+    """Restore the process' retry budget after each test.
+
+    Yields:
+        None: the test runs while the fixture is active
+    """
+    try:
+        yield
+    finally:
+        retry_budget.reset()
+
+
+@pytest.fixture(autouse=True)
+def close_rate_limiter() -> Iterator[None]:
+    """Close the rate limiter's dedicated DB connections after each test.
+
+    Otherwise, the open connections would prevent the test DB from being dropped.
+
+    Yields:
+        None: the test runs while the fixture is active
+    """
+    try:
+        yield
+    finally:
+        rate_limiter.close()
+
+
 @pytest.fixture
 def root_urlconf(settings: SettingsWrapper) -> SettingsWrapper:
     """Override the ``ROOT_URLCONF`` setting for the tests that use this fixture.
@@ -164,3 +260,24 @@ def mock_api_response_data(query_params: PropertyAddress) -> dict[str, Any]:
 
     with open(fname, "r", encoding="utf-8") as f:
         return json.load(f)
+
+
+@pytest.fixture
+def properties(admin_user: User) -> list[Property]:
+    """Create five tracked properties owned by the admin user.
+
+    Args:
+        admin_user (User): own the properties
+
+    Returns:
+        list[Property]: the new records, in the order they were created
+    """
+    props = [
+        Property.objects.create(
+            identifier={"address": f"{n} Main St", "zipcode": "12345"},
+            sewage_type=Property.SewageType.SEPTIC,
+        )
+        for n in range(5)
+    ]
+    admin_user.properties.add(*props)
+    return props
@@ -10,6 +10,7 @@ import base64
 import json
 import logging
 from pathlib import Path
+from urllib.parse import urlencode
 
 # django packages
 from django.contrib.auth import get_user_model
@@ -21,6 +22,7 @@ from django.http.response import (
 )
 from django.urls.conf import include, path, re_path
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.routers import DefaultRouter
 from rest_framework.serializers import ModelSerializer
@@ -59,6 +61,9 @@ def house_canary(request: HttpRequest) -> HttpResponse:
     Returns:
         HttpResponse: a representative response similar to the HouseCanary API
     """
+    if request.method == "POST":
+        return house_canary_batch(request)
+
     if not request.GET:
         return HttpResponseBadRequest(
             content=_("query string parameters required to identify property")
@@ -78,6 +83,43 @@ def house_canary(request: HttpRequest) -> HttpResponse:
     return HttpResponse(content=resp_data, content_type="application/json")
 
 
+def house_canary_batch(request: HttpRequest) -> HttpResponse:
+    """Mock the multi-component form of the HouseCanary API.
+
+    Args:
+        request (HttpRequest): the incoming `POST` request; its body is a JSON list of
+            query string parameters, each identifying a property
+
+    Returns:
+        HttpResponse: a list containing the result for each property, in order
+    """
+    try:
+        components = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest(content=_("JSON list of properties required"))
+
+    results = []
+    for params in components:
+        basename = encode_to_basename(QueryDict(urlencode(params)))
+        fname = Path(pr.resource_filename(__name__, f"{basename}.json"))
+
+        try:
+            with open(fname, "rb") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            result = {
+                "property/details": {
+                    "api_code": 204,
+                    "api_code_description": "no content",
+                    "result": None,
+                }
+            }
+
+        results.append({"address_info": params, **result})
+
+    return HttpResponse(content=json.dumps(results), content_type="application/json")
+
+
 class UserSerializer(ModelSerializer):
     """Define a dummy serializer for use in tests."""
 
@@ -107,5 +149,5 @@ router = DefaultRouter()
 router.register(r"users", UserViewSet)
 urlpatterns = [
     re_path(r"^api/", include((router.urls, "mock_api"), namespace="mock_api")),
-    path("property/details/", house_canary),
+    path("property/details/", csrf_exempt(house_canary)),
 ]
@@ -0,0 +1,122 @@
+"""Verify septic answers are cached in two tiers, and invalidated when they change.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+from typing import Callable, ContextManager
+
+# django packages
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+
+# local
+from canary_core.hc_api_connector.answers import Answer, AnswerCache, septic_answers
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+)
+from canary_core.hc_api_connector.views import answer_cache_stats, has_septic
+
+NOW = timezone.now()
+
+
+def test_tiers(settings: SettingsWrapper) -> None:
+    """Verify answers are read from memory, then from the shared cache."""
+    settings.HC_ANSWER_CACHE_SIZE = 2
+    cache = AnswerCache()
+    cache.set_many(
+        {"a": Answer("septic", NOW, NOW), "b": Answer("municipal", None, None)}
+    )
+
+    assert cache.get("a") == Answer("septic", NOW, NOW)
+    assert cache.get("c") is None
+
+    # another process only has the shared cache
+    other = AnswerCache()
+    assert other.get_many(["a", "b", "c"]) == {
+        "a": Answer("septic", NOW, NOW),
+        "b": Answer("municipal", None, None),
+    }
+    other.set("c", Answer("septic", None, None))
+    assert len(other._local) == 2  # pylint: disable=protected-access
+
+    assert cache.stats() == {
+        "l1_hits": 1,
+        "l2_hits": 0,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "l1_size": 2,
+    }
+    assert other.stats()["l2_hits"] == 2
+
+
+def test_local_ttl(settings: SettingsWrapper) -> None:
+    """Verify answers discarded by another process expire from memory."""
+    settings.HC_ANSWER_CACHE_LOCAL_TTL = 0
+    cache = AnswerCache()
+    cache.set("a", Answer("septic", NOW, NOW))
+
+    AnswerCache().discard("a")
+
+    assert cache.get("a") is None
+
+
+def test_disabled(settings: SettingsWrapper) -> None:
+    """Verify nothing is cached if the TTL is zero."""
+    settings.HC_ANSWER_CACHE_TTL = 0
+    septic_answers.set("a", Answer("septic", NOW, NOW))
+    septic_answers.discard("a")
+
+    assert septic_answers.get("a") is None
+    assert septic_answers.stats()["misses"] == 0
+
+
+def test_has_septic_cached(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify repeated lookups don't query the DB, and saves invalidate the answer."""
+    prop = Property.from_client(mock_api_client, query_params, save=True)
+    request = rf.get("/", data=query_params)
+    has_septic(request)
+
+    with django_assert_num_queries(0):
+        assert json.loads(has_septic(request).content) == {"septic": False}
+
+    prop.sewage_type = Property.SewageType.SEPTIC
+    prop.save()
+    assert json.loads(has_septic(request).content) == {"septic": True}
+
+    Property.bulk_from_client(mock_api_client, [query_params])
+    assert json.loads(has_septic(request).content) == {"septic": False}
+
+    prop.delete()
+    assert septic_answers.get(prop.address_key) is None
+
+
+@pytest.mark.django_db
+def test_stats_endpoint(admin_user: User) -> None:
+    """Verify the counters are exposed to authenticated users."""
+    septic_answers.get("a")
+    factory = APIRequestFactory()
+
+    assert answer_cache_stats(factory.get("/api/cache/")).status_code == 403
+
+    request = factory.get("/api/cache/")
+    force_authenticate(request, user=admin_user)
+    response = answer_cache_stats(request)
+    assert response.status_code == 200
+    assert response.data["misses"] == 1
@@ -0,0 +1,140 @@
+"""Verify requests are spread across the healthy API clients.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+from typing import Callable, ContextManager
+
+# django packages
+from django.test import RequestFactory
+
+# third party
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+from requests.exceptions import ConnectionError
+
+# local
+from canary_core.hc_api_connector.circuit import CircuitOpenError, circuit_breakers
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    PropertyAddress,
+    client_selector,
+)
+from canary_core.hc_api_connector.views import has_septic
+
+
+def create_client(n: int, latency: float = 0.0, **kwargs: object) -> BasicAPIClient:
+    """Create an API client with the given average latency.
+
+    Args:
+        n (int): distinguish the client's credentials
+        latency (float): the client's average latency, in seconds
+        **kwargs (object): additional field values for the client
+
+    Returns:
+        BasicAPIClient: the new client
+    """
+    client = BasicAPIClient.objects.create(
+        name=f"client {n}",
+        credential_id=f"balancer-{n}",
+        credential_secret="secret",
+        host="http://localhost",
+        path="/property/details",
+        **kwargs,
+    )
+    client_selector.stats(client).latency = latency
+    return client
+
+
+def open_circuit(client: BasicAPIClient, settings: SettingsWrapper) -> None:
+    """Open the circuit of the client.
+
+    Args:
+        client (BasicAPIClient): the client to take out of rotation
+        settings (SettingsWrapper): lower the number of calls required to open it
+    """
+    settings.HC_CIRCUIT_MIN_CALLS = 1
+    circuit_breakers.get(client).record(False)
+
+
+@pytest.mark.django_db
+def test_select_cached(
+    django_assert_num_queries: Callable[..., ContextManager]
+) -> None:
+    """Verify active clients are cached until a client is saved."""
+    assert client_selector.select() is None
+
+    client = create_client(1)
+    create_client(2, active=False)
+    assert client_selector.select() == client
+    with django_assert_num_queries(0):
+        assert client_selector.select() == client
+
+    client.active = False
+    client.save()
+    assert client_selector.select() is None
+
+
+@pytest.mark.django_db
+def test_select_least_loaded() -> None:
+    """Verify the slowest client is never chosen, and weights offset latency."""
+    fast, _, slow = (create_client(n, latency) for n, latency in enumerate([1, 2, 3]))
+    chosen = {client_selector.select() for _ in range(50)}
+    assert slow not in chosen
+    assert fast in chosen
+
+    BasicAPIClient.objects.exclude(pk=fast.pk).update(active=False)
+    fast.weight = 4
+    fast.save()
+    client_selector.stats(fast).in_flight = 1
+    create_client(3, latency=1)
+    assert {client_selector.select() for _ in range(10)} == {fast}
+
+
+@pytest.mark.django_db
+def test_select_healthy(settings: SettingsWrapper) -> None:
+    """Verify clients with open circuits are out of rotation, unless all of them are."""
+    broken, healthy = create_client(1), create_client(2, latency=10)
+    open_circuit(broken, settings)
+    assert {client_selector.select() for _ in range(10)} == {healthy}
+
+    open_circuit(healthy, settings)
+    assert client_selector.select() in (broken, healthy)
+
+
+@pytest.mark.django_db
+def test_track() -> None:
+    """Verify latency is averaged, and failures are penalized."""
+    client = create_client(1)
+    stats = client_selector.stats(client)
+
+    with client_selector.track(client):
+        assert stats.in_flight == 1
+    assert stats.in_flight == 0
+    assert 0 <= stats.latency < 0.1
+
+    with pytest.raises(CircuitOpenError), client_selector.track(client):
+        raise CircuitOpenError("requests are suspended")
+    assert stats.latency < 0.1
+
+    with pytest.raises(ConnectionError), client_selector.track(client):
+        raise ConnectionError("connection refused")
+    assert stats.latency >= 0.3 * 5
+
+
+def test_has_septic_avoids_unhealthy(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    settings: SettingsWrapper,
+) -> None:
+    """Verify lookups use the healthy client when another's circuit is open."""
+    open_circuit(create_client(1), settings)
+
+    for _ in range(3):
+        response = has_septic(rf.get("/", data=query_params))
+        assert json.loads(response.content) == {"septic": False}
@@ -3,8 +3,13 @@
 .. moduleauthor:: Bryant Finney
    :github: https://bryant-finney.github.io/about
 """
+from __future__ import annotations
+
 # stdlib
-from typing import TYPE_CHECKING, Iterator
+import asyncio
+import gc
+import threading
+from typing import TYPE_CHECKING, Any, Iterator
 
 # django packages
 from django.contrib.auth import get_user_model
@@ -12,10 +17,19 @@ from django.test.client import Client
 
 # third party
 import pytest
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
 from pytest_django.live_server_helper import LiveServer
+from pytest_mock import MockerFixture
+from requests.exceptions import ConnectionError
 
 # local
-from canary_core.hc_api_connector.models import BasicAPIClient
+from canary_core.hc_api_connector.models import BasicAPIClient, PropertyAddress
+from canary_core.hc_api_connector.sessions import (
+    async_session_pool,
+    httpx,
+    session_pool,
+)
 from canary_core.hc_api_connector.tests.mock_api import UserSerializer
 
 CREDENTIAL_ID = f"test-cred-id-{__name__}"
@@ -100,9 +114,183 @@ def test_get_request(user: User, basic_api_client: BasicAPIClient) -> None:
     assert user_data == response_data
 
 
+def test_post_request(
+    mock_api_client: BasicAPIClient, query_params: PropertyAddress
+) -> None:
+    """Verify the multi-component form of the API returns a result per address."""
+    unknown = PropertyAddress(address="not a real address", zipcode="00000")
+
+    resp = mock_api_client.post([query_params, unknown])
+
+    assert resp.status_code == 200
+    results = resp.json()
+    assert [r["address_info"] for r in results] == [query_params, unknown]
+    assert results[0]["property/details"]["api_code"] == 0
+    assert results[1]["property/details"]["result"] is None
+
+
 def test_client_string_repr(basic_api_client: BasicAPIClient) -> None:
     """Verify string formatting for the basic API client model."""
     client_str = str(basic_api_client)
 
     assert basic_api_client.name in client_str
     assert basic_api_client.url in client_str
+
+
+@pytest.mark.django_db
+def test_session_reuse(api_client: BasicAPIClient) -> None:
+    """Verify the client's HTTP session is pooled across calls."""
+    session = api_client.session
+
+    assert api_client.session is session
+    assert BasicAPIClient.objects.get(pk=api_client.pk).session is session
+
+
+@pytest.mark.django_db
+def test_session_invalidation(api_client: BasicAPIClient) -> None:
+    """Verify the pooled session is replaced when the client's settings change."""
+    session = api_client.session
+
+    api_client.credential_secret = "rotated-secret"
+    api_client.save()
+
+    new_session = api_client.session
+    assert new_session is not session
+    assert new_session.auth.password == "rotated-secret"  # type: ignore
+
+    api_client.host = "http://127.0.0.1"
+    assert api_client.session is not new_session
+
+
+@pytest.mark.django_db
+def test_session_closed_on_delete(api_client: BasicAPIClient) -> None:
+    """Verify deleting a client removes its session from the pool."""
+    api_client.session  # pylint: disable=pointless-statement
+    pool_size = len(session_pool)
+
+    BasicAPIClient.objects.filter(pk=api_client.pk).delete()
+
+    assert len(session_pool) == pool_size - 1
+
+
+@pytest.mark.django_db
+def test_session_pool_settings(
+    api_client: BasicAPIClient, settings: SettingsWrapper
+) -> None:
+    """Verify the connection pool size and keep-alive settings are applied."""
+    settings.HC_API_POOL_SIZE = 3
+    settings.HC_API_KEEP_ALIVE = False
+    session_pool.invalidate()
+
+    session = api_client.session
+    adapter = session.get_adapter(api_client.url)
+
+    assert adapter._pool_maxsize == 3  # type: ignore  # pylint: disable=W0212
+    assert session.headers["Connection"] == "close"
+    session_pool.invalidate()
+
+
+@pytest.mark.usefixtures("enable_auth_class")
+@pytest.mark.urls("canary_core.hc_api_connector.tests.mock_api")
+@pytest.mark.parametrize("use_httpx", [True, False])
+def test_async_get_request(
+    user: User,
+    basic_api_client: BasicAPIClient,
+    use_httpx: bool,
+    mocker: MockerFixture,
+) -> None:
+    """Verify functionality of `BasicAPIClient.aget()`, with or without `httpx`."""
+    mocker.patch.object(
+        async_session_pool, "available", return_value=use_httpx and httpx is not None
+    )
+    resp = async_to_sync(basic_api_client.aget)()
+    resp.raise_for_status()
+
+    response_data = resp.json()["results"]
+    user_data = UserSerializer(instance=[user], many=True).data
+
+    assert user_data == response_data
+
+
+@pytest.mark.django_db
+def test_async_get_connection_error(api_client: BasicAPIClient) -> None:
+    """Verify `httpx` transport errors are converted to `requests` exceptions."""
+    pytest.importorskip("httpx")
+
+    with pytest.raises(ConnectionError):
+        async_to_sync(api_client.aget)()
+
+
+@pytest.mark.django_db
+def test_async_session_reuse(api_client: BasicAPIClient) -> None:
+    """Verify async clients are pooled per event loop and replaced on changes."""
+    pytest.importorskip("httpx")
+
+    async def get_clients() -> tuple[Any, Any, Any]:
+        first = async_session_pool.get(api_client)
+        second = async_session_pool.get(api_client)
+        api_client.credential_secret = "rotated-secret"
+        return first, second, async_session_pool.get(api_client)
+
+    first, second, rotated = async_to_sync(get_clients)()
+    assert first is second
+    assert rotated is not first
+
+    # a new event loop receives a new client
+    assert async_to_sync(get_clients)()[0] is not rotated
+
+
+@pytest.mark.django_db
+def test_async_session_closed(api_client: BasicAPIClient) -> None:
+    """Verify replaced async clients are closed on their own event loop."""
+    pytest.importorskip("httpx")
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def get_client() -> Any:
+        return async_session_pool.get(api_client)
+
+    try:
+        # the client of a running loop is closed by that loop
+        other = asyncio.run_coroutine_threadsafe(get_client(), loop).result()
+        replaced = async_to_sync(get_client)()
+        assert replaced is not other
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result()
+        assert other.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def rotate() -> tuple[Any, Any]:
+        first = async_session_pool.get(api_client)
+        api_client.credential_secret = "rotated-secret"
+        second = async_session_pool.get(api_client)
+        await asyncio.sleep(0)
+        return first, second
+
+    # the client of the current loop is closed when the loop is free
+    first, second = async_to_sync(rotate)()
+    assert first.is_closed
+    assert not second.is_closed
+
+
+def test_async_session_unsaved() -> None:
+    """Verify unsaved API clients reuse their async client until collected."""
+    pytest.importorskip("httpx")
+
+    unsaved = BasicAPIClient(credential_id="unsaved-id", credential_secret="secret")
+
+    async def get_clients(client: BasicAPIClient) -> tuple[Any, Any]:
+        return async_session_pool.get(client), async_session_pool.get(client)
+
+    count = len(async_session_pool)
+    first, second = async_to_sync(get_clients)(unsaved)
+    assert first is second
+    assert len(async_session_pool) == count + 1
+
+    del unsaved
+    gc.collect()
+    assert len(async_session_pool) == count
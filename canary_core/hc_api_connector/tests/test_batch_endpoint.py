@@ -0,0 +1,146 @@
+"""Test the batch septic lookup endpoint.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import threading
+import time
+from typing import Any, Callable, ContextManager
+
+# django packages
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+# third party
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+# local
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+    negative_cache,
+)
+from canary_core.hc_api_connector.views import has_septic_batch
+
+FAKE_ADDRESS = {"address": "not a real address", "zipcode": "00000"}
+
+
+def post(addresses: Any) -> Response:
+    """Send the addresses to the batch endpoint.
+
+    Args:
+        addresses (Any): the value of the ``addresses`` field in the request body
+
+    Returns:
+        Response: the response from the endpoint
+    """
+    request = APIRequestFactory().post(
+        "/batch/", {"addresses": addresses}, format="json"
+    )
+    return has_septic_batch(request)
+
+
+def test_batch_mixed_results(
+    mock_api_client: BasicAPIClient, query_params: PropertyAddress
+) -> None:
+    """Verify results are returned for each address, in order."""
+    respelled = {k: v.upper() for k, v in query_params.items()}
+
+    response = post([query_params, FAKE_ADDRESS, respelled])
+
+    assert response.status_code == 200
+    assert response.data == [
+        {"address": query_params, "septic": False},
+        {
+            "address": FAKE_ADDRESS,
+            "status": 404,
+            "error": {"msg": "no such property", "detail": FAKE_ADDRESS},
+        },
+        {"address": respelled, "septic": False},
+    ]
+    assert Property.objects.count() == 1
+
+
+def test_batch_unknown_sewage_type(
+    mock_api_client: BasicAPIClient, query_params: PropertyAddress
+) -> None:
+    """Verify properties with an unknown sewage type are reported as errors."""
+    prop = Property.from_client(mock_api_client, query_params)
+    prop.sewage_type = Property.SewageType.UNKNOWN.value
+    prop.save()
+
+    response = post([query_params])
+
+    assert response.data[0]["status"] == 400
+    assert response.data[0]["error"]["msg"] == "unknown sewage type for property"
+
+
+def test_batch_single_query(
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify tracked addresses are resolved using a single query."""
+    Property.from_client(mock_api_client, query_params, save=True)
+    negative_cache.check(FAKE_ADDRESS)  # type: ignore  # load the Bloom filter
+
+    with django_assert_num_queries(1):
+        response = post([query_params] * 5)
+
+    assert all(item["septic"] is False for item in response.data)
+
+
+def test_batch_bounded_concurrency(
+    mock_api_client: BasicAPIClient, mocker: MockerFixture, settings: SettingsWrapper
+) -> None:
+    """Verify the number of concurrent HouseCanary requests is limited."""
+    settings.HC_BATCH_CONCURRENCY = 2
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+    get = BasicAPIClient.get
+
+    def tracked(*args: Any, **kwargs: Any) -> Any:
+        with lock:
+            in_flight.append(None)
+            peak.append(len(in_flight))
+        try:
+            time.sleep(0.05)
+            return get(*args, **kwargs)
+        finally:
+            with lock:
+                in_flight.pop()
+
+    mocker.patch.object(BasicAPIClient, "get", autospec=True, side_effect=tracked)
+
+    response = post([{"address": f"{n} Nowhere Ln", "zipcode": "1"} for n in range(6)])
+
+    assert [item["status"] for item in response.data] == [404] * 6
+    assert len(peak) == 6
+    assert max(peak) == 2
+
+
+@pytest.mark.django_db
+def test_batch_no_api_client_record(query_params: PropertyAddress) -> None:
+    """Verify the endpoint handles missing API client records for new properties."""
+    response = post([query_params])
+
+    assert response.status_code == 500
+    assert response.data["msg"] == "Misconfigured: no API client records"
+
+
+@pytest.mark.django_db
+def test_batch_validation(settings: SettingsWrapper) -> None:
+    """Verify malformed and oversized batches are rejected."""
+    settings.HC_BATCH_MAX_SIZE = 1
+
+    assert post([]).status_code == 400
+    assert post([{}]).status_code == 400
+    assert post("128 Chestnut St.").status_code == 400
+    assert post([FAKE_ADDRESS, FAKE_ADDRESS]).status_code == 400
@@ -0,0 +1,236 @@
+"""Verify requests are suspended while the HouseCanary API is unhealthy.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import asyncio
+import json
+import time
+from datetime import timedelta
+
+# django packages
+from django.test import RequestFactory
+from django.utils import timezone
+
+# third party
+import pytest
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+from requests.exceptions import ConnectionError
+from requests.models import Response
+
+# local
+from canary_core.hc_api_connector.circuit import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    circuit_breakers,
+)
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+    client_selector,
+)
+from canary_core.hc_api_connector.ratelimit import RateLimitExceeded
+from canary_core.hc_api_connector.retries import DeadlineExceeded, deadline
+from canary_core.hc_api_connector.views import has_septic
+
+
+@pytest.fixture
+def circuit_settings(settings: SettingsWrapper) -> SettingsWrapper:
+    """Open circuits after two failed requests (without retries), and half-open quickly.
+
+    Args:
+        settings (SettingsWrapper): apply the overrides to the settings
+
+    Returns:
+        SettingsWrapper: the overridden settings
+    """
+    settings.HC_CIRCUIT_MIN_CALLS = 2
+    settings.HC_CIRCUIT_ERROR_RATE = 0.5
+    settings.HC_CIRCUIT_COOLDOWN = 0.05
+    settings.HC_RETRY_ATTEMPTS = 1
+    return settings
+
+
+def respond(status_code: int = 200) -> Response:
+    """Build a response with the given status code.
+
+    Args:
+        status_code (int): the status code of the response
+
+    Returns:
+        Response: the response
+    """
+    resp = Response()
+    resp.status_code = status_code
+    return resp
+
+
+def fail() -> Response:
+    """Simulate a request that can't connect to the API.
+
+    Raises:
+        ConnectionError: always raised
+    """
+    raise ConnectionError("connection refused")
+
+
+def test_circuit_opens_and_closes(circuit_settings: SettingsWrapper) -> None:
+    """Verify the circuit opens on failures, and closes after a successful trial."""
+    breaker = CircuitBreaker("test")
+    breaker.call(respond)
+    assert breaker.call(respond, 500).status_code == 500
+    assert breaker.state is CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.call(respond)
+    assert 0 < exc_info.value.retry_after <= 0.05
+
+    time.sleep(0.06)
+    breaker.check()
+    breaker.call(respond)
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failure_rate == 0
+
+
+def test_half_open_trial(circuit_settings: SettingsWrapper) -> None:
+    """Verify the half-open circuit admits one trial, and reopens if it fails."""
+    breaker = CircuitBreaker("test")
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    time.sleep(0.06)
+
+    def nested() -> Response:
+        # the trial is in flight, so other requests are rejected
+        with pytest.raises(CircuitOpenError):
+            breaker.call(respond)
+        return fail()
+
+    with pytest.raises(ConnectionError):
+        breaker.call(nested)
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_rate_limited_trial_released(circuit_settings: SettingsWrapper) -> None:
+    """Verify a trial that wasn't sent doesn't block the next one."""
+    breaker = CircuitBreaker("test")
+    breaker.record(False)
+    breaker.record(False)
+    time.sleep(0.06)
+
+    def rate_limited() -> Response:
+        raise RateLimitExceeded("no tokens")
+
+    with pytest.raises(RateLimitExceeded):
+        breaker.call(rate_limited)
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    breaker.call(respond)
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_cancelled_trial_released(circuit_settings: SettingsWrapper) -> None:
+    """Verify an interrupted (e.g. cancelled) trial doesn't block the next one."""
+    breaker = CircuitBreaker("test")
+    breaker.record(False)
+    breaker.record(False)
+    time.sleep(0.06)
+
+    async def cancel() -> None:
+        task = asyncio.ensure_future(breaker.acall(asyncio.sleep, 10))
+        await asyncio.sleep(0)
+        assert not breaker.available
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    async_to_sync(cancel)()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.available
+
+    with pytest.raises(KeyError):
+        breaker.call({}.__getitem__, "nope")
+    breaker.call(respond)
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_expired_deadline_not_recorded(
+    circuit_settings: SettingsWrapper,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+) -> None:
+    """Verify requests that the deadline stopped from being sent aren't failures."""
+    breaker = circuit_breakers.get(mock_api_client)
+    latency = client_selector.stats(mock_api_client).latency
+
+    for _ in range(12):
+        with deadline(0), pytest.raises(DeadlineExceeded):
+            mock_api_client.get(**query_params)
+        with deadline(0), pytest.raises(DeadlineExceeded):
+            async_to_sync(mock_api_client.aget)(**query_params)
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failure_rate == 0
+    assert client_selector.stats(mock_api_client).latency == latency
+    assert mock_api_client.get(**query_params).status_code == 200
+
+
+def test_slow_calls_fail(circuit_settings: SettingsWrapper) -> None:
+    """Verify slow and throttled responses count as failures, unlike 404s."""
+    circuit_settings.HC_CIRCUIT_SLOW_CALL = 0.01
+    breaker = CircuitBreaker("test")
+
+    assert breaker.succeeded(respond(404), 0)
+    assert not breaker.succeeded(respond(429), 0)
+    assert not breaker.succeeded(respond(200), 0.02)
+
+
+@pytest.mark.django_db
+def test_has_septic_fails_fast(
+    rf: RequestFactory,
+    api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    circuit_settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    """Verify misses fail fast with a 503 while the circuit is open."""
+    request = rf.get("/", data=query_params)
+    for _ in range(2):
+        assert has_septic(request).status_code == 500
+
+    spy = mocker.spy(api_client.session, "request")
+    response = has_septic(request)
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+    assert json.loads(response.content)["msg"] == "API temporarily unavailable"
+    assert spy.call_count == 0
+
+
+def test_expired_served_while_open(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    circuit_settings: SettingsWrapper,
+) -> None:
+    """Verify known properties are served from the DB while the circuit is open."""
+    prop = Property.from_client(mock_api_client, query_params, save=True)
+    Property.objects.filter(pk=prop.pk).update(
+        fetched_at=timezone.now() - timedelta(days=365)
+    )
+    breaker = circuit_breakers.get(mock_api_client)
+    breaker.record(False)
+    breaker.record(False)
+
+    response = has_septic(rf.get("/", data=query_params))
+
+    assert json.loads(response.content) == {"septic": False}
+    with pytest.raises(CircuitOpenError):
+        async_to_sync(mock_api_client.aget)(**query_params)
@@ -0,0 +1,111 @@
+"""Verify JSON is encoded and decoded consistently by each codec.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+
+# django packages
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+# third party
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+
+# local
+from canary_core.hc_api_connector import codec
+from canary_core.hc_api_connector.parsers import CodecJSONParser
+from canary_core.hc_api_connector.renderers import CodecJSONRenderer
+from canary_core.hc_api_connector.tests import benchmark_codec
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def codec_name(request: pytest.FixtureRequest, settings: SettingsWrapper) -> str:
+    """Select each codec in turn.
+
+    Args:
+        request (pytest.FixtureRequest): parametrizes the fixture
+        settings (SettingsWrapper): configure ``HC_JSON_CODEC``
+
+    Returns:
+        str: the name of the selected codec
+    """
+    settings.HC_JSON_CODEC = request.param
+    return request.param
+
+
+def test_get_codec(settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Verify ``auto`` prefers ``orjson``, and unavailable codecs are rejected."""
+    settings.HC_JSON_CODEC = "auto"
+    assert codec.get_codec().name == "orjson"
+    assert codec.get_codec("stdlib").name == "stdlib"
+    with pytest.raises(ImproperlyConfigured, match="unknown codec 'ujson'"):
+        codec.get_codec("ujson")
+
+    monkeypatch.delitem(codec.CODECS, "orjson")
+    assert codec.get_codec().name == "stdlib"
+    with pytest.raises(ImproperlyConfigured, match="'orjson' is not installed"):
+        codec.get_codec("orjson")
+
+
+def test_round_trip(codec_name: str) -> None:
+    """Verify each codec encodes the types handled by DRF's encoder the same way."""
+    data = {
+        "price": Decimal("1.50"),
+        "fetched": datetime(2021, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        "msg": _("not found"),
+        1: "é\u2028",
+    }
+
+    encoded = codec.dumps(data)
+    assert b", " not in encoded
+    assert codec.loads(encoded) == {
+        "price": 1.5,
+        "fetched": "2021-01-02T03:04:05.678901Z",
+        "msg": "not found",
+        "1": "é\u2028",
+    }
+    assert codec.loads(encoded.decode()) == codec.loads(encoded)
+    with pytest.raises(ValueError):
+        codec.loads(b"{")
+    with pytest.raises(TypeError):
+        codec.dumps(object())
+
+
+def test_renderer(codec_name: str) -> None:
+    """Verify responses are compact, except when indented, and safe for JavaScript."""
+    renderer = CodecJSONRenderer()
+    rendered = renderer.render({"a": "\u2028\u2029"})
+    assert codec.loads(rendered) == {"a": "\u2028\u2029"}
+    assert b"\\u2028\\u2029" in rendered
+
+    indented = "application/json; indent=2"
+    assert renderer.render([1], indented) == JSONRenderer().render([1], indented)
+    assert renderer.render(None) == b""
+
+
+def test_parser(codec_name: str) -> None:
+    """Verify request bodies are parsed, and invalid bodies are rejected."""
+    parser = CodecJSONParser()
+    assert parser.parse(BytesIO('{"a": "é"}'.encode())) == {"a": "é"}
+    assert parser.parse(
+        BytesIO('{"a": "é"}'.encode("latin-1")), parser_context={"encoding": "latin-1"}
+    ) == {"a": "é"}
+    with pytest.raises(ParseError):
+        parser.parse(BytesIO(b"{"))
+
+
+def test_benchmark(capsys: pytest.CaptureFixture[str]) -> None:
+    """Verify the benchmark reports each codec."""
+    benchmark_codec.main(["--number", "1", "--repeat", "1"])
+    out = capsys.readouterr().out
+    assert "stdlib" in out
+    assert "orjson" in out
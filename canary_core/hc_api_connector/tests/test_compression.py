@@ -0,0 +1,242 @@
+"""Verify ``other_data`` can be stored compressed, and is read back transparently.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import copy
+import json
+import re
+from io import StringIO
+from pathlib import Path
+from typing import Any, Iterator
+
+# django packages
+from django.contrib.auth.models import User
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+import zstandard
+from pytest_django.fixtures import SettingsWrapper
+
+# local
+from canary_core.hc_api_connector import compression
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    CompressionDictionary,
+    Property,
+)
+from canary_core.hc_api_connector.views import PropertyViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+def run(*args: Any) -> str:
+    """Run the ``compress_other_data`` command, capturing its output.
+
+    Args:
+        *args (Any): command line arguments
+
+    Returns:
+        str: the output of the command
+    """
+    out = StringIO()
+    call_command("compress_other_data", *args, stdout=out)
+    return out.getvalue()
+
+
+def stored(column: str) -> list[Any]:
+    """Read the stored values of a column, bypassing the model.
+
+    Args:
+        column (str): the name of the column
+
+    Returns:
+        list[Any]: the value of each record, in primary key order
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {column} FROM {Property._meta.db_table} ORDER BY id")
+        return [row[0] for row in cursor.fetchall()]
+
+
+@pytest.fixture(autouse=True)
+def clear_dictionary() -> Iterator[None]:
+    """Forget the latest dictionary of other tests, which were rolled back.
+
+    Yields:
+        None: clears the cache before and after the test
+    """
+    compression.latest_dictionary.cache_clear()
+    yield
+    compression.latest_dictionary.cache_clear()
+
+
+@pytest.fixture
+def result(mock_api_response_data: dict[str, Any]) -> dict[str, Any]:
+    """Provide the ``result`` of the sample ``property/details`` response.
+
+    Args:
+        mock_api_response_data (dict[str, Any]): the sample response
+
+    Returns:
+        dict[str, Any]: a copy of the result
+    """
+    return copy.deepcopy(mock_api_response_data["property/details"]["result"])
+
+
+@pytest.fixture
+def payloads(result: dict[str, Any]) -> list[Property]:
+    """Create properties whose data varies slightly, as it does in production.
+
+    Args:
+        result (dict[str, Any]): the sample result to vary
+
+    Returns:
+        list[Property]: the new records
+    """
+    props = []
+    for n in range(50):
+        data = copy.deepcopy(result)
+        data["property"]["year_built"] = 1900 + n
+        data["assessment"]["total_assessed_value"] = 100_000 + 7_919 * n
+        props.append(
+            Property.objects.create(
+                identifier={"address": f"{n} Main St", "zipcode": "12345"},
+                other_data=data,
+            )
+        )
+    return props
+
+
+def test_migrate(admin_user: User, payloads: list[Property]) -> None:
+    """Verify existing records are compressed, read transparently, and restored."""
+    out = run("--train", "--samples=50", "--dict-size=2048", "--batch-size=20")
+    assert re.search(r"trained dictionary \d+ \(\d+ bytes\) on 50 records", out)
+    assert "compressed 40 records" in out
+
+    report = re.search(r"migrated 50 records; (\d+) -> (\d+) bytes per record", out)
+    assert report is not None
+    assert int(report[2]) < int(report[1]) / 2
+
+    # the stored frames record the dictionary they were compressed with
+    dictionary = CompressionDictionary.objects.get()
+    assert stored("other_data") == ["{}"] * 50
+    assert {
+        zstandard.get_frame_parameters(bytes(frame)).dict_id
+        for frame in stored("other_data_zstd")
+    } == {dictionary.dict_id}
+
+    prop = Property.objects.get(pk=payloads[1].pk)
+    assert prop.other_data == payloads[1].other_data
+    assert isinstance(prop.other_data, compression.CompressedData)
+
+    request = APIRequestFactory().get(f"/api/properties/{prop.pk}/")
+    force_authenticate(request, user=admin_user)
+    response = PropertyViewSet.as_view({"get": "retrieve"})(request, pk=prop.pk)
+    assert response.data["other_data"] == payloads[1].other_data
+    assert "other_data_zstd" not in response.data
+
+    assert "done: no records to migrate" in run()
+    assert "done: migrated 50 records" in run("--decompress")
+    assert [json.loads(v) for v in stored("other_data")] == [
+        p.other_data for p in payloads
+    ]
+    assert stored("other_data_zstd") == [None] * 50
+
+
+def test_update(
+    settings: SettingsWrapper, api_client: BasicAPIClient, result: dict[str, Any]
+) -> None:
+    """Verify new data is compressed when ``HC_OTHER_DATA_COMPRESSION`` is enabled."""
+    settings.HC_OTHER_DATA_COMPRESSION = True
+    prop = Property(apiclient=api_client, identifier={"address": "1 Main St"})
+    prop.update({"property/details": {"result": copy.deepcopy(result)}}).save()
+    assert prop.year_built == result["property"]["year_built"]
+
+    prop.refresh_from_db()
+    del result["property"]["sewer"], result["assessment"]["assessment_year"]
+    assert prop.other_data == result
+    assert stored("other_data") == ["{}"]
+
+    # without a dictionary, the data is compressed without one
+    assert (
+        zstandard.get_frame_parameters(bytes(stored("other_data_zstd")[0])).dict_id == 0
+    )
+
+    settings.HC_OTHER_DATA_COMPRESSION = False
+    result = {"property": {"sewer": "septic"}, "assessment": {"assessment_year": 2020}}
+    prop.update({"property/details": {"result": result}}).save()
+    assert [json.loads(v) for v in stored("other_data")] == [result]
+    assert stored("other_data_zstd") == [None]
+
+
+def test_fixtures(payloads: list[Property]) -> None:
+    """Verify compressed data can be dumped to, and loaded from, fixtures."""
+    run("--train", "--samples=50", "--dict-size=2048")
+
+    dumped = serializers.serialize("json", Property.objects.filter(pk=payloads[0].pk))
+    (loaded,) = serializers.deserialize("json", dumped)
+    assert loaded.object.other_data_zstd == payloads[0].other_data
+
+
+def test_export(payloads: list[Property]) -> None:
+    """Verify compressed data is exported like uncompressed data."""
+    run("--batch-size=25")
+    Property.objects.get(pk=payloads[0].pk).compress(False).save()
+
+    out = StringIO()
+    call_command(
+        "export_properties",
+        "--columns=id,other_data",
+        "--other-data=property.year_built",
+        "--other-data=property.year_built.nope",
+        stdout=out,
+        stderr=StringIO(),
+    )
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records == [
+        {
+            "id": p.pk,
+            "other_data": p.other_data,
+            "property.year_built": p.other_data["property"]["year_built"],
+            "property.year_built.nope": None,
+        }
+        for p in payloads
+    ]
+
+
+def test_import(
+    settings: SettingsWrapper,
+    tmp_path: Path,
+    api_client: BasicAPIClient,
+    result: dict[str, Any],
+) -> None:
+    """Verify imported data is compressed when ``HC_OTHER_DATA_COMPRESSION`` is set."""
+    settings.HC_OTHER_DATA_COMPRESSION = True
+    dump = tmp_path / "responses.ndjson"
+    line = {
+        "identifier": {"address": "1 Main St", "zipcode": "12345"},
+        "response": {"property/details": {"result": result}},
+    }
+    dump.write_text(json.dumps(line) + "\n", encoding="utf-8")
+
+    call_command("import_properties", str(dump), stdout=StringIO())
+    assert stored("other_data") == ["{}"]
+    assert Property.objects.get().other_data["property"]["zoning"] == "RH1"
+
+
+def test_invalid_arguments() -> None:
+    """Verify invalid arguments are rejected."""
+    with pytest.raises(CommandError, match="must be positive"):
+        run("--batch-size=0")
+    with pytest.raises(CommandError, match="can't be combined"):
+        run("--train", "--decompress")
+    with pytest.raises(CommandError, match="no records to train"):
+        run("--train")
@@ -0,0 +1,156 @@
+"""Verify conditional requests are answered without serializing unchanged records.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+from typing import Any, Callable, ContextManager
+
+# django packages
+from django.contrib.auth.models import User
+from django.http.response import HttpResponse
+from django.test import RequestFactory
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+from pytest_mock import MockerFixture
+
+# local
+from canary_core.hc_api_connector.models import Property, PropertyAddress
+from canary_core.hc_api_connector.serializers import PropertySerializer
+from canary_core.hc_api_connector.views import PropertyViewSet, has_septic
+
+
+@pytest.fixture
+def prop(query_params: PropertyAddress) -> Property:
+    """Create a tracked property.
+
+    Args:
+        query_params (PropertyAddress): the address of the property
+
+    Returns:
+        Property: the new record
+    """
+    return Property.objects.create(
+        identifier=query_params, sewage_type=Property.SewageType.SEPTIC
+    )
+
+
+def call(user: User, action: str, **headers: str) -> HttpResponse:
+    """Send a `GET` request to the property view set.
+
+    Args:
+        user (User): authenticate the request as this user
+        action (str): the view set action, i.e. ``list`` or ``retrieve``; to retrieve
+            a record, append its primary key, e.g. ``retrieve:1``
+        **headers (str): request headers, e.g. ``HTTP_IF_NONE_MATCH``
+
+    Returns:
+        HttpResponse: the response
+    """
+    action, _, pk = action.partition(":")
+    request = APIRequestFactory().get("/api/properties/", **headers)
+    force_authenticate(request, user=user)
+    kwargs: dict[str, Any] = {"pk": pk} if pk else {}
+    return PropertyViewSet.as_view({"get": action})(request, **kwargs)
+
+
+@pytest.mark.django_db
+def test_has_septic(rf: RequestFactory, prop: Property, query_params: Any) -> None:
+    """Verify lookups carry validators, and unchanged answers aren't resent."""
+    response = has_septic(rf.get("/", data=query_params))
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+    assert etag.startswith('"')
+
+    response = has_septic(rf.get("/", data=query_params, HTTP_IF_NONE_MATCH=etag))
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    response = has_septic(
+        rf.get("/", data=query_params, HTTP_IF_MODIFIED_SINCE=last_modified)
+    )
+    assert response.status_code == 304
+
+    prop.sewage_type = Property.SewageType.MUNICIPAL
+    prop.save()
+    response = has_septic(rf.get("/", data=query_params, HTTP_IF_NONE_MATCH=etag))
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_retrieve(
+    admin_user: User,
+    prop: Property,
+    mocker: MockerFixture,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify a current copy of a record is confirmed using a single query."""
+    response = call(admin_user, f"retrieve:{prop.pk}")
+    assert response.status_code == 200
+    etag = response["ETag"]
+
+    spy = mocker.spy(PropertySerializer, "to_representation")
+    with django_assert_num_queries(1):
+        response = call(admin_user, f"retrieve:{prop.pk}", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert spy.call_count == 0
+
+    prop.owners.add(admin_user)
+    response = call(admin_user, f"retrieve:{prop.pk}", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert call(admin_user, "retrieve:0").status_code == 404
+
+
+@pytest.mark.django_db
+def test_list(
+    admin_user: User,
+    prop: Property,
+    mocker: MockerFixture,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify the version of a page changes when any of its records change."""
+    etag = call(admin_user, "list")["ETag"]
+    spy = mocker.spy(PropertySerializer, "to_representation")
+
+    # only the keys of the page are read
+    with django_assert_num_queries(1) as context:
+        assert call(admin_user, "list", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert '"other_data"' not in context.captured_queries[0]["sql"]
+    assert spy.call_count == 0
+
+    admin_user.properties.add(prop)
+    changed = call(admin_user, "list", HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed.data["results"][0]["owners"] == [admin_user.pk]
+    assert changed.data["results"][0]["other_data"] == prop.other_data
+
+    admin_user.properties.clear()
+    assert call(admin_user, "list")["ETag"] not in (etag, changed["ETag"])
+
+
+@pytest.mark.django_db
+def test_export(admin_user: User, properties: list[Property]) -> None:
+    """Verify the version of an export changes when its set of records changes."""
+
+    def export(**headers: str) -> HttpResponse:
+        request = APIRequestFactory().get(
+            "/api/properties/", {"format": "ndjson"}, **headers
+        )
+        force_authenticate(request, user=admin_user)
+        return PropertyViewSet.as_view({"get": "list"})(request)
+
+    etag = export()["ETag"]
+    assert export(HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # replace a record with one that is older, keeping the count and latest time
+    properties[1].delete()
+    new = Property.objects.create(identifier={"address": "1 Elm St"})
+    Property.objects.filter(pk=new.pk).update(modified=properties[0].modified)
+
+    response = export(HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
@@ -0,0 +1,119 @@
+"""Verify ``other_data`` can be queried by value using its GIN index.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+from typing import Any
+
+# django packages
+from django.contrib.auth.models import User
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+
+# local
+from canary_core.hc_api_connector.filters import ContainmentFilterBackend
+from canary_core.hc_api_connector.models import Property
+from canary_core.hc_api_connector.views import PropertyViewSet
+
+
+@pytest.fixture
+def pools() -> list[Property]:
+    """Create properties with and without pools.
+
+    Returns:
+        list[Property]: the new records; only the first two have pools
+    """
+    data = [
+        {"pool": True, "zoning": "RH1", "no_of_stories": 2},
+        {"pool": True, "zoning": "1957", "no_of_stories": 1},
+        {"pool": False, "zoning": "RH1", "no_of_stories": 2},
+    ]
+    return [
+        Property.objects.create(
+            identifier={"address": f"{n} Main St", "zipcode": "12345"},
+            other_data={"property": attrs},
+        )
+        for n, attrs in enumerate(data)
+    ]
+
+
+def get_page(user: User, **params: Any) -> Response:
+    """List a page of properties.
+
+    Args:
+        user (User): authenticate the request as this user
+        **params (Any): query string parameters
+
+    Returns:
+        Response: the page
+    """
+    request = APIRequestFactory().get("/api/properties/", params)
+    force_authenticate(request, user=user)
+    return PropertyViewSet.as_view({"get": "list"})(request)
+
+
+@pytest.mark.django_db
+def test_filter(admin_user: User, pools: list[Property]) -> None:
+    """Verify values are matched by type, and parameters are combined."""
+
+    def pks(**params: Any) -> list[int]:
+        return [
+            record["id"] for record in get_page(admin_user, **params).data["results"]
+        ]
+
+    assert pks(other_data__property__pool="true") == [pools[0].pk, pools[1].pk]
+    assert pks(
+        other_data__property__pool="true", other_data__property__zoning="RH1"
+    ) == [pools[0].pk]
+    assert pks(other_data__property__zoning='"1957"') == [pools[1].pk]
+    assert pks(other_data__property__zoning="1957") == []
+    assert pks(other_data__property='{"no_of_stories": 2}') == [
+        pools[0].pk,
+        pools[2].pk,
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"other_data__property__pool; DROP TABLE": "true"},
+        {"other_data__": "true"},
+        {"other_data__" + "__".join("k" * 9): "true"},
+        {"other_data__property": "1", "other_data__property__pool": "true"},
+        {"other_data__property__pool": "true", "other_data__property": "{}"},
+    ],
+)
+def test_invalid(admin_user: User, params: dict[str, str]) -> None:
+    """Verify unsafe keys and conflicting parameters are rejected."""
+    response = get_page(admin_user, **params)
+    assert response.status_code == 400
+    assert set(response.data) <= set(params)
+
+
+@pytest.mark.django_db
+def test_index_used(pools: list[Property]) -> None:
+    """Verify containment queries are planned using the GIN index."""
+    view = PropertyViewSet()
+    request = Request(
+        APIRequestFactory().get("/", {"other_data__property__pool": "true"})
+    )
+    queryset = ContainmentFilterBackend().filter_queryset(
+        request, Property.objects.all(), view
+    )
+
+    # the table is tiny, so sequential scans are cheaper unless they're disabled
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = queryset.explain()
+
+    assert "hc_property_other_data_gin" in plan
+    assert "@>" in plan
@@ -0,0 +1,121 @@
+"""Test the ``export_properties`` management command.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import csv
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Any, Optional
+
+# django packages
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+# third party
+import pytest
+
+# local
+from canary_core.hc_api_connector.models import Property
+
+
+def run(*args: Any) -> tuple[str, str]:
+    """Run the command, capturing its output.
+
+    Args:
+        *args (Any): command line arguments
+
+    Returns:
+        tuple[str, str]: the output of the command, and its progress messages
+    """
+    out, err = StringIO(), StringIO()
+    call_command("export_properties", *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.fixture
+def zipcodes() -> list[Property]:
+    """Create two properties in each of five zipcodes.
+
+    Returns:
+        list[Property]: the new records
+    """
+    return [
+        Property.objects.create(
+            identifier={"address": f"{n} Main St", "zipcode": f"{n % 5:05}"},
+            other_data={"property": {"pool": n % 2 == 0, "zoning": "RH1"}},
+            year_built=1900 + n,
+        )
+        for n in range(10)
+    ]
+
+
+@pytest.mark.django_db
+def test_ndjson(zipcodes: list[Property]) -> None:
+    """Verify the selected columns and attributes are exported, one chunk at a time."""
+    out, err = run(
+        "--columns=id,year_built",
+        "--other-data=property.pool",
+        "--zipcode=00001",
+        "--zipcode=00002",
+        "--chunk-size=2",
+    )
+
+    records = [json.loads(line) for line in out.splitlines()]
+    assert records == [
+        {"id": p.pk, "year_built": p.year_built, "property.pool": n % 2 == 0}
+        for n, p in enumerate(zipcodes)
+        if n % 5 in (1, 2)
+    ]
+    assert "MainThread: exported 4 records" in err
+    assert "done: exported 4 records" in err
+
+
+@pytest.mark.django_db(transaction=True)
+def test_partitioned_csv(zipcodes: list[Property], tmp_path: Path) -> None:
+    """Verify each zipcode is exported by exactly one worker."""
+    zipcodes.append(Property.objects.create(identifier={"address": "1 Nowhere Ln"}))
+    _, err = run(
+        "--format=csv",
+        "--columns=id,identifier",
+        "--other-data=property",
+        "--workers=3",
+        f"--output={tmp_path}",
+    )
+    assert "done: exported 11 records" in err
+
+    partitions: dict[str, set[Optional[str]]] = {}
+    rows: list[dict[str, str]] = []
+    for path in sorted(tmp_path.glob("part-*.csv")):
+        with open(path, encoding="utf-8", newline="") as f:
+            part = list(csv.DictReader(f))
+        rows += part
+        partitions[path.name] = {
+            json.loads(r["identifier"]).get("zipcode") for r in part
+        }
+
+    assert len(partitions) == 3
+    assert sorted(int(r["id"]) for r in rows) == [p.pk for p in zipcodes]
+    assert sum(map(len, partitions.values())) == 6
+    assert json.loads(rows[0]["property"])["zoning"] == "RH1"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        (["--workers=0"], "must be positive"),
+        (["--workers=2"], "requires an --output directory"),
+        (["--columns=id,nope"], "unknown columns: nope"),
+        (["--other-data=property.pool;"], "may only contain word characters"),
+        (["--other-data=property..pool"], "may only contain word characters"),
+    ],
+)
+def test_invalid_arguments(args: list[str], message: str) -> None:
+    """Verify invalid arguments are rejected."""
+    with pytest.raises(CommandError, match=message):
+        run(*args)
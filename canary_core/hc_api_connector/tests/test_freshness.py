@@ -0,0 +1,207 @@
+"""Verify stale property data is refreshed.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+import threading
+from datetime import timedelta
+from typing import Optional
+
+# django packages
+from django.conf import settings
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+# third party
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+# local
+from canary_core.hc_api_connector.background import BackgroundTasks
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+    property_refreshes,
+)
+from canary_core.hc_api_connector.views import (
+    has_septic,
+    has_septic_async,
+    has_septic_batch,
+)
+
+
+def make_property(
+    api_client: BasicAPIClient, address: PropertyAddress, age: Optional[int]
+) -> Property:
+    """Save a property marked septic, with data fetched ``age`` seconds ago.
+
+    The mock API reports the property as municipal, so refreshed records are no
+    longer septic.
+
+    Args:
+        api_client (BasicAPIClient): the client providing the property's data
+        address (PropertyAddress): the address of the property
+        age (Optional[int]): the age of the data in seconds; ``None`` clears the
+            ``fetched_at`` timestamp
+
+    Returns:
+        Property: the saved record
+    """
+    prop = Property.from_client(api_client, address)
+    prop.sewage_type = Property.SewageType.SEPTIC
+    prop.fetched_at = None if age is None else timezone.now() - timedelta(seconds=age)
+    prop.save()
+    return prop
+
+
+def test_fresh_not_refreshed(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify fresh data is served without contacting the API."""
+    make_property(mock_api_client, query_params, age=0)
+    spy = mocker.spy(BasicAPIClient, "get")
+
+    response = has_septic(rf.get("/", data=query_params))
+
+    assert json.loads(response.content) == {"septic": True}
+    assert len(property_refreshes) == 0
+    assert spy.call_count == 0
+
+
+def test_stale_refreshed_in_background(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+) -> None:
+    """Verify stale data is served immediately, then refreshed."""
+    prop = make_property(
+        mock_api_client, query_params, age=settings.HC_PROPERTY_MAX_AGE + 1
+    )
+
+    response = has_septic(rf.get("/", data=query_params))
+    assert json.loads(response.content) == {"septic": True}
+
+    property_refreshes.wait(timeout=10)
+    prop.refresh_from_db()
+    assert prop.sewage_type == Property.SewageType.MUNICIPAL
+    assert not Property.is_stale(prop.fetched_at)
+
+    response = has_septic(rf.get("/", data=query_params))
+    assert json.loads(response.content) == {"septic": False}
+
+
+def test_expired_refreshed_before_response(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify data past its hard expiry is refreshed before responding."""
+    make_property(
+        mock_api_client,
+        query_params,
+        age=settings.HC_PROPERTY_MAX_AGE + settings.HC_PROPERTY_STALE_GRACE + 1,
+    )
+    spy = mocker.spy(BasicAPIClient, "get")
+
+    response = has_septic(rf.get("/", data=query_params))
+
+    assert json.loads(response.content) == {"septic": False}
+    assert spy.call_count == 1
+
+
+def test_freshness_async(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+) -> None:
+    """Verify the async endpoint refreshes stale and expired data."""
+    prop = make_property(
+        mock_api_client, query_params, age=settings.HC_PROPERTY_MAX_AGE + 1
+    )
+    request = rf.get("/", data=query_params)
+
+    response = async_to_sync(has_septic_async)(request)
+    assert json.loads(response.content) == {"septic": True}
+    property_refreshes.wait(timeout=10)
+
+    Property.objects.filter(pk=prop.pk).update(
+        sewage_type=Property.SewageType.SEPTIC,
+        fetched_at=timezone.now() - timedelta(days=365),
+    )
+    response = async_to_sync(has_septic_async)(request)
+    assert json.loads(response.content) == {"septic": False}
+
+
+def test_freshness_batch(
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify the batch endpoint refreshes expired data before responding."""
+    make_property(mock_api_client, query_params, age=365 * 24 * 60 * 60)
+    spy = mocker.spy(BasicAPIClient, "get")
+    request = APIRequestFactory().post(
+        "/batch/", {"addresses": [query_params]}, format="json"
+    )
+
+    response = has_septic_batch(request)
+
+    assert response.data == [{"address": query_params, "septic": False}]
+    assert spy.call_count == 1
+
+
+def test_untracked_age_refreshed_in_background(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    settings: SettingsWrapper,
+) -> None:
+    """Verify records without ``fetched_at`` are refreshed unless refreshes are off."""
+    prop = make_property(mock_api_client, query_params, age=None)
+    settings.HC_PROPERTY_MAX_AGE = 0
+
+    has_septic(rf.get("/", data=query_params))
+    assert len(property_refreshes) == 0
+
+    settings.HC_PROPERTY_MAX_AGE = 60
+    response = has_septic(rf.get("/", data=query_params))
+    assert json.loads(response.content) == {"septic": True}
+
+    property_refreshes.wait(timeout=10)
+    prop.refresh_from_db()
+    assert prop.fetched_at is not None
+
+
+def test_background_tasks_coalesced() -> None:
+    """Verify tasks sharing a key are skipped while one is pending."""
+    tasks = BackgroundTasks()
+    release = threading.Event()
+    calls = []
+
+    def work() -> None:
+        calls.append(None)
+        release.wait(timeout=10)
+        raise ValueError("logged, not raised")
+
+    first = tasks.submit("key", work)
+    assert first is not None
+    assert tasks.submit("key", work) is None
+    assert len(tasks) == 1
+
+    release.set()
+    tasks.wait(timeout=10)
+
+    assert first.result() is None
+    assert calls == [None]
+    assert len(tasks) == 0
@@ -0,0 +1,128 @@
+"""Test the ``import_properties`` management command.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import copy
+import gzip
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+# django packages
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+# third party
+import pytest
+
+# local
+from canary_core.hc_api_connector.management.commands.import_properties import (
+    copy_value,
+)
+from canary_core.hc_api_connector.models import BasicAPIClient, Property
+
+LONG_AGO = timezone.now() - timedelta(days=365)
+
+pytestmark = pytest.mark.django_db
+
+
+def run(*args: Any) -> str:
+    """Run the command, capturing its output.
+
+    Args:
+        *args (Any): command line arguments
+
+    Returns:
+        str: the output of the command
+    """
+    out = StringIO()
+    call_command("import_properties", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def dump(tmp_path: Path, mock_api_response_data: dict[str, Any]) -> Path:
+    """Write a dump of five responses, one of them older, and two invalid lines.
+
+    Args:
+        tmp_path (Path): write the dump in this directory
+        mock_api_response_data (dict[str, Any]): the data of each response
+
+    Returns:
+        Path: the gzipped dump
+    """
+
+    def line(n: int, **kwargs: Any) -> str:
+        identifier = {"address": f"{n} Main St", "zipcode": "12345"}
+        response = copy.deepcopy(mock_api_response_data)
+        response["property/details"]["result"]["property"]["year_built"] = 1900 + n
+        return json.dumps({"identifier": identifier, "response": response, **kwargs})
+
+    lines = [line(n) for n in range(5)]
+    lines.insert(2, line(0, fetched_at=LONG_AGO.isoformat()))
+    lines.insert(4, "not json")
+    lines.insert(5, json.dumps({"identifier": {}, "response": {}}))
+
+    path = tmp_path / "responses.ndjson.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def test_import(dump: Path, api_client: BasicAPIClient) -> None:
+    """Verify responses are imported in batches, and invalid lines are counted."""
+    out = run(str(dump), "--batch-size", "2", "--client", str(api_client.pk))
+
+    # the second batch holds older data for the first address, which isn't written
+    assert "read 4 lines: wrote 3 records (0 invalid)" in out
+    assert "done: wrote 5 records from 8 lines (2 invalid)" in out
+
+    props = Property.objects.order_by("year_built")
+    assert [p.year_built for p in props] == [1900, 1901, 1902, 1903, 1904]
+    assert all(p.apiclient == api_client for p in props)
+    assert props[0].sewage_type == Property.SewageType.MUNICIPAL
+    assert props[0].total_assessed_value == Decimal("1300000.00")
+    assert props[0].fetched_at > LONG_AGO
+
+
+def test_newer_data_kept(dump: Path, api_client: BasicAPIClient) -> None:
+    """Verify existing records are only replaced by newer data."""
+    current = Property.objects.create(
+        identifier={"address": "0  MAIN ST.", "zipcode": "12345"},
+        sewage_type=Property.SewageType.SEPTIC,
+    )
+    Property.objects.filter(identifier__address__startswith="0").update(
+        fetched_at=timezone.now() + timedelta(days=1)
+    )
+
+    assert "done: wrote 4 records" in run(str(dump))
+
+    current.refresh_from_db()
+    assert current.sewage_type == Property.SewageType.SEPTIC
+    assert Property.objects.count() == 5
+
+
+def test_invalid_arguments(dump: Path) -> None:
+    """Verify invalid arguments are rejected."""
+    with pytest.raises(CommandError, match="no active API clients"):
+        run(str(dump))
+    with pytest.raises(CommandError, match="no such API client"):
+        run(str(dump), "--client", "0")
+    with pytest.raises(CommandError, match="must be positive"):
+        run(str(dump), "--batch-size", "0")
+
+
+def test_copy_value() -> None:
+    """Verify values are escaped for ``COPY``."""
+    assert copy_value(None) == "\\N"
+    assert copy_value({"a": "b"}) == '{"a":"b"}'
+    assert copy_value(b"\x01\xff") == "\\\\x01ff"
+    assert copy_value("a\\b\tc\nd\re") == "a\\\\b\\tc\\nd\\re"
@@ -0,0 +1,249 @@
+"""Verify caching of addresses unknown to the HouseCanary API.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, ContextManager
+
+# django packages
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+import requests
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+# local
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    PropertyAddress,
+    UnknownAddress,
+    negative_cache,
+)
+from canary_core.hc_api_connector.negative_cache import (
+    BloomFilter,
+    UnknownAddressError,
+)
+from canary_core.hc_api_connector.views import (
+    UnknownAddressViewSet,
+    has_septic,
+    has_septic_async,
+)
+
+FAKE_ADDRESS = {"address": "not a real address", "zipcode": "00000"}
+
+
+def test_not_found_is_cached(
+    rf: RequestFactory, mock_api_client: BasicAPIClient, mocker: MockerFixture
+) -> None:
+    """Verify repeated requests for an unknown address don't repeat the API request."""
+    spy = mocker.spy(BasicAPIClient, "get")
+    request = rf.get("/", data=FAKE_ADDRESS)
+
+    responses = [has_septic(request) for _ in range(3)]
+
+    assert spy.call_count == 1
+    assert all(resp.status_code == 404 for resp in responses)
+    assert all(
+        json.loads(resp.content)["msg"] == "no such property" for resp in responses
+    )
+    assert UnknownAddress.objects.filter(identifier=FAKE_ADDRESS).count() == 1
+
+
+def test_not_found_is_cached_async(
+    rf: RequestFactory, mock_api_client: BasicAPIClient, mocker: MockerFixture
+) -> None:
+    """Verify the async endpoint uses the negative cache."""
+    spy = mocker.spy(BasicAPIClient, "aget")
+    request = rf.get("/", data=FAKE_ADDRESS)
+
+    responses = [async_to_sync(has_septic_async)(request) for _ in range(2)]
+
+    assert spy.call_count == 1
+    assert all(resp.status_code == 404 for resp in responses)
+
+
+def test_cached_from_other_process(
+    rf: RequestFactory, mock_api_client: BasicAPIClient, mocker: MockerFixture
+) -> None:
+    """Verify entries unknown to the Bloom filter still prevent API requests."""
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+
+    # simulate a process that hasn't synced its Bloom filter with the DB
+    negative_cache.reset()
+    mocker.patch.object(negative_cache, "_filter", return_value=BloomFilter(10))
+    spy = mocker.spy(BasicAPIClient, "get")
+
+    response = has_septic(rf.get("/", data=FAKE_ADDRESS))
+
+    assert response.status_code == 404
+    assert spy.call_count == 0
+
+
+def test_bloom_filter_skips_db(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify checks of cached and uncached addresses don't query the DB."""
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+
+    with django_assert_num_queries(0):
+        negative_cache.check(PropertyAddress(address="128 Chestnut St.", zipcode="1"))
+
+        response = has_septic(rf.get("/", data=FAKE_ADDRESS))
+        assert response.status_code == 404
+
+
+def test_bloom_filter_loaded_once(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify the Bloom filter is sized by a count, and its keys are read once."""
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+    negative_cache.reset()
+
+    with django_assert_num_queries(2) as context:
+        negative_cache.check(PropertyAddress(address="128 Chestnut St.", zipcode="1"))
+
+    count, keys = (q["sql"] for q in context.captured_queries)
+    assert "COUNT(" in count
+    assert "COUNT(" not in keys and '"key"' in keys
+    with pytest.raises(UnknownAddressError):
+        negative_cache.check(FAKE_ADDRESS)  # type: ignore
+
+
+def test_expired_entry_ignored(
+    rf: RequestFactory, mock_api_client: BasicAPIClient, mocker: MockerFixture
+) -> None:
+    """Verify expired entries are ignored."""
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+    UnknownAddress.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+    negative_cache.reset()
+    spy = mocker.spy(BasicAPIClient, "get")
+
+    response = has_septic(rf.get("/", data=FAKE_ADDRESS))
+
+    assert response.status_code == 404
+    assert spy.call_count == 1
+
+
+def test_negative_cache_disabled(
+    rf: RequestFactory,
+    mock_api_client: BasicAPIClient,
+    mocker: MockerFixture,
+    settings: SettingsWrapper,
+) -> None:
+    """Verify the negative cache is disabled when its TTL is zero."""
+    settings.HC_NEGATIVE_CACHE_TTL = 0
+    spy = mocker.spy(BasicAPIClient, "get")
+
+    for _ in range(2):
+        has_septic(rf.get("/", data=FAKE_ADDRESS))
+
+    assert spy.call_count == 2
+    assert not UnknownAddress.objects.exists()
+
+
+def test_purge_api(
+    rf: RequestFactory,
+    admin_user: User,
+    mock_api_client: BasicAPIClient,
+    mocker: MockerFixture,
+) -> None:
+    """Verify cached entries can be listed and purged using the API."""
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+    factory = APIRequestFactory()
+
+    def call(action: str, path: str = "/") -> Response:
+        request = factory.generic("GET" if action == "list" else "POST", path)
+        force_authenticate(request, user=admin_user)
+        return UnknownAddressViewSet.as_view({request.method.lower(): action})(request)
+
+    resp = call("list")
+    assert resp.status_code == 200
+    assert resp.data["results"][0]["identifier"] == FAKE_ADDRESS
+
+    assert call("purge", "/?expired=true").data == {"purged": 0}
+    assert call("purge").data == {"purged": 1}
+
+    spy = mocker.spy(BasicAPIClient, "get")
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+    assert spy.call_count == 1
+
+
+def test_delete_entry(
+    rf: RequestFactory,
+    admin_user: User,
+    mock_api_client: BasicAPIClient,
+    mocker: MockerFixture,
+) -> None:
+    """Verify deleting a single entry purges it from the process' memory."""
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+    entry = UnknownAddress.objects.get()
+    assert str(entry) == "Address not a real address | Zipcode 00000"
+
+    request = APIRequestFactory().delete("/")
+    force_authenticate(request, user=admin_user)
+    view = UnknownAddressViewSet.as_view({"delete": "destroy"})
+    assert view(request, pk=entry.pk).status_code == 204
+
+    spy = mocker.spy(BasicAPIClient, "get")
+    has_septic(rf.get("/", data=FAKE_ADDRESS))
+    assert spy.call_count == 1
+
+
+def test_bloom_filter_rebuilt_once() -> None:
+    """Verify threads waiting for a rebuild reuse the filter built while they waited."""
+    negative_cache.reset()
+    bloom = BloomFilter(10)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        with negative_cache._lock:
+            futures = [executor.submit(negative_cache._filter) for _ in range(4)]
+            time.sleep(0.1)
+
+            # simulate the rebuild by the thread holding the lock
+            negative_cache._bloom = bloom
+            negative_cache._bloom_expires = time.monotonic() + 60
+
+        assert all(future.result() is bloom for future in futures)
+
+
+@pytest.mark.django_db
+def test_local_entries_bounded(settings: SettingsWrapper) -> None:
+    """Verify the in-memory entries are limited to the least recently used ones."""
+    settings.HC_NEGATIVE_CACHE_SIZE = 2
+    negative_cache.reset()
+    response = requests.Response()
+    response.status_code = 404
+    response._content = b'{"msg": "no such property"}'
+
+    addresses = [
+        PropertyAddress(address=f"{i} not a real address", zipcode="00000")
+        for i in range(3)
+    ]
+    for address in addresses[:2]:
+        negative_cache.add(address, response)
+    with pytest.raises(UnknownAddressError):
+        negative_cache.check(addresses[0])
+    negative_cache.add(addresses[2], response)
+
+    assert list(negative_cache._local) == [
+        UnknownAddress.key_for(addresses[0]),
+        UnknownAddress.key_for(addresses[2]),
+    ]
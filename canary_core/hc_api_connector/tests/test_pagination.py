@@ -0,0 +1,164 @@
+"""Verify list views are paginated using keysets instead of offsets.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import base64
+from typing import Any, Callable, ContextManager, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# django packages
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+
+# local
+from canary_core.hc_api_connector.models import Property
+from canary_core.hc_api_connector.views import PropertyViewSet
+
+
+def get_page(user: User, url: str = "/api/properties/", **params: Any) -> Response:
+    """List a page of properties.
+
+    Args:
+        user (User): authenticate the request as this user
+        url (str): the URL of the page, e.g. the ``next`` link of the previous page
+        **params (Any): additional query string parameters
+
+    Returns:
+        Response: the page
+    """
+    params = {**dict(parse_qsl(urlsplit(url).query)), **params}
+    request = APIRequestFactory().get(urlsplit(url).path, params)
+    force_authenticate(request, user=user)
+    return PropertyViewSet.as_view({"get": "list"})(request)
+
+
+def walk(user: User, **params: Any) -> list[int]:
+    """Follow the ``next`` links from the first page to the last.
+
+    Args:
+        user (User): authenticate the requests as this user
+        **params (Any): query string parameters of the first page
+
+    Returns:
+        list[int]: the primary keys of the records, in the order they were listed
+    """
+    pks: list[int] = []
+    url: Optional[str] = "/api/properties/"
+    while url:
+        data = get_page(user, url, **params).data
+        assert "count" not in data
+        pks.extend(record["id"] for record in data["results"])
+        url, params = data["next"], {}
+    return pks
+
+
+def walk_back(user: User, **params: Any) -> list[int]:
+    """Follow the ``previous`` links from the last page to the first.
+
+    Args:
+        user (User): authenticate the requests as this user
+        **params (Any): query string parameters of the first page
+
+    Returns:
+        list[int]: the primary keys of the records, in the order they were listed
+    """
+    data = get_page(user, **params).data
+    while data["next"]:
+        data = get_page(user, data["next"]).data
+
+    pks: list[int] = []
+    while True:
+        pks[:0] = [record["id"] for record in data["results"]]
+        if not data["previous"]:
+            return pks
+        data = get_page(user, data["previous"]).data
+
+
+@pytest.mark.django_db
+def test_walk(admin_user: User, properties: list[Property]) -> None:
+    """Verify every record is listed once, in each supported ordering."""
+    pks = [p.pk for p in properties]
+    assert walk(admin_user, limit=2) == pks
+    assert walk(admin_user, limit=2, ordering="-id") == pks[::-1]
+
+    # records sharing a position are ordered by primary key
+    Property.objects.filter(pk__in=pks[:4]).update(modified=properties[0].modified)
+    assert walk(admin_user, limit=2, ordering="modified") == pks
+
+    # unsupported orderings fall back to the default
+    assert walk(admin_user, limit=3, ordering="sewage_type") == pks
+
+
+@pytest.mark.django_db
+def test_constant_cost(
+    admin_user: User,
+    properties: list[Property],
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify deep pages use the same queries as the first page, without counting."""
+    first = get_page(admin_user, limit=1)
+    url = first.data["next"]
+    for _ in range(3):
+        url = get_page(admin_user, url).data["next"]
+
+    # authentication is forced; one query for the page and one per record's owners
+    with django_assert_num_queries(2) as first_queries:
+        get_page(admin_user, limit=1)
+    with django_assert_num_queries(2) as deep_queries:
+        last = get_page(admin_user, url)
+
+    assert last.data["next"] is None
+    assert last.data["results"][0]["id"] == properties[-1].pk
+    for context in (first_queries, deep_queries):
+        sql = context.captured_queries[0]["sql"]
+        assert "COUNT(" not in sql
+        assert "OFFSET" not in sql
+
+
+@pytest.mark.django_db
+def test_tied_positions(admin_user: User) -> None:
+    """Verify records sharing a position are listed once, however many there are."""
+    Property.objects.bulk_create(
+        Property(
+            identifier={"address": f"{n} Elm St", "zipcode": "12345"},
+            address_key=f"{n} elm st|12345",
+        )
+        for n in range(2500)
+    )
+    Property.objects.update(modified=timezone.now())
+    pks = list(Property.objects.order_by("pk").values_list("pk", flat=True))
+
+    assert walk(admin_user, limit=1000, ordering="modified") == pks
+    assert walk(admin_user, limit=1000, ordering="-modified") == pks[::-1]
+    assert walk(admin_user, limit=1000, ordering="-modified,id") == pks
+    assert walk_back(admin_user, limit=1000, ordering="modified") == pks
+
+
+@pytest.mark.django_db
+def test_previous(admin_user: User, properties: list[Property]) -> None:
+    """Verify the ``previous`` links list the records in reverse."""
+    pks = [p.pk for p in properties]
+    assert walk_back(admin_user, limit=2) == pks
+    assert walk_back(admin_user, limit=2, ordering="-id") == pks[::-1]
+
+    first = get_page(admin_user, limit=2).data
+    assert first["previous"] is None
+    assert get_page(admin_user, first["next"]).data["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_invalid_cursor(admin_user: User) -> None:
+    """Verify malformed positions are rejected."""
+    for position in ("nope", "[1, 2]", '["yesterday", "1"]'):
+        cursor = base64.b64encode(urlencode({"p": position}).encode()).decode()
+        response = get_page(admin_user, ordering="modified", cursor=cursor)
+        assert response.status_code == 404
@@ -11,6 +11,7 @@ from django.test import RequestFactory
 
 # third party
 import pytest
+from asgiref.sync import async_to_sync
 
 # local
 from canary_core.hc_api_connector.models import (
@@ -18,7 +19,7 @@ from canary_core.hc_api_connector.models import (
     Property,
     PropertyAddress,
 )
-from canary_core.hc_api_connector.views import has_septic
+from canary_core.hc_api_connector.views import has_septic, has_septic_async
 
 
 def test_nominal_has_septic(
@@ -101,3 +102,58 @@ def test_unknown_sewage_type(
     assert "detail" in resp_data
 
     assert resp_data["msg"] == "unknown sewage type for property"
+
+
+def test_nominal_has_septic_async(
+    rf: RequestFactory, mock_api_client: BasicAPIClient, query_params: PropertyAddress
+) -> None:
+    """Verify nominal behavior of the async `has_septic` endpoint."""
+    request = rf.get("/", data=query_params)
+
+    response = async_to_sync(has_septic_async)(request)
+
+    assert response.status_code == 200
+    assert json.loads(response.content) == {"septic": False}
+    assert Property.objects.filter(identifier=query_params).exists()
+
+    # the second request is served from the DB
+    response = async_to_sync(has_septic_async)(request)
+    assert json.loads(response.content) == {"septic": False}
+
+
+def test_property_not_found_async(
+    rf: RequestFactory, mock_api_client: BasicAPIClient
+) -> None:
+    """Verify the async endpoint passes through errors from the API."""
+    fake_address = {"address": "not a real address"}
+    request = rf.get("/", data=fake_address)
+
+    response = async_to_sync(has_septic_async)(request)
+
+    assert response.status_code == 404
+    assert json.loads(response.content)["msg"] == "no such property"
+
+
+@pytest.mark.django_db
+def test_house_canary_api_error_async(
+    rf: RequestFactory, query_params: PropertyAddress, api_client: BasicAPIClient
+) -> None:
+    """Verify the async endpoint handles HouseCanary API connection errors."""
+    request = rf.get("/", data=query_params)
+    response = async_to_sync(has_septic_async)(request)
+
+    assert response.status_code >= 500
+    assert json.loads(response.content)["msg"] == "failed to connect to API"
+
+
+@pytest.mark.django_db
+def test_house_canary_no_api_client_record_async(
+    rf: RequestFactory, query_params: PropertyAddress
+) -> None:
+    """Verify the async endpoint handles missing API client records."""
+    request = rf.get("/", data=query_params)
+    response = async_to_sync(has_septic_async)(request)
+
+    assert response.status_code >= 500
+    resp_data = json.loads(response.content)
+    assert resp_data["msg"] == "Misconfigured: no API client records"
@@ -0,0 +1,120 @@
+"""Verify attributes of ``other_data`` are promoted to typed, filterable columns.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import importlib
+from decimal import Decimal
+from typing import Any
+
+# django packages
+from django.apps import apps
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+
+# local
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+)
+from canary_core.hc_api_connector.views import PropertyViewSet
+
+migration = importlib.import_module(
+    "canary_core.hc_api_connector.migrations.0012_property_promoted_fields"
+)
+
+
+def other_data(year_built: Any, value: Any = 1000.0) -> dict[str, Any]:
+    """Build the HouseCanary data of a property.
+
+    Args:
+        year_built (Any): the year the property was built
+        value (Any): the total assessed value of the property
+
+    Returns:
+        dict[str, Any]: the data, as stored in ``other_data``
+    """
+    return {
+        "property": {
+            "year_built": year_built,
+            "building_area_sq_ft": 1500,
+            "property_type": "Condominium",
+        },
+        "assessment": {"total_assessed_value": value},
+    }
+
+
+def test_update(mock_api_client: BasicAPIClient, query_params: PropertyAddress) -> None:
+    """Verify the columns are populated when the record is updated."""
+    prop = Property.from_client(mock_api_client, query_params, save=True)
+    prop.refresh_from_db()
+
+    assert prop.year_built == 1957
+    assert prop.building_area_sq_ft == 1824
+    assert prop.property_type == "Single Family Residential"
+    assert prop.water == "municipal"
+    assert prop.total_assessed_value == Decimal("1300000.00")
+
+
+def test_promote_invalid() -> None:
+    """Verify missing and invalid values are cleared."""
+    prop = Property(other_data=other_data("unknown", value="n/a"))
+    prop.property_type = "Single Family Residential"
+    prop.promote()
+
+    assert prop.year_built is None
+    assert prop.water is None
+    assert prop.property_type == "Condominium"
+    assert prop.total_assessed_value is None
+
+    prop.other_data = {"property": None}
+    assert prop.promote().building_area_sq_ft is None
+
+
+@pytest.mark.django_db
+def test_backfill() -> None:
+    """Verify the migration copies the values of existing records."""
+    props = [
+        Property.objects.create(
+            identifier={"address": f"{n} Main St", "zipcode": "12345"},
+            other_data=other_data(1950 + n),
+        )
+        for n in range(3)
+    ]
+    Property.objects.create(
+        identifier={"address": "3 Main St", "zipcode": "12345"},
+        other_data=other_data(-1),
+    )
+    migration.backfill(apps, None)
+
+    years = Property.objects.order_by("pk").values_list("year_built", flat=True)
+    assert list(years) == [1950, 1951, 1952, None]
+    assert Property.objects.get(pk=props[0].pk).building_area_sq_ft == 1500
+
+
+@pytest.mark.django_db
+def test_filters(admin_user: User) -> None:
+    """Verify the columns can be filtered by value and range."""
+    for n in range(5):
+        Property(
+            identifier={"address": f"{n} Main St", "zipcode": "12345"},
+            other_data=other_data(1950 + 10 * n, value=100_000 * n),
+        ).promote().save()
+
+    def years(**params: Any) -> list[int]:
+        request = APIRequestFactory().get("/api/properties/", params)
+        force_authenticate(request, user=admin_user)
+        response = PropertyViewSet.as_view({"get": "list"})(request)
+        return [record["year_built"] for record in response.data["results"]]
+
+    assert years(year_built__gte=1960, year_built__lt=1990) == [1960, 1970, 1980]
+    assert years(total_assessed_value__gt=250_000) == [1980, 1990]
+    assert years(property_type="Condominium", year_built=1950) == [1950]
+    assert years(property_type="Townhouse") == []
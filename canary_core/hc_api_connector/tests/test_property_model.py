@@ -6,18 +6,28 @@
 from __future__ import annotations
 
 # stdlib
+import importlib
 from typing import Any, Iterator
 
+# django packages
+from django.apps import apps
+
 # third party
 import pytest
+from pytest_mock import MockerFixture
 
 # local
+from canary_core.hc_api_connector import addresses
 from canary_core.hc_api_connector.models import (
     BasicAPIClient,
     Property,
     PropertyAddress,
 )
 
+migration = importlib.import_module(
+    "canary_core.hc_api_connector.migrations.0004_property_address_key"
+)
+
 PROPERTY_DEFAULTS: dict[str, Any] = dict(
     assessment_date=None, sewage_type=Property.SewageType.UNKNOWN, other_data={}
 )
@@ -127,3 +137,69 @@ def test_property_from_client(
     selected_prop = Property.objects.get(pk=prop.pk)
 
     assert prop == selected_prop
+
+
+def test_property_address_key(
+    property_record: Property, query_params: PropertyAddress, mocker: MockerFixture
+) -> None:
+    """Verify equivalent spellings of the address resolve to the same record."""
+    spy = mocker.spy(BasicAPIClient, "get")
+    respelled = PropertyAddress(
+        **{k: f"  {v.upper()}. " for k, v in reversed(query_params.items())}
+    )
+
+    prop = Property.get_or_fetch(property_record.apiclient, respelled)
+
+    assert prop.pk == property_record.pk
+    assert spy.call_count == 0
+
+
+def test_property_bulk_from_client(
+    property_record: Property, query_params: PropertyAddress, mocker: MockerFixture
+) -> None:
+    """Verify properties are fetched in batches and existing records are updated."""
+    spy = mocker.spy(BasicAPIClient, "post")
+    identifiers = [
+        PropertyAddress(address="not a real address", zipcode="00000"),
+        query_params,
+        PropertyAddress(**{k: v.upper() for k, v in query_params.items()}),
+    ]
+
+    props = Property.bulk_from_client(
+        property_record.apiclient, identifiers, batch_size=1
+    )
+
+    assert spy.call_count == 2
+    assert [p.pk for p in props] == [property_record.pk]
+    property_record.refresh_from_db()
+    assert property_record.sewage_type == Property.SewageType.MUNICIPAL
+    assert property_record.other_data
+
+
+def test_property_bulk_from_client_create(
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify new records are created with their address key."""
+    spy = mocker.spy(BasicAPIClient, "post")
+
+    props = Property.bulk_from_client(mock_api_client, [query_params])
+
+    assert spy.call_count == 1
+    saved = Property.objects.get(pk=props[0].pk)
+    assert saved.address_key == props[0].address_key
+    assert saved == Property.get_or_fetch(mock_api_client, query_params)
+
+
+def test_backfill_address_keys(
+    property_record: Property, query_params: PropertyAddress
+) -> None:
+    """Verify the migration keys existing records like the current normalization."""
+    Property.objects.filter(pk=property_record.pk).update(address_key="")
+
+    migration.backfill_address_keys(apps, None)
+
+    saved = Property.objects.get(pk=property_record.pk)
+    assert saved.address_key == addresses.address_key(query_params)
+    assert Property.objects.count() == 1
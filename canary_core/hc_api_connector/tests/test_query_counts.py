@@ -0,0 +1,97 @@
+"""Verify listing properties uses a constant number of queries.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+from typing import Any, Callable, ContextManager
+
+# django packages
+from django.contrib.auth.models import User
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+
+# local
+from canary_core.hc_api_connector.models import BasicAPIClient, Property
+from canary_core.hc_api_connector.views import PropertyViewSet
+
+
+def get_page(user: User, **params: Any) -> Response:
+    """List a page of properties.
+
+    Args:
+        user (User): authenticate the request as this user
+        **params (Any): query string parameters
+
+    Returns:
+        Response: the page
+    """
+    request = APIRequestFactory().get("/api/properties/", params)
+    force_authenticate(request, user=user)
+    return PropertyViewSet.as_view({"get": "list"})(request)
+
+
+@pytest.fixture
+def owned(
+    admin_user: User, properties: list[Property], api_client: BasicAPIClient
+) -> list[Property]:
+    """Give each property a second owner and an API client.
+
+    Args:
+        admin_user (User): the first owner of the properties
+        properties (list[Property]): the properties
+        api_client (BasicAPIClient): the client that fetched the properties
+
+    Returns:
+        list[Property]: the properties
+    """
+    other = User.objects.create_user("other")
+    Property.objects.update(apiclient=api_client)
+    for prop in properties:
+        prop.owners.add(other)
+    return properties
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("limit", [1, 5])
+def test_list(
+    admin_user: User,
+    owned: list[Property],
+    limit: int,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify a page costs one query for the records and one for their owners."""
+    with django_assert_num_queries(2):
+        response = get_page(admin_user, limit=limit)
+
+    results = response.data["results"]
+    assert len(results) == limit
+    assert all(len(r["owners"]) == 2 and r["apiclient"] for r in results)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("limit", [1, 5])
+def test_filter_owners(
+    admin_user: User,
+    owned: list[Property],
+    limit: int,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify filtering by owners lists each record once, without ``DISTINCT``."""
+    other = User.objects.get(username="other")
+    Property.objects.get(pk=owned[0].pk).owners.remove(other)
+
+    # one more query validates the selected owners
+    with django_assert_num_queries(3) as context:
+        response = get_page(admin_user, limit=limit, owners=[admin_user.pk, other.pk])
+
+    assert [r["id"] for r in response.data["results"]] == [p.pk for p in owned[:limit]]
+    assert all("DISTINCT" not in q["sql"] for q in context.captured_queries)
+
+    response = get_page(admin_user, owners=[other.pk])
+    assert [r["id"] for r in response.data["results"]] == [p.pk for p in owned[1:]]
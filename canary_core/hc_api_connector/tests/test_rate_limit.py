@@ -0,0 +1,143 @@
+"""Verify API clients share a rate limit across processes.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+import time
+
+# django packages
+from django.test import RequestFactory
+from rest_framework.test import APIRequestFactory
+
+# third party
+import pytest
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+
+# local
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    PropertyAddress,
+    TokenBucket,
+    rate_limiter,
+)
+from canary_core.hc_api_connector.ratelimit import (
+    RateLimiter,
+    RateLimitExceeded,
+    rate_limit_wait,
+)
+from canary_core.hc_api_connector.views import has_septic, has_septic_batch
+
+
+def limit(client: BasicAPIClient, rate: float, burst: int = 1) -> BasicAPIClient:
+    """Apply the rate limit to the client.
+
+    Args:
+        client (BasicAPIClient): the client to limit
+        rate (float): the number of requests per second
+        burst (int): the size of the token bucket
+
+    Returns:
+        BasicAPIClient: the saved client
+    """
+    client.rate_limit = rate
+    client.rate_limit_burst = burst
+    client.save()
+    return client
+
+
+@pytest.mark.django_db
+def test_unlimited(api_client: BasicAPIClient) -> None:
+    """Verify clients without a rate limit don't use a token bucket."""
+    for _ in range(3):
+        rate_limiter.acquire(api_client)
+
+    assert not TokenBucket.objects.filter(client_id=api_client.pk).exists()
+
+
+@pytest.mark.django_db
+def test_burst_then_fail_fast(api_client: BasicAPIClient) -> None:
+    """Verify the burst is allowed, and later requests can fail fast."""
+    limit(api_client, rate=0.01, burst=2)
+
+    with rate_limit_wait(0):
+        rate_limiter.acquire(api_client)
+        rate_limiter.acquire(api_client)
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            rate_limiter.acquire(api_client)
+
+    assert 90 < exc_info.value.retry_after <= 100
+    assert str(TokenBucket.objects.get(client_id=api_client.pk)).startswith(
+        f"API client {api_client.pk} | 0.0"
+    )
+
+
+@pytest.mark.django_db
+def test_wait_for_token(api_client: BasicAPIClient) -> None:
+    """Verify callers can wait for the next token."""
+    limit(api_client, rate=20)
+    rate_limiter.acquire(api_client)
+
+    start = time.monotonic()
+    with rate_limit_wait(1):
+        rate_limiter.acquire(api_client)
+
+    assert time.monotonic() - start >= 0.03
+
+
+@pytest.mark.django_db
+def test_shared_bucket(api_client: BasicAPIClient) -> None:
+    """Verify limiters using separate connections (e.g. processes) share the bucket."""
+    limit(api_client, rate=0.01)
+    other_process = RateLimiter(TokenBucket)
+
+    rate_limiter.acquire(api_client)
+    with rate_limit_wait(0), pytest.raises(RateLimitExceeded):
+        other_process.acquire(api_client)
+
+
+def test_has_septic_rate_limited(
+    rf: RequestFactory, mock_api_client: BasicAPIClient, settings: SettingsWrapper
+) -> None:
+    """Verify the endpoint responds with 429 when the rate limit is exceeded."""
+    settings.HC_RATE_LIMIT_WAIT = 0
+    limit(mock_api_client, rate=0.01)
+
+    response = has_septic(rf.get("/", data={"address": "1 Nowhere Ln"}))
+    assert response.status_code == 404
+
+    response = has_septic(rf.get("/", data={"address": "2 Nowhere Ln"}))
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) == json.loads(response.content)["retry_after"]
+
+
+def test_async_rate_limited(
+    mock_api_client: BasicAPIClient, query_params: PropertyAddress
+) -> None:
+    """Verify async requests take tokens from the same bucket."""
+    limit(mock_api_client, rate=0.01)
+    assert async_to_sync(mock_api_client.aget)(**query_params).status_code == 200
+
+    with rate_limit_wait(0), pytest.raises(RateLimitExceeded):
+        async_to_sync(mock_api_client.aget)(**query_params)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_connections_released(mock_api_client: BasicAPIClient) -> None:
+    """Verify batch workers close their dedicated connections when they finish."""
+    limit(mock_api_client, rate=1000, burst=100)
+    rate_limiter.acquire(mock_api_client)
+    before = len(rate_limiter._connections)  # pylint: disable=protected-access
+
+    for n in range(3):
+        addresses = [{"address": f"{n}{m} Nowhere Ln"} for m in range(4)]
+        request = APIRequestFactory().post(
+            "/batch/", {"addresses": addresses}, format="json"
+        )
+        assert has_septic_batch(request).status_code == 200
+        assert len(rate_limiter._connections) == before  # pylint: disable=W0212
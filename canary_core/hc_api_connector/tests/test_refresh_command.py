@@ -0,0 +1,216 @@
+"""Test the ``refresh_properties`` management command.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+# django packages
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+# third party
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+# local
+from canary_core.hc_api_connector.circuit import CircuitOpenError
+from canary_core.hc_api_connector.management.commands.refresh_properties import (
+    Command,
+)
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+    rate_limiter,
+)
+
+LONG_AGO = timezone.now() - timedelta(days=365)
+
+
+@pytest.fixture
+def stale_properties(
+    mock_api_client: BasicAPIClient, query_params: PropertyAddress
+) -> list[Property]:
+    """Create stale records: one known to the mock API, and three unknown to it.
+
+    Args:
+        mock_api_client (BasicAPIClient): the client providing the records' data
+        query_params (PropertyAddress): the address known to the mock API
+
+    Returns:
+        list[Property]: the records, in primary key order
+    """
+    identifiers = [query_params] + [
+        PropertyAddress(address=f"{n} Nowhere Ln", zipcode="00000") for n in range(3)
+    ]
+    props = [
+        Property.objects.create(
+            apiclient=mock_api_client,
+            identifier=identifier,
+            sewage_type=Property.SewageType.SEPTIC,
+        )
+        for identifier in identifiers
+    ]
+    Property.objects.update(fetched_at=LONG_AGO)
+    return props
+
+
+def refresh(*args: Any) -> str:
+    """Run the command, capturing its output.
+
+    Args:
+        *args (Any): command line arguments
+
+    Returns:
+        str: the output of the command
+    """
+    out = StringIO()
+    call_command("refresh_properties", *args, stdout=out)
+    return out.getvalue()
+
+
+def test_refresh_properties(stale_properties: list[Property]) -> None:
+    """Verify stale records are refreshed, and failures are counted."""
+    output = refresh("--batch-size", "2", "--workers", "2")
+
+    assert "done: refreshed 1 records (3 failed)" in output
+    known = Property.objects.get(pk=stale_properties[0].pk)
+    assert known.sewage_type == Property.SewageType.MUNICIPAL
+    assert known.fetched_at > LONG_AGO
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_connections_closed(
+    stale_properties: list[Property], mock_api_client: BasicAPIClient
+) -> None:
+    """Verify the workers' rate limiter connections are closed when the run ends."""
+    mock_api_client.rate_limit = 1000
+    mock_api_client.rate_limit_burst = 100
+    mock_api_client.save()
+    rate_limiter.acquire(mock_api_client)
+    before = len(rate_limiter._connections)  # pylint: disable=protected-access
+
+    for _ in range(2):
+        Property.objects.update(fetched_at=LONG_AGO)
+        assert "done: refreshed 1 records" in refresh("--workers", "3")
+        assert len(rate_limiter._connections) == before  # pylint: disable=W0212
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rate_limited(
+    stale_properties: list[Property],
+    mock_api_client: BasicAPIClient,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    """Verify the workers wait for rate-limited clients, unlike views."""
+    settings.HC_RATE_LIMIT_WAIT = 0
+    mock_api_client.rate_limit = 20
+    mock_api_client.rate_limit_burst = 1
+    mock_api_client.save()
+    spy = mocker.spy(BasicAPIClient, "_request")
+
+    output = refresh("--workers", "4")
+    assert "done: refreshed 1 records (3 failed)" in output
+    assert spy.call_count == len(stale_properties)
+
+    spy.reset_mock()
+    Property.objects.update(fetched_at=LONG_AGO)
+    output = refresh("--workers", "4", "--rate-limit-wait", "0")
+    assert spy.call_count < len(stale_properties)
+
+
+def test_refresh_properties_filters(
+    stale_properties: list[Property], mocker: MockerFixture
+) -> None:
+    """Verify records are selected by age, zipcode, and client."""
+    Property.objects.filter(pk=stale_properties[1].pk).update(fetched_at=timezone.now())
+    spy = mocker.spy(Command, "refresh")
+
+    assert "refreshed 0 records" in refresh("--client", "0")
+    assert "refreshed 0 records (2 failed)" in refresh("--zipcode", "00000")
+    assert "refreshed 0 records (3 failed)" in refresh(
+        "--older-than", "0", "--zipcode", "00000"
+    )
+
+    assert spy.call_count == 5
+
+
+def test_malformed_response(
+    stale_properties: list[Property], mocker: MockerFixture
+) -> None:
+    """Verify a record that can't be updated is counted as failed."""
+    mocker.patch.object(Property, "update", side_effect=ValueError("malformed"))
+
+    output = refresh("--batch-size", "2", "--workers", "2")
+    assert "done: refreshed 0 records (4 failed)" in output
+
+
+def test_circuit_open(
+    stale_properties: list[Property], tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Verify records rejected by an open circuit are retried before moving on."""
+    checkpoint = tmp_path / "refresh.json"
+    refresh_one = Command.refresh
+    calls = []
+
+    def suspend(prop: Property) -> Any:
+        calls.append(prop.pk)
+        if calls.count(prop.pk) == 1 and prop.pk != stale_properties[0].pk:
+            raise CircuitOpenError("suspended", retry_after=0.01)
+        return refresh_one(prop)
+
+    mocker.patch.object(Command, "refresh", side_effect=suspend)
+    output = refresh("--batch-size", "2", "--checkpoint", str(checkpoint))
+
+    assert "circuit open; retrying 1 records" in output
+    assert "done: refreshed 1 records (3 failed)" in output
+    assert [calls.count(p.pk) for p in stale_properties] == [1, 2, 2, 2]
+    state = json.loads(checkpoint.read_text())
+    assert state == {"last_pk": stale_properties[-1].pk, "refreshed": 1, "failed": 3}
+
+
+def test_refresh_properties_resume(
+    stale_properties: list[Property], tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Verify an interrupted run resumes after the last saved batch."""
+    checkpoint = tmp_path / "refresh.json"
+    refresh_one = Command.refresh
+    calls = []
+
+    def interrupt(prop: Property) -> Any:
+        calls.append(prop.pk)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return refresh_one(prop)
+
+    mocker.patch.object(Command, "refresh", side_effect=interrupt)
+    with pytest.raises(CommandError, match="resume using --resume"):
+        refresh("--batch-size", "2", "--workers", "1", "--checkpoint", str(checkpoint))
+
+    state = json.loads(checkpoint.read_text())
+    assert state == {"last_pk": stale_properties[1].pk, "refreshed": 1, "failed": 1}
+
+    calls.clear()
+    output = refresh("--batch-size", "2", "--checkpoint", str(checkpoint), "--resume")
+
+    assert calls == [p.pk for p in stale_properties[2:]]
+    assert "done: refreshed 1 records (3 failed)" in output
+
+
+def test_refresh_properties_arguments() -> None:
+    """Verify invalid arguments are rejected."""
+    with pytest.raises(CommandError, match="requires --checkpoint"):
+        refresh("--resume")
+    with pytest.raises(CommandError, match="must be positive"):
+        refresh("--workers", "0")
@@ -0,0 +1,194 @@
+"""Verify upstream requests are bound by timeouts and deadlines, and retried sparingly.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+import time
+from typing import Any, Callable
+
+# django packages
+from django.test import RequestFactory
+
+# third party
+import pytest
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+from requests.exceptions import ConnectionError, ReadTimeout
+from requests.models import Response
+
+# local
+from canary_core.hc_api_connector import retries
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    PropertyAddress,
+    rate_limiter,
+)
+from canary_core.hc_api_connector.retries import (
+    DeadlineExceeded,
+    deadline,
+    retry_budget,
+)
+from canary_core.hc_api_connector.views import has_septic
+
+
+@pytest.fixture
+def retry_settings(settings: SettingsWrapper) -> SettingsWrapper:
+    """Retry failed attempts without waiting long.
+
+    Args:
+        settings (SettingsWrapper): apply the overrides to the settings
+
+    Returns:
+        SettingsWrapper: the overridden settings
+    """
+    settings.HC_RETRY_ATTEMPTS = 3
+    settings.HC_RETRY_BACKOFF = 0.001
+    settings.HC_RETRY_BACKOFF_MAX = 0.01
+    return settings
+
+
+def attempts(*outcomes: Any) -> Callable[[], Response]:
+    """Simulate attempts that fail or respond, in order.
+
+    Args:
+        *outcomes (Any): the status code of each response, or the exception to raise
+
+    Returns:
+        Callable[[], Response]: send the next attempt
+    """
+    remaining = list(outcomes)
+
+    def attempt() -> Response:
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        resp = Response()
+        resp.status_code = outcome
+        return resp
+
+    return attempt
+
+
+def test_deadline() -> None:
+    """Verify nested deadlines can only shorten the deadline, and it bounds timeouts."""
+    assert retries.remaining() is None
+    assert retries.timeouts(3, 10) == (3, 10)
+
+    with deadline(1):
+        with deadline(60):
+            connect, read = retries.timeouts(3, 10)
+            assert 0.9 < connect == read <= 1
+
+        with deadline(0):
+            with pytest.raises(DeadlineExceeded):
+                retries.timeouts(3, 10)
+
+    assert retries.remaining() is None
+
+
+def test_retry(retry_settings: SettingsWrapper) -> None:
+    """Verify failed attempts of idempotent requests are retried."""
+    assert retries.send(attempts(503, ConnectionError(), 200)).status_code == 200
+    assert retries.send(attempts(503, 404)).status_code == 404
+
+    with pytest.raises(ConnectionError):
+        retries.send(attempts(*[ConnectionError()] * 3))
+
+    assert retries.send(attempts(502), idempotent=False).status_code == 502
+
+
+def test_no_retry_past_deadline(
+    retry_settings: SettingsWrapper, mocker: MockerFixture
+) -> None:
+    """Verify attempts aren't retried if the backoff would pass the deadline."""
+    retry_settings.HC_RETRY_BACKOFF = retry_settings.HC_RETRY_BACKOFF_MAX = 10
+    mocker.patch.object(retries.random, "uniform", side_effect=lambda _, cap: cap)
+
+    with deadline(1):
+        assert retries.send(attempts(503, 200)).status_code == 503
+        with pytest.raises(DeadlineExceeded):
+            retries.send(attempts(DeadlineExceeded(), 200))
+
+
+def test_retry_budget(retry_settings: SettingsWrapper) -> None:
+    """Verify retries stop once the budget is spent, and resume as requests earn it."""
+    retry_settings.HC_RETRY_BUDGET_CAP = 1
+    retry_settings.HC_RETRY_BUDGET_RATIO = 0.5
+
+    assert retries.send(attempts(503, 503, 200)).status_code == 503
+    assert retries.send(attempts(503, 200)).status_code == 503
+    assert retry_budget.tokens == 0.5
+
+    assert retries.send(attempts(503, 200)).status_code == 200
+    assert retry_budget.tokens == 0
+
+
+def test_async_retry(retry_settings: SettingsWrapper) -> None:
+    """Verify async requests are retried in the same way."""
+
+    async def attempt() -> Response:
+        return send()
+
+    send = attempts(504, 200)
+    assert async_to_sync(retries.asend)(attempt).status_code == 200
+
+    send = attempts(ReadTimeout(), ReadTimeout(), ReadTimeout())
+    with pytest.raises(ReadTimeout):
+        async_to_sync(retries.asend)(attempt)
+
+
+def test_client_timeouts(
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify the client's timeouts are sent with each request."""
+    spy = mocker.spy(mock_api_client.session, "request")
+
+    mock_api_client.get(**query_params)
+    with deadline(1):
+        mock_api_client.get(**query_params)
+
+    assert spy.call_args_list[0].kwargs["timeout"] == (3.05, 10.0)
+    connect, read = spy.call_args_list[1].kwargs["timeout"]
+    assert connect == read <= 1
+
+
+@pytest.mark.django_db
+def test_rate_limit_wait_bounded(api_client: BasicAPIClient) -> None:
+    """Verify the wait for a rate limit token doesn't extend past the deadline."""
+    assert rate_limiter.max_wait() == 1.0
+    with deadline(0.5):
+        assert rate_limiter.max_wait() <= 0.5
+    with deadline(-1):
+        assert rate_limiter.max_wait() == 0
+
+
+@pytest.mark.django_db
+def test_has_septic_retries(
+    rf: RequestFactory,
+    api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    retry_settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    """Verify lookups retry failed requests, and time out at the deadline."""
+    spy = mocker.spy(api_client.session, "request")
+    assert has_septic(rf.get("/", data=query_params)).status_code == 500
+    assert spy.call_count == 3
+
+    def hang(*args: Any, **kwargs: Any) -> Response:
+        time.sleep(0.02)
+        raise ReadTimeout("read timed out")
+
+    retry_settings.HC_REQUEST_DEADLINE = 0.01
+    mocker.patch.object(api_client.session, "request", side_effect=hang)
+    response = has_septic(rf.get("/", data=query_params))
+
+    assert response.status_code == 504
+    assert json.loads(response.content)["msg"] == "API request timed out"
@@ -0,0 +1,169 @@
+"""Verify lookups of new properties are coalesced.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# django packages
+from django.db import connection
+
+# third party
+import pytest
+from asgiref.sync import async_to_sync
+from pytest_mock import MockerFixture
+
+# local
+from canary_core.hc_api_connector.addresses import address_key
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+)
+from canary_core.hc_api_connector.singleflight import AsyncSingleFlight, SingleFlight
+
+CONCURRENCY = 8
+
+
+def _slow(fn: Callable, delay: float = 0.2) -> Callable:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        time.sleep(delay)
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _in_thread(fn: Callable, *args: Any) -> Any:
+    # each thread uses its own DB connection, which must be closed afterwards
+    try:
+        return fn(*args)
+    finally:
+        connection.close()
+
+
+def test_get_or_fetch_coalesced(
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify concurrent lookups in the process share one API request."""
+    spy = mocker.patch.object(
+        BasicAPIClient, "get", autospec=True, side_effect=_slow(BasicAPIClient.get)
+    )
+
+    with ThreadPoolExecutor(CONCURRENCY) as pool:
+        futures = [
+            pool.submit(
+                _in_thread, Property.get_or_fetch, mock_api_client, query_params
+            )
+            for _ in range(CONCURRENCY)
+        ]
+        props = [f.result() for f in futures]
+
+    assert spy.call_count == 1
+    assert len({p.pk for p in props}) == 1
+    assert Property.objects.filter(identifier=query_params).count() == 1
+
+
+def test_get_or_fetch_advisory_lock(
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify the advisory lock coalesces lookups that bypass the in-process map.
+
+    Each thread holds its own DB connection, similar to separate worker processes.
+    """
+    spy = mocker.patch.object(
+        BasicAPIClient, "get", autospec=True, side_effect=_slow(BasicAPIClient.get)
+    )
+    key = address_key(query_params)
+
+    with ThreadPoolExecutor(CONCURRENCY) as pool:
+        futures = [
+            pool.submit(
+                _in_thread,
+                Property._get_or_fetch_locked,  # pylint: disable=protected-access
+                mock_api_client,
+                query_params,
+                key,
+            )
+            for _ in range(CONCURRENCY)
+        ]
+        props = [f.result() for f in futures]
+
+    assert spy.call_count == 1
+    assert len({p.pk for p in props}) == 1
+
+
+def test_aget_or_fetch_coalesced(
+    mock_api_client: BasicAPIClient,
+    query_params: PropertyAddress,
+    mocker: MockerFixture,
+) -> None:
+    """Verify concurrent async lookups share one API request."""
+    spy = mocker.spy(BasicAPIClient, "aget")
+
+    async def lookup() -> list[Property]:
+        return await asyncio.gather(
+            *(
+                Property.aget_or_fetch(mock_api_client, query_params)
+                for _ in range(CONCURRENCY)
+            )
+        )
+
+    props = async_to_sync(lookup)()
+
+    assert spy.call_count == 1
+    assert len({p.pk for p in props}) == 1
+
+
+def test_single_flight_exception() -> None:
+    """Verify waiters receive the leader's exception."""
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def fail() -> None:
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("leader failed")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flights.do, "key", fail)
+        started.wait()
+        waiter = pool.submit(flights.do, "key", fail)
+
+        for future in (leader, waiter):
+            with pytest.raises(ValueError, match="leader failed"):
+                future.result()
+
+    assert not flights
+
+
+def test_async_single_flight_exception() -> None:
+    """Verify async waiters receive the leader's exception."""
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fail() -> None:
+        calls.append(None)
+        await asyncio.sleep(0.05)
+        raise ValueError("leader failed")
+
+    async def run() -> list[Any]:
+        return await asyncio.gather(
+            flights.do("key", fail), flights.do("key", fail), return_exceptions=True
+        )
+
+    results = async_to_sync(run)()
+
+    assert len(calls) == 1
+    assert all(isinstance(r, ValueError) for r in results)
+    assert not flights
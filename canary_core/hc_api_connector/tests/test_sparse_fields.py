@@ -0,0 +1,107 @@
+"""Verify requests can select the serialized fields, and unselected columns aren't read.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+from typing import Any, Callable, ContextManager
+
+# django packages
+from django.contrib.auth.models import User
+from django.http.request import QueryDict
+from django.http.response import HttpResponse
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+
+# local
+from canary_core.hc_api_connector.models import Property
+from canary_core.hc_api_connector.serializers import PropertySerializer, sparse_fields
+from canary_core.hc_api_connector.views import PropertyViewSet
+
+
+def call(user: User, action: str, **params: Any) -> HttpResponse:
+    """Send a `GET` request to the property view set.
+
+    Args:
+        user (User): authenticate the request as this user
+        action (str): the view set action, i.e. ``list`` or ``retrieve:{pk}``
+        **params (Any): query string parameters
+
+    Returns:
+        HttpResponse: the response; responses that aren't streamed are rendered
+    """
+    action, _, pk = action.partition(":")
+    request = APIRequestFactory().get("/api/properties/", params)
+    force_authenticate(request, user=user)
+    kwargs: dict[str, Any] = {"pk": pk} if pk else {}
+    response = PropertyViewSet.as_view({"get": action})(request, **kwargs)
+    return response.render() if isinstance(response, Response) else response
+
+
+def test_sparse_fields() -> None:
+    """Verify fields are selected, omitted, and unknown names are ignored."""
+    available = ["id", "sewage_type", "other_data"]
+    assert sparse_fields(QueryDict(), available) == set(available)
+    assert sparse_fields(QueryDict("fields=id, sewage_type,nope"), available) == {
+        "id",
+        "sewage_type",
+    }
+    assert sparse_fields(QueryDict("omit=other_data"), available) == {
+        "id",
+        "sewage_type",
+    }
+    assert sparse_fields(
+        QueryDict("fields=id,other_data&omit=other_data"), available
+    ) == {"id"}
+
+
+@pytest.mark.django_db
+def test_list(
+    admin_user: User,
+    properties: list[Property],
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify unselected JSON columns aren't read, and owners aren't queried."""
+    with django_assert_num_queries(1) as context:
+        response = call(admin_user, "list", fields="id,sewage_type")
+
+    sql = context.captured_queries[0]["sql"]
+    assert '"other_data"' not in sql
+    assert '"identifier"' not in sql
+    assert all(
+        record == {"id": p.pk, "sewage_type": p.sewage_type}
+        for record, p in zip(response.data["results"], properties)
+    )
+
+    response = call(admin_user, "list", omit="other_data,identifier")
+    record = response.data["results"][0]
+    assert "other_data" not in record
+    assert record["owners"] == [admin_user.pk]
+
+
+@pytest.mark.django_db
+def test_retrieve(admin_user: User, properties: list[Property]) -> None:
+    """Verify each selection of fields is versioned separately."""
+    pk = properties[0].pk
+    full = call(admin_user, f"retrieve:{pk}")
+    sparse = call(admin_user, f"retrieve:{pk}", fields="sewage_type")
+
+    assert sparse.data == {"sewage_type": Property.SewageType.SEPTIC}
+    assert set(full.data) == set(PropertySerializer().fields)
+    assert full["ETag"] != sparse["ETag"]
+
+
+@pytest.mark.django_db
+def test_export(admin_user: User, properties: list[Property]) -> None:
+    """Verify exports respect the selection, and skip prefetching omitted owners."""
+    response = call(admin_user, "list", format="ndjson", omit="owners,other_data")
+    lines = b"".join(response.streaming_content).splitlines()
+
+    assert len(lines) == len(properties)
+    assert all("owners" not in json.loads(line) for line in lines)
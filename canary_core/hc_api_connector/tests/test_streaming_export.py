@@ -0,0 +1,74 @@
+"""Verify property exports are streamed as NDJSON, one chunk of records at a time.
+
+.. moduleauthor:: Bryant Finney
+   :github: https://bryant-finney.github.io/about
+"""
+from __future__ import annotations
+
+# stdlib
+import json
+from typing import Callable, ContextManager
+
+# django packages
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# third party
+import pytest
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+
+# local
+from canary_core.hc_api_connector.models import Property
+from canary_core.hc_api_connector.renderers import NDJSONRenderer
+from canary_core.hc_api_connector.views import PropertyViewSet
+
+
+@pytest.mark.django_db
+def test_export(
+    admin_user: User,
+    properties: list[Property],
+    settings: SettingsWrapper,
+    django_assert_num_queries: Callable[..., ContextManager],
+) -> None:
+    """Verify every record is streamed, reading two at a time."""
+    settings.HC_EXPORT_CHUNK_SIZE = 2
+    request = APIRequestFactory().get("/api/properties/", {"format": "ndjson"})
+    force_authenticate(request, user=admin_user)
+    response = PropertyViewSet.as_view({"get": "list"})(request)
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == NDJSONRenderer.media_type
+    assert response["ETag"]
+
+    # one server-side cursor for the records, and one query for the owners per chunk
+    with django_assert_num_queries(1 + 3):
+        lines = b"".join(response.streaming_content).splitlines()
+
+    records = [json.loads(line) for line in lines]
+    assert [r["id"] for r in records] == [p.pk for p in properties]
+    assert all(r["owners"] == [admin_user.pk] for r in records)
+
+
+def test_render() -> None:
+    """Verify responses that aren't streamed (e.g. errors) are rendered as NDJSON."""
+    renderer = NDJSONRenderer()
+    assert renderer.render({"detail": "not found"}) == b'{"detail":"not found"}\n'
+    assert renderer.render([1, 2]) == b"1\n2\n"
+    assert renderer.render(None) == b""
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_asgi(admin_user: User, properties: list[Property]) -> None:
+    """Verify the export is streamed from within an event loop, as under ASGI."""
+    request = APIRequestFactory().get("/api/properties/", {"format": "ndjson"})
+    force_authenticate(request, user=admin_user)
+    response = PropertyViewSet.as_view({"get": "list"})(request)
+
+    async def consume() -> bytes:
+        # Django 3.2's `ASGIHandler` iterates the content in the event loop
+        return b"".join(response.streaming_content)
+
+    lines = async_to_sync(consume)().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [p.pk for p in properties]
@@ -3,29 +3,71 @@
 .. moduleauthor:: bryant finney
    :github: https://bryant-finney.github.io/about
 """
+from __future__ import annotations
+
 # stdlib
-import json
+import contextvars
+import functools
+import hashlib
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Optional
 
 # django packages
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count, Max, Prefetch, QuerySet, Sum
 from django.http.request import HttpRequest
 from django.http.response import (
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseServerError,
 )
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.viewsets import ModelViewSet
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.mixins import DestroyModelMixin, ListModelMixin, RetrieveModelMixin
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
 # third party
+from asgiref.sync import sync_to_async
 from requests import HTTPError
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, RequestException, Timeout
 
 # local
-from canary_core.hc_api_connector.models import BasicAPIClient, Property
+from canary_core.hc_api_connector import addresses, codec
+from canary_core.hc_api_connector.answers import Answer, septic_answers
+from canary_core.hc_api_connector.circuit import CircuitOpenError
+from canary_core.hc_api_connector.filters import (
+    ContainmentFilterBackend,
+    PropertyFilterSet,
+)
+from canary_core.hc_api_connector.models import (
+    BasicAPIClient,
+    Property,
+    PropertyAddress,
+    UnknownAddress,
+    client_selector,
+    negative_cache,
+    rate_limiter,
+)
+from canary_core.hc_api_connector.negative_cache import UnknownAddressError
+from canary_core.hc_api_connector.ratelimit import RateLimitExceeded
+from canary_core.hc_api_connector.renderers import NDJSONRenderer, stream_ndjson
+from canary_core.hc_api_connector.retries import request_deadline
 from canary_core.hc_api_connector.serializers import (
     BasicAPIClientSerializer,
     PropertySerializer,
+    SepticBatchSerializer,
+    UnknownAddressSerializer,
 )
 
 # NOTE: pylint was struggling with the Django Model classes
@@ -33,35 +75,267 @@ from canary_core.hc_api_connector.serializers import (
 
 logger = logging.getLogger(__name__)
 
+#: errors raised when the HouseCanary API can't provide a property's data
+_UPSTREAM_ERRORS = (
+    HTTPError,
+    ConnectionError,
+    Timeout,
+    CircuitOpenError,
+    RateLimitExceeded,
+)
+
 
 class BasicAPIClientViewSet(ModelViewSet):  # pylint: disable=too-many-ancestors
     """Provide a view set for interacting with `BasicAPIClient` records."""
 
     name = "apiclients"
     filterset_fields = BasicAPIClientSerializer.Meta.fields
-    ordering_fields = BasicAPIClientSerializer.Meta.fields
+    ordering_fields = ["id", "credential_id"]
     permission_classes = [IsAuthenticated]
     queryset = BasicAPIClient.objects.all()
     serializer_class = BasicAPIClientSerializer
 
 
 class PropertyViewSet(ModelViewSet):  # pylint: disable=too-many-ancestors
-    """Provide a view set for interacting with `Property` records."""
+    """Provide a view set for interacting with `Property` records.
+
+    Responses to ``list`` and ``retrieve`` carry ``ETag`` and ``Last-Modified``
+    headers derived from the records' ``modified`` field. Conditional requests are
+    answered with ``304 Not Modified`` without serializing the records.
+
+    Pages can be ordered by ``id`` or ``modified`` (see :class:`KeysetPagination`).
+
+    Attributes of ``other_data`` can be queried by value, e.g.
+    ``?other_data__property__pool=true`` (see :class:`ContainmentFilterBackend`).
+
+    Pass ``?fields=`` or ``?omit=`` to select the serialized fields (see
+    :func:`sparse_fields`); the columns of the unselected fields aren't read from the
+    DB, e.g. ``?omit=other_data`` skips the HouseCanary response data.
+
+    Pass ``?format=ndjson`` to ``list`` to export all of the matching records, one per
+    line, without pagination. The records are streamed as they are serialized, so
+    memory use doesn't depend on the number of records.
+    """
 
     name = "properties"
-    filterset_fields = PropertySerializer.Meta.filterset_fields
-    ordering_fields = PropertySerializer.Meta.fields
+    filter_backends = [*api_settings.DEFAULT_FILTER_BACKENDS, ContainmentFilterBackend]
+    filterset_class = PropertyFilterSet
+    containment_fields = ["other_data"]
+    ordering_fields = ["id", "modified"]
     permission_classes = [IsAuthenticated]
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+    #: these columns are always read; the validators are derived from them
+    required_columns = {"id", "modified"}
+
+    def get_queryset(self) -> "QuerySet[Property]":
+        """Defer the columns of the fields that the request didn't select.
+
+        The owners of the records are prefetched (if selected) using a single query;
+        ``apiclient`` is serialized from the ``apiclient_id`` column, so the clients
+        aren't loaded.
+
+        Returns:
+            QuerySet[Property]: the records, without the unselected columns
+        """
+        queryset = super().get_queryset()
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return queryset
+
+        selected = set(self.get_serializer().fields) | self.required_columns
+        if "other_data" in selected:
+            # `other_data` may be stored compressed (see `Property.compress()`)
+            selected.add("other_data_zstd")
+        return queryset.prefetch_related(*self.prefetch_lookups()).defer(
+            *(
+                field.name
+                for field in Property._meta.concrete_fields
+                if field.name not in selected
+            )
+        )
+
+    def prefetch_lookups(self) -> tuple[Prefetch, ...]:
+        """Determine the relations to prefetch for the selected fields.
+
+        Returns:
+            tuple[Prefetch, ...]: prefetch the primary keys of the owners, unless the
+                request omitted them
+        """
+        if "owners" not in self.get_serializer().fields:
+            return ()
+        return (Prefetch("owners", queryset=get_user_model().objects.only("pk")),)
 
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """List the records, unless the client's copy of the page is current.
 
+        The page is versioned by the primary keys and ``modified`` times of its
+        records, so adding, changing, or deleting any of them changes it. For
+        conditional requests, these are selected before the records themselves, so a
+        ``304`` response doesn't read them. Exports are versioned by the number of
+        matching records, the sum of their primary keys, and their latest ``modified``
+        time, so replacing a record with an older one changes the version too.
+
+        Args:
+            request (Request): the incoming `GET` request
+            *args (Any): positional arguments passed to the default implementation
+            **kwargs (Any): keyword arguments passed to the default implementation
+
+        Returns:
+            Response: the page of records, or a ``304`` response
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            summary = queryset.aggregate(
+                count=Count("pk"), ids=Sum("pk"), modified=Max("modified")
+            )
+            return _conditional(
+                request,
+                (request.build_absolute_uri(), *summary.values()),
+                summary["modified"],
+                functools.partial(self.export, request),
+            )
+
+        # conditional requests select the page's keys first, so a `304` response
+        # doesn't read the records; the selected fields must cover the ordering
+        conditional = _is_conditional(request)
+        selected = (
+            queryset.prefetch_related(None).only("pk", "modified")
+            if conditional
+            else queryset
+        )
+        page = self.paginate_queryset(selected)
+        page_keys = page if page is not None else list(selected)
+
+        def respond() -> Response:
+            records = page_keys
+            if conditional:
+                rows = queryset.in_bulk([p.pk for p in page_keys])
+                records = [rows[p.pk] for p in page_keys if p.pk in rows]
+            data = self.get_serializer(records, many=True).data
+            return Response(data) if page is None else self.get_paginated_response(data)
+
+        return _conditional(
+            request,
+            (request.build_absolute_uri(), *((p.pk, p.modified) for p in page_keys)),
+            max((p.modified for p in page_keys), default=None),
+            respond,
+        )
+
+    def export(self, request: Request) -> HttpResponse:
+        """Stream all of the matching records as NDJSON.
+
+        Args:
+            request (Request): the incoming `GET` request
+
+        Returns:
+            HttpResponse: the streaming response
+        """
+        return stream_ndjson(
+            self.filter_queryset(self.get_queryset()),
+            self.get_serializer_class(),
+            prefetch=self.prefetch_lookups(),
+            context=self.get_serializer_context(),
+        )
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Retrieve the record, unless the client's copy is current.
+
+        Args:
+            request (Request): the incoming `GET` request
+            *args (Any): positional arguments passed to the default implementation
+            **kwargs (Any): keyword arguments passed to the default implementation
+
+        Returns:
+            Response: the record, or a ``304`` response
+        """
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        modified = (
+            self.filter_queryset(self.get_queryset())
+            .filter(pk=pk)
+            .values_list("modified", flat=True)
+            .first()
+        )
+        if modified is None:
+            # let the default implementation respond with 404
+            return super().retrieve(request, *args, **kwargs)
+
+        return _conditional(
+            request,
+            (request.build_absolute_uri(), modified),
+            modified,
+            lambda: super(PropertyViewSet, self).retrieve(request, *args, **kwargs),
+        )
+
+
+class UnknownAddressViewSet(  # pylint: disable=too-many-ancestors
+    ListModelMixin, RetrieveModelMixin, DestroyModelMixin, GenericViewSet
+):
+    """Provide a view set for inspecting and purging the negative cache.
+
+    Each record caches a "no such property" response from the HouseCanary API;
+    deleting a record purges it from the cache.
+    """
+
+    name = "unknownaddresses"
+    filterset_fields = ["status_code"]
+    permission_classes = [IsAuthenticated]
+    queryset = UnknownAddress.objects.order_by("pk")
+    serializer_class = UnknownAddressSerializer
+
+    @action(detail=False, methods=["post"])
+    def purge(self, request: Request) -> Response:
+        """Purge cached results in bulk.
+
+        By default, all entries are purged; pass ``?expired=true`` to only purge the
+        entries that have expired.
+
+        Args:
+            request (Request): the incoming `POST` request
+
+        Returns:
+            Response: the number of purged entries
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if request.query_params.get("expired", "").lower() in ("1", "true", "yes"):
+            queryset = queryset.filter(expires_at__lte=timezone.now())
+
+        count, _ = queryset.delete()
+        negative_cache.reset()
+        return Response({"purged": count})
+
+
+@request_deadline
 def has_septic(request: HttpRequest) -> HttpResponse:
     """Check if the property at the given address uses a septic system.
 
-    If the specified address isn't already tracked in the DB, use the first API client
-    retrieved from the DB to create a new property record, querying the HouseCanary API
-    to provide its initial data.
+    If the specified address isn't already tracked in the DB, use an active API client
+    (see :class:`ClientSelector`) to create a new property record, querying the
+    HouseCanary API to provide its initial data. Concurrent requests for the same new
+    address share a single HouseCanary API request (see :meth:`Property.get_or_fetch`),
+    and addresses the API doesn't recognize are answered from the negative cache.
+
+    Addresses are matched on their normalized form, so differences in case,
+    punctuation, whitespace, or parameter order don't create new records. Answers for
+    tracked addresses are cached (see :class:`AnswerCache`), so most lookups don't
+    query the DB.
+
+    Records older than ``HC_PROPERTY_MAX_AGE`` are served as is and refreshed in the
+    background; once the ``HC_PROPERTY_STALE_GRACE`` period has also passed, the
+    record is refreshed before responding.
+
+    Successful responses carry ``ETag`` and ``Last-Modified`` headers derived from the
+    record's ``modified`` field, and conditional requests for an unchanged record are
+    answered with ``304 Not Modified``.
+
+    If the API client's rate limit doesn't allow a request within
+    ``HC_RATE_LIMIT_WAIT`` seconds, the response is a ``429`` with a ``Retry-After``
+    header. While the API client's circuit is open, lookups that need the API respond
+    with ``503`` and a ``Retry-After`` header, and expired records are served as is.
+
+    HouseCanary requests made on behalf of the lookup (including retries) must finish
+    within ``HC_REQUEST_DEADLINE`` seconds; otherwise, the response is a ``504``.
 
     # TODO: use a serializer for the query string parameters
 
@@ -73,48 +347,345 @@ def has_septic(request: HttpRequest) -> HttpResponse:
     """
     address = request.GET.dict()
     try:
-        prop: Property = Property.objects.get(identifier=address)
+        negative_cache.check(address)  # type: ignore
+    except UnknownAddressError as e:
+        return _upstream_error_response(e)
+
+    key = addresses.address_key(address)
+    try:
+        answer = _get_answer(key)
     except Property.DoesNotExist:
-        api_client = BasicAPIClient.objects.first()
+        api_client = client_selector.select()
         if not api_client:
-            return HttpResponseServerError(
-                content_type="application/json",
-                content=json.dumps({"msg": "Misconfigured: no API client records"}),
-            )
+            return _misconfigured_response()
 
         try:
-            prop = Property.from_client(
-                api_client,
-                address,  # type: ignore
-                save=True,
-            )
-        except HTTPError as e:
-            return HttpResponse(
-                status=e.response.status_code,
-                content_type="application/json",
-                content=e.response.content.decode(),
-            )
-        except ConnectionError as e:
-            return HttpResponseServerError(
-                content_type="application/json",
-                content=json.dumps(
-                    {"msg": "failed to connect to API", "detail": str(e)}
-                ),
+            prop = Property.get_or_fetch(api_client, address)  # type: ignore
+        except _UPSTREAM_ERRORS as e:
+            return _upstream_error_response(e)
+        answer = Answer.of(prop)
+    else:
+        if Property.is_expired(answer.fetched_at):
+            try:
+                answer = Answer.of(Property.refresh(key))
+            except CircuitOpenError:
+                logger.warning("serving expired property %s; circuit is open", key)
+            except _UPSTREAM_ERRORS as e:
+                return _upstream_error_response(e)
+        elif Property.is_stale(answer.fetched_at):
+            Property.refresh_in_background(key)
+
+    return _septic_response(request, key, answer)
+
+
+@request_deadline
+async def has_septic_async(request: HttpRequest) -> HttpResponse:
+    """Provide an async variant of :func:`has_septic` for use under ASGI.
+
+    The HouseCanary request is awaited, so a single process can serve many concurrent
+    lookups of new addresses. ORM calls run in Django's thread-sensitive executor.
+
+    Args:
+        request (HttpRequest): the incoming `GET` request
+
+    Returns:
+        HttpResponse: on success, the response body contains `{"septic": bool}`
+    """
+    address = request.GET.dict()
+    try:
+        await sync_to_async(negative_cache.check)(address)  # type: ignore
+    except UnknownAddressError as e:
+        return _upstream_error_response(e)
+
+    key = addresses.address_key(address)
+    try:
+        answer = await sync_to_async(_get_answer)(key)
+    except Property.DoesNotExist:
+        api_client = await sync_to_async(client_selector.select)()
+        if not api_client:
+            return _misconfigured_response()
+
+        try:
+            prop = await Property.aget_or_fetch(api_client, address)  # type: ignore
+        except _UPSTREAM_ERRORS as e:
+            return _upstream_error_response(e)
+        answer = Answer.of(prop)
+    else:
+        if Property.is_expired(answer.fetched_at):
+            try:
+                answer = Answer.of(await sync_to_async(Property.refresh)(key))
+            except CircuitOpenError:
+                logger.warning("serving expired property %s; circuit is open", key)
+            except _UPSTREAM_ERRORS as e:
+                return _upstream_error_response(e)
+        elif Property.is_stale(answer.fetched_at):
+            Property.refresh_in_background(key)
+
+    return await sync_to_async(_septic_response)(request, key, answer)
+
+
+@api_view(["POST"])
+@request_deadline
+def has_septic_batch(request: Request) -> Response:
+    """Check if the properties at the given addresses use septic systems.
+
+    The request body contains the addresses to check, e.g.
+    ``{"addresses": [{"address": "7500 Melrose Ave", "zipcode": "90046"}, ...]}``.
+    Tracked addresses are resolved using a single query; the others (and those past
+    their hard expiry, see :func:`has_septic`) are fetched from the HouseCanary API,
+    with at most ``HC_BATCH_CONCURRENCY`` requests in flight. All of the lookups share
+    a single ``HC_REQUEST_DEADLINE``.
+
+    Each item of the response corresponds to the address at the same index of the
+    request: successful lookups contain ``{"address": {...}, "septic": bool}``, and
+    failed lookups contain the HTTP ``status`` and ``error`` that :func:`has_septic`
+    would have returned for the address.
+
+    Args:
+        request (Request): the incoming `POST` request
+
+    Returns:
+        Response: the results of each lookup, in the order of the request
+    """
+    serializer = SepticBatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    items: list[PropertyAddress] = serializer.validated_data["addresses"]
+
+    keys = [addresses.address_key(address) for address in items]
+    results: dict[str, dict[str, Any]] = {}
+    for key, address in zip(keys, items):
+        try:
+            negative_cache.check(address)
+        except UnknownAddressError as e:
+            results[key] = _error_result(e)
+
+    # duplicate addresses are looked up once, using their first spelling
+    pending: dict[str, PropertyAddress] = {}
+    for key, address in zip(keys, items):
+        if key not in results:
+            pending.setdefault(key, address)
+
+    known = septic_answers.get_many(pending)
+    uncached = [key for key in pending if key not in known]
+    if uncached:
+        answers = {
+            key: Answer(*fields)
+            for key, *fields in Property.objects.filter(
+                address_key__in=uncached
+            ).values_list("address_key", *Answer._fields)
+        }
+        septic_answers.set_many(answers)
+        known.update(answers)
+
+    sewage_types: dict[str, Optional[str]] = {}
+    expired: dict[str, Optional[str]] = {}
+    tasks: dict[str, tuple[Any, ...]] = {}
+    for key, (sewage_type, fetched_at, _) in known.items():
+        if Property.is_expired(fetched_at):
+            expired[key] = sewage_type
+            tasks[key] = (Property.refresh, key)
+            continue
+
+        if Property.is_stale(fetched_at):
+            Property.refresh_in_background(key)
+        sewage_types[key] = sewage_type
+
+    missing = {
+        k: a for k, a in pending.items() if k not in sewage_types and k not in tasks
+    }
+    for key, address in missing.items():
+        # each lookup chooses its client, spreading the batch across the clients
+        api_client = client_selector.select()
+        if not api_client:
+            return Response(
+                {"msg": "Misconfigured: no API client records"},
+                status=HttpResponseServerError.status_code,
             )
+        tasks[key] = (Property.get_or_fetch, api_client, address)
+
+    if tasks:
+        workers = max(min(settings.HC_BATCH_CONCURRENCY, len(tasks)), 1)
+        with ThreadPoolExecutor(workers) as pool:
+            # copy the context into each worker, so the lookups share the deadline
+            futures = {
+                key: pool.submit(
+                    contextvars.copy_context().run, _sewage_type_in_worker, *task
+                )
+                for key, task in tasks.items()
+            }
+            for key, future in futures.items():
+                try:
+                    sewage_types[key] = future.result()
+                except CircuitOpenError as e:
+                    if key in expired:
+                        sewage_types[key] = expired[key]
+                    else:
+                        results[key] = _error_result(e)
+                except _UPSTREAM_ERRORS as e:
+                    results[key] = _error_result(e)
+
+    for key, sewage_type in sewage_types.items():
+        results[key] = _septic_result(sewage_type)
+
+    return Response(
+        [{"address": address, **results[key]} for key, address in zip(keys, items)]
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def answer_cache_stats(request: Request) -> Response:
+    """Report the hits and misses of this process' septic answer cache.
+
+    Args:
+        request (Request): the incoming `GET` request
+
+    Returns:
+        Response: the counters of the cache (see :meth:`AnswerCache.stats`)
+    """
+    return Response(septic_answers.stats())
+
+
+def _sewage_type_in_worker(fn: Callable[..., Property], *args: Any) -> Optional[str]:
+    # runs in a worker thread, which holds its own DB connections
+    try:
+        return fn(*args).sewage_type
+    finally:
+        connection.close()
+        rate_limiter.release()
+
+
+def _error_result(e: RequestException) -> dict[str, Any]:
+    response = _upstream_error_response(e)
+    try:
+        error = codec.loads(response.content)
+    except ValueError:
+        error = {"msg": response.content.decode(errors="replace")}
+    return {"status": response.status_code, "error": error}
+
+
+def _septic_result(sewage_type: Optional[str]) -> dict[str, Any]:
+    if sewage_type in [None, Property.SewageType.UNKNOWN.value]:
+        return {
+            "status": HttpResponseBadRequest.status_code,
+            "error": {"msg": "unknown sewage type for property"},
+        }
+
+    return {"septic": sewage_type == Property.SewageType.SEPTIC.value}
+
+
+def _misconfigured_response() -> HttpResponse:
+    return HttpResponseServerError(
+        content_type="application/json",
+        content=codec.dumps({"msg": "Misconfigured: no API client records"}),
+    )
+
+
+def _upstream_error_response(e: RequestException) -> HttpResponse:
+    if isinstance(e, (CircuitOpenError, RateLimitExceeded)):
+        status, msg = (
+            (503, "API temporarily unavailable")
+            if isinstance(e, CircuitOpenError)
+            else (429, "API rate limit exceeded")
+        )
+        retry_after = math.ceil(e.retry_after)
+        response = HttpResponse(
+            status=status,
+            content_type="application/json",
+            content=codec.dumps({"msg": msg, "retry_after": retry_after}),
+        )
+        response["Retry-After"] = str(retry_after)
+        return response
+
+    if isinstance(e, Timeout):
+        return HttpResponse(
+            status=504,
+            content_type="application/json",
+            content=codec.dumps({"msg": "API request timed out", "detail": str(e)}),
+        )
+
+    if isinstance(e, HTTPError):
+        return HttpResponse(
+            status=e.response.status_code,
+            content_type="application/json",
+            content=e.response.content.decode(),
+        )
 
-    if prop.sewage_type in [None, prop.SewageType.UNKNOWN.value]:
-        serializer = PropertySerializer(instance=prop)
+    return HttpResponseServerError(
+        content_type="application/json",
+        content=codec.dumps({"msg": "failed to connect to API", "detail": str(e)}),
+    )
+
+
+def _get_answer(key: str) -> Answer:
+    answer = septic_answers.get(key)
+    if answer is None:
+        # only read columns covered by the `address_key` index (allows an index-only
+        #   scan)
+        answer = Answer(
+            *Property.objects.values_list(*Answer._fields).get(address_key=key)
+        )
+        septic_answers.set(key, answer)
+    return answer
+
+
+def _etag(*parts: Any) -> str:
+    # a strong entity tag for the representation versioned by the parts
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def _set_validators(
+    response: HttpResponse, etag: str, modified: Optional[datetime]
+) -> HttpResponse:
+    response["ETag"] = etag
+    if modified is not None:
+        response["Last-Modified"] = http_date(modified.timestamp())
+    return response
+
+
+def _is_conditional(request: HttpRequest) -> bool:
+    return any(
+        header in request.META
+        for header in ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+    )
+
+
+def _conditional(
+    request: HttpRequest,
+    version: tuple[Any, ...],
+    modified: Optional[datetime],
+    respond: Callable[[], HttpResponse],
+) -> HttpResponse:
+    # answer conditional requests before building the response
+    etag = _etag(*version)
+    last_modified = int(modified.timestamp()) if modified is not None else None
+    response = get_conditional_response(request, etag, last_modified)
+    if response is None:
+        response = respond()
+    return _set_validators(response, etag, modified)
+
+
+def _septic_response(request: HttpRequest, key: str, answer: Answer) -> HttpResponse:
+    sewage_type = answer.sewage_type
+    if sewage_type in [None, Property.SewageType.UNKNOWN.value]:
+        serializer = PropertySerializer(instance=Property.objects.get(address_key=key))
         return HttpResponseBadRequest(
             content_type="application/json",
-            content=json.dumps(
+            content=codec.dumps(
                 {"msg": "unknown sewage type for property", "detail": serializer.data}
             ),
         )
 
-    return HttpResponse(
-        content_type="application/json",
-        content=json.dumps(
-            {"septic": prop.sewage_type == prop.SewageType.SEPTIC.value}
+    return _conditional(
+        request,
+        (key, answer.modified),
+        answer.modified,
+        lambda: HttpResponse(
+            content_type="application/json",
+            content=codec.dumps(
+                {"septic": sewage_type == Property.SewageType.SEPTIC.value}
+            ),
         ),
     )
 
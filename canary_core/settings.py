@@ -110,6 +110,13 @@ DATABASES = {
     }
 }
 
+# the HC_ANSWER_CACHE_ALIAS cache should be shared by all processes in production, e.g.
+#   using `django.core.cache.backends.memcached.PyMemcacheCache`
+CACHES = get_conf(
+    "CACHES",
+    {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -145,3 +152,81 @@ STATIC_URL = "/static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = get_conf("REST_FRAMEWORK")
+
+# HouseCanary API client settings
+HC_API_KEEP_ALIVE = strtobool(str(get_conf("HC_API_KEEP_ALIVE", True)).lower())
+HC_API_POOL_BLOCK = strtobool(str(get_conf("HC_API_POOL_BLOCK", False)).lower())
+HC_API_POOL_SIZE = int(get_conf("HC_API_POOL_SIZE", 10))
+
+# the maximum number of seconds to wait for a rate-limited API client to allow a request
+HC_RATE_LIMIT_WAIT = float(get_conf("HC_RATE_LIMIT_WAIT", 1.0))
+
+# the maximum number of seconds to wait for a token when no client is waiting for the
+#   response (e.g. background refreshes, bulk lookups, and management commands)
+HC_BACKGROUND_RATE_LIMIT_WAIT = float(get_conf("HC_BACKGROUND_RATE_LIMIT_WAIT", 60.0))
+
+# cache the active API clients in each process for this many seconds; each client's
+#   latency is tracked using a moving average with the given smoothing factor
+HC_CLIENT_CACHE_TTL = float(get_conf("HC_CLIENT_CACHE_TTL", 60.0))
+HC_CLIENT_LATENCY_ALPHA = float(get_conf("HC_CLIENT_LATENCY_ALPHA", 0.3))
+
+# bound the requests sent by each lookup using a deadline (seconds); failed requests are
+#   retried (up to the total number of attempts) using jittered exponential backoff, and
+#   each process only retries the given fraction of its requests (up to the cap)
+HC_REQUEST_DEADLINE = float(get_conf("HC_REQUEST_DEADLINE", 10.0))
+HC_RETRY_ATTEMPTS = int(get_conf("HC_RETRY_ATTEMPTS", 3))
+HC_RETRY_BACKOFF = float(get_conf("HC_RETRY_BACKOFF", 0.1))
+HC_RETRY_BACKOFF_MAX = float(get_conf("HC_RETRY_BACKOFF_MAX", 2.0))
+HC_RETRY_BUDGET_RATIO = float(get_conf("HC_RETRY_BUDGET_RATIO", 0.1))
+HC_RETRY_BUDGET_CAP = float(get_conf("HC_RETRY_BUDGET_CAP", 10.0))
+
+# suspend requests to an API client for the cooldown (seconds) once the failure rate of
+#   its recent requests (at least the minimum number, within the window) reaches the
+#   threshold; requests slower than HC_CIRCUIT_SLOW_CALL seconds count as failures
+HC_CIRCUIT_WINDOW = int(get_conf("HC_CIRCUIT_WINDOW", 20))
+HC_CIRCUIT_MIN_CALLS = int(get_conf("HC_CIRCUIT_MIN_CALLS", 10))
+HC_CIRCUIT_ERROR_RATE = float(get_conf("HC_CIRCUIT_ERROR_RATE", 0.5))
+HC_CIRCUIT_SLOW_CALL = float(get_conf("HC_CIRCUIT_SLOW_CALL", 5.0))
+HC_CIRCUIT_COOLDOWN = float(get_conf("HC_CIRCUIT_COOLDOWN", 30.0))
+
+# the number of addresses sent in each multi-component request to the HouseCanary API
+HC_API_BATCH_SIZE = int(get_conf("HC_API_BATCH_SIZE", 100))
+
+# cache the answers to septic lookups in the shared cache for this many seconds (0
+#   disables the cache); each process also holds up to HC_ANSWER_CACHE_SIZE answers in
+#   memory, for at most HC_ANSWER_CACHE_LOCAL_TTL seconds
+HC_ANSWER_CACHE_ALIAS = str(get_conf("HC_ANSWER_CACHE_ALIAS", "default"))
+HC_ANSWER_CACHE_TTL = int(get_conf("HC_ANSWER_CACHE_TTL", 60 * 60))
+HC_ANSWER_CACHE_LOCAL_TTL = int(get_conf("HC_ANSWER_CACHE_LOCAL_TTL", 30))
+HC_ANSWER_CACHE_SIZE = int(get_conf("HC_ANSWER_CACHE_SIZE", 10_000))
+
+# cache "no such property" responses for this many seconds (0 disables the cache); each
+#   process also holds up to HC_NEGATIVE_CACHE_SIZE of them in memory
+HC_NEGATIVE_CACHE_TTL = int(get_conf("HC_NEGATIVE_CACHE_TTL", 7 * 24 * 60 * 60))
+HC_NEGATIVE_CACHE_CAPACITY = int(get_conf("HC_NEGATIVE_CACHE_CAPACITY", 100_000))
+HC_NEGATIVE_CACHE_SYNC_INTERVAL = int(get_conf("HC_NEGATIVE_CACHE_SYNC_INTERVAL", 60))
+HC_NEGATIVE_CACHE_SIZE = int(get_conf("HC_NEGATIVE_CACHE_SIZE", 10_000))
+
+# refresh property data older than the max age (seconds; 0 disables refreshes); stale
+#   data is served while it is refreshed in the background until the grace period ends
+HC_PROPERTY_MAX_AGE = int(get_conf("HC_PROPERTY_MAX_AGE", 30 * 24 * 60 * 60))
+HC_PROPERTY_STALE_GRACE = int(get_conf("HC_PROPERTY_STALE_GRACE", 7 * 24 * 60 * 60))
+HC_REFRESH_WORKERS = int(get_conf("HC_REFRESH_WORKERS", 2))
+
+# the number of records read from the DB at a time when streaming exports
+HC_EXPORT_CHUNK_SIZE = int(get_conf("HC_EXPORT_CHUNK_SIZE", 1000))
+
+# the JSON library used by `hc_api_connector.codec`: "orjson", "stdlib", or "auto"
+HC_JSON_CODEC = str(get_conf("HC_JSON_CODEC", "auto"))
+
+# store `Property.other_data` compressed (see `hc_api_connector.compression`)
+HC_OTHER_DATA_COMPRESSION = strtobool(
+    str(get_conf("HC_OTHER_DATA_COMPRESSION", False)).lower()
+)
+
+# limit the size of batch lookups and the number of concurrent HouseCanary requests
+HC_BATCH_MAX_SIZE = int(get_conf("HC_BATCH_MAX_SIZE", 1000))
+HC_BATCH_CONCURRENCY = int(get_conf("HC_BATCH_CONCURRENCY", 8))
+
+# serve the primary endpoint using the async view (enabled by default under ASGI)
+HC_ASYNC_VIEWS = strtobool(str(get_conf("HC_ASYNC_VIEWS", False)).lower())
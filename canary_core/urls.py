@@ -15,6 +15,7 @@ Examples:
     2. Add a URL to urlpatterns:  ``path('blog/', include('blog.urls'))``
 """
 # django packages
+from django.conf import settings
 from django.contrib import admin
 from django.urls import re_path
 from django.urls.conf import include, path
@@ -26,9 +27,15 @@ from canary_core.hc_api_connector import views
 router = DefaultRouter()
 router.register(r"apiclients", views.BasicAPIClientViewSet)
 router.register(r"properties", views.PropertyViewSet)
+router.register(r"unknownaddresses", views.UnknownAddressViewSet)
 
 urlpatterns = [
     re_path(r"^admin/", admin.site.urls),
+    path("api/cache/", views.answer_cache_stats),
     re_path(r"^api/", include(router.urls)),
-    path("", views.has_septic),
+    path("batch/", views.has_septic_batch),
+    path(
+        "",
+        views.has_septic_async if settings.HC_ASYNC_VIEWS else views.has_septic,
+    ),
 ]